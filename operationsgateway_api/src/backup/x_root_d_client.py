@@ -1,6 +1,7 @@
 import logging
+import os
 from pathlib import Path
-from typing import BinaryIO
+import shutil
 
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.models import RecordModel
@@ -11,11 +12,12 @@ log = logging.getLogger()
 
 class XRootDClient:
     @staticmethod
-    def cache_hdf(record_model: RecordModel, buffer: BinaryIO) -> None:
+    def cache_hdf(record_model: RecordModel, hdf_path: Path) -> None:
         """
-        Cache the bytes in `buffer` to a path on local storage corresponding to the id
+        Cache the file at `hdf_path` to a path on local storage corresponding to the id
         of `record_model`. This can then be copied to tape at a later time, decoupled
-        from the ingest to Echo.
+        from the ingest to Echo. The file is hardlinked into the cache if it's on the
+        same filesystem, otherwise it's copied by the OS without being read into memory.
         """
         if Config.config.backup is not None:
             directory = Config.config.backup.cache_directory
@@ -24,6 +26,8 @@ class XRootDClient:
             log.debug("Writing %s version %s to cache", record_model.id_, version)
             file = Path(f"{directory}/{subdirectories}/{version}.hdf5")
             file.parent.mkdir(parents=True, exist_ok=True)
-            buffer.seek(0)
-            with open(file, "wb") as f:
-                f.write(buffer.read())
+            file.unlink(missing_ok=True)
+            try:
+                os.link(hdf_path, file)
+            except OSError:
+                shutil.copyfile(hdf_path, file)
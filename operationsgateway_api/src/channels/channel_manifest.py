@@ -16,6 +16,12 @@ log = logging.getLogger()
 
 
 class ChannelManifest:
+    # The most recent manifest, shared across requests. It is only replaced when a
+    # manifest with a different `_id` is found at the top of the collection
+    _cached_manifest: ChannelManifestModel | None = None
+    cache_hits = 0
+    cache_misses = 0
+
     def __init__(self, manifest_input: SpooledTemporaryFile) -> None:
         """
         Load JSON from a temporary file and put it into a Pydantic model
@@ -38,6 +44,7 @@ class ChannelManifest:
             "channels",
             self.data.model_dump(by_alias=True, exclude_unset=True),
         )
+        ChannelManifest.invalidate_cache()
 
     async def validate(self, bypass_channel_check: bool) -> None:
         """
@@ -78,16 +85,63 @@ class ChannelManifest:
     @staticmethod
     async def get_most_recent_manifest() -> ChannelManifestModel:
         """
-        Get the most up to date manifest file from MongoDB and return it to the user
+        Get the most up to date manifest file from MongoDB and return it to the user.
+
+        Only the `_id` of the most recent manifest is queried each time. If it matches
+        the cached manifest, that is returned without fetching and validating the whole
+        document again. Checking the `_id` means manifests submitted to other
+        instances of the API (which share the database) are still picked up
         """
 
         log.info("Getting most recent channel manifest file")
-        manifest_data = await MongoDBInterface.find_one(
+        latest_manifest = await MongoDBInterface.find_one(
             "channels",
             sort=[("_id", pymongo.DESCENDING)],
+            projection=["_id"],
         )
+        if not latest_manifest:
+            ChannelManifest.invalidate_cache()
+            return None
+
+        cached_manifest = ChannelManifest._cached_manifest
+        if (
+            cached_manifest is not None
+            and cached_manifest.id_ == latest_manifest["_id"]
+        ):
+            ChannelManifest.cache_hits += 1
+            return cached_manifest
+
+        ChannelManifest.cache_misses += 1
+        log.debug("Channel manifest %s not cached", latest_manifest["_id"])
+        manifest_data = await MongoDBInterface.find_one(
+            "channels",
+            {"_id": latest_manifest["_id"]},
+        )
+        manifest = ChannelManifest._use_model(manifest_data)
+        ChannelManifest._cached_manifest = manifest
+
+        return manifest
 
-        return ChannelManifest._use_model(manifest_data)
+    @staticmethod
+    def invalidate_cache() -> None:
+        """
+        Remove the cached manifest so the next call to `get_most_recent_manifest()`
+        fetches it from the database
+        """
+        ChannelManifest._cached_manifest = None
+
+    @staticmethod
+    def get_cache_info() -> dict[str, int | str | None]:
+        """
+        Return the hit and miss counts for the manifest cache, and the `_id` of the
+        manifest currently cached
+        """
+        cached_manifest = ChannelManifest._cached_manifest
+        return {
+            "hits": ChannelManifest.cache_hits,
+            "misses": ChannelManifest.cache_misses,
+            "manifest_id": cached_manifest.id_ if cached_manifest else None,
+        }
 
     @staticmethod
     async def get_channel(channel_name: str) -> ChannelModel:
@@ -1,7 +1,7 @@
 from datetime import datetime
 from pathlib import Path
 import sys
-from typing import Annotated, List, Optional, Tuple
+from typing import Annotated, List, Literal, Optional, Tuple
 
 import annotated_types
 from dateutil import tz
@@ -11,6 +11,7 @@ from pydantic import (
     Field,
     field_validator,
     FilePath,
+    NonNegativeFloat,
     NonNegativeInt,
     PositiveInt,
     SecretStr,
@@ -43,6 +44,13 @@ class ImagesConfig(BaseModel):
     default_colour_map: StrictStr
     colourbar_height_pixels: StrictInt
     preferred_colour_map_pref_name: StrictStr
+    # Number of colour lookup tables (one per colour map, level and pixel type) to keep
+    lookup_table_cache_maxsize: NonNegativeInt = 64
+    # Maximum total size in bytes of the decoded images kept in memory between requests
+    array_cache_max_bytes: NonNegativeInt = 256 * 1024 * 1024
+    # Factors by which each image is downsampled to create the smaller copies (levels)
+    # stored alongside it in Echo at ingest, e.g. [2, 4] for 1/2 and 1/4 size
+    pyramid_factors: List[Annotated[int, annotated_types.Gt(1)]] = []
 
 
 class FloatImagesConfig(BaseModel):
@@ -54,12 +62,26 @@ class FloatImagesConfig(BaseModel):
 class WaveformsConfig(BaseModel):
     thumbnail_size: Tuple[int, int]
     line_width: float
+    storage_format: Literal["json", "binary"] = Field(
+        default="binary",
+        description=(
+            "Format used to store new waveforms in Echo. Binary waveforms can be read "
+            "in part using ranged requests"
+        ),
+    )
 
 
 class VectorsConfig(BaseModel):
     thumbnail_size: tuple[int, int]
     skip_pref_name: StrictStr = "VECTOR_SKIP"
     limit_pref_name: StrictStr = "VECTOR_LIMIT"
+    storage_format: Literal["json", "binary"] = Field(
+        default="binary",
+        description=(
+            "Format used to store new vectors in Echo. Binary vectors can be read in "
+            "part using ranged requests"
+        ),
+    )
 
 
 class EchoConfig(BaseModel):
@@ -73,7 +95,194 @@ class EchoConfig(BaseModel):
         description="If defined, objects older than this will be marked for expiry",
         examples=[1095],
     )
-    cache_maxsize: NonNegativeInt = 128
+    cache_max_bytes: NonNegativeInt = Field(
+        default=256 * 1024 * 1024,
+        description=(
+            "Maximum total size of the objects downloaded from Echo cached in memory. "
+            "If set to 0, objects will not be cached in memory"
+        ),
+    )
+    cache_ttl_seconds: NonNegativeFloat | None = Field(
+        default=3600,
+        description=(
+            "Time after which a cached object is downloaded again, so changes made by "
+            "other instances of the API are seen. If not set, objects do not expire"
+        ),
+    )
+    cache_disk_directory: Path | None = Field(
+        default=None,
+        description=(
+            "If defined, objects downloaded from Echo are also cached in this "
+            "directory, which is shared between all workers on the same machine"
+        ),
+    )
+    cache_disk_max_bytes: NonNegativeInt = Field(
+        default=1024 * 1024 * 1024,
+        description="Maximum total size of the objects cached in cache_disk_directory",
+    )
+    upload_concurrency: PositiveInt = Field(
+        default=16,
+        description=(
+            "Maximum number of channel objects being uploaded to Echo at any one time "
+            "when ingesting a file"
+        ),
+    )
+    delete_concurrency: PositiveInt = Field(
+        default=8,
+        description=(
+            "Maximum number of DeleteObjects requests (each of up to 1000 objects) "
+            "sent to Echo at any one time when deleting records"
+        ),
+    )
+    existence_check_method: Literal["head", "list"] = Field(
+        default="head",
+        description=(
+            "How the objects of channels already in a stored record are checked for "
+            "when merging a file into it. 'head' sends a HeadObject request for each "
+            "object, 'list' sends a ListObjectsV2 request for each directory of the "
+            "record, which needs fewer requests when merging many channels"
+        ),
+    )
+    existence_check_concurrency: PositiveInt = Field(
+        default=16,
+        description=(
+            "Maximum number of HeadObject or ListObjectsV2 requests sent to Echo at "
+            "any one time when checking for the objects of a stored record"
+        ),
+    )
+    max_pool_connections: PositiveInt = Field(
+        default=32,
+        description=(
+            "Maximum number of connections to Echo kept in the pool of each worker. "
+            "This should be at least upload_concurrency so that concurrent uploads and "
+            "downloads don't wait for a connection"
+        ),
+    )
+    retry_mode: Literal["legacy", "standard", "adaptive"] = Field(
+        default="legacy",
+        description=(
+            "botocore retry mode used for requests to Echo, see "
+            "https://boto3.amazonaws.com/v1/documentation/api/latest/guide/retries.html"
+        ),
+    )
+    multipart_threshold: PositiveInt = Field(
+        default=8 * 1024 * 1024,
+        description=(
+            "Objects larger than this are uploaded and downloaded in multiple parts"
+        ),
+    )
+    multipart_chunksize: PositiveInt = Field(
+        default=8 * 1024 * 1024,
+        description="Size of each part of a multipart upload or download",
+    )
+    max_transfer_concurrency: PositiveInt = Field(
+        default=10,
+        description=(
+            "Maximum number of parts of a single object being uploaded or downloaded "
+            "at once"
+        ),
+    )
+    upload_max_retries: NonNegativeInt = Field(
+        default=2,
+        description="Number of times a failed upload to Echo is retried during ingest",
+    )
+    upload_retry_backoff_seconds: NonNegativeFloat = Field(
+        default=0.5,
+        description=(
+            "Time to wait before the first retry of a failed upload, doubling for each "
+            "subsequent retry"
+        ),
+    )
+
+
+class RecordsConfig(BaseModel):
+    stream_window: PositiveInt = Field(
+        default=16,
+        description=(
+            "When streaming records as NDJSON, the maximum number of records being "
+            "processed (false colour, functions) at any one time"
+        ),
+    )
+    thumbnail_cache_max_bytes: NonNegativeInt = Field(
+        default=64 * 1024 * 1024,
+        description=(
+            "Maximum total size of the false coloured thumbnails cached in memory. If "
+            "set to 0, thumbnails will not be cached"
+        ),
+    )
+    max_update_bytes: PositiveInt = Field(
+        default=8 * 1024 * 1024,
+        description=(
+            "Maximum size (as BSON) of the $set sent in a single update when merging "
+            "into an existing record. Larger updates are split and sent together in a "
+            "bulk write. Must be below MongoDB's 16MiB document limit"
+        ),
+    )
+
+
+class IngestConfig(BaseModel):
+    batch_concurrency: PositiveInt = Field(
+        default=4,
+        description=(
+            "Maximum number of files submitted to /submit/hdf/batch being extracted, "
+            "checked and uploaded at any one time"
+        ),
+    )
+    max_channels_in_memory: PositiveInt = Field(
+        default=4,
+        description=(
+            "Maximum number of images, float images, waveforms and vectors of an "
+            "ingested file read into memory to be thumbnailed and uploaded at any one "
+            "time. Lower values reduce the peak memory used to ingest files with large "
+            "channels, at the cost of fewer concurrent uploads"
+        ),
+    )
+    spill_directory: DirectoryPath | None = Field(
+        default=None,
+        description=(
+            "Directory that submitted HDF files are copied to while they're ingested. "
+            "If not set, the system's temporary directory is used. This should be on "
+            "the same filesystem as backup.cache_directory, so files can be hardlinked "
+            "into the cache rather than copied"
+        ),
+    )
+    queue_workers: PositiveInt = Field(
+        default=2,
+        description=(
+            "Number of files submitted to /submit/hdf with asynchronous=true that are "
+            "ingested at any one time by each worker process of the API"
+        ),
+    )
+    queue_max_size: PositiveInt = Field(
+        default=64,
+        description=(
+            "Maximum number of files waiting to be ingested asynchronously by each "
+            "worker process. Further submissions are rejected with 503 until the queue "
+            "has drained"
+        ),
+    )
+
+
+class ExecutorConfig(BaseModel):
+    executor_type: Literal["thread", "process", "inline"] = Field(
+        default="thread",
+        description=(
+            "Where CPU bound work (false colour, thumbnails, PNG encoding) is run. "
+            "'thread' and 'process' use a pool so the event loop isn't blocked, "
+            "'inline' runs the work directly in the event loop"
+        ),
+    )
+    max_workers: PositiveInt | None = Field(
+        default=None,
+        description="Size of the pool, if not set the Python default is used",
+    )
+    max_queue_depth: PositiveInt = Field(
+        default=64,
+        description=(
+            "Maximum number of jobs submitted to the pool at once. Further jobs wait "
+            "(without blocking the event loop) until one has finished"
+        ),
+    )
 
 
 class MongoDB(BaseModel):
@@ -222,6 +431,9 @@ class APIConfig(BaseModel):
     waveforms: WaveformsConfig
     vectors: VectorsConfig
     echo: EchoConfig
+    records: RecordsConfig = RecordsConfig()
+    executor: ExecutorConfig = ExecutorConfig()
+    ingest: IngestConfig = IngestConfig()
     export: ExportConfig
     observability: ObservabilityConfig
     backup: BackupConfig | None = None
@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+import logging
+import time
+from typing import Any, Callable, TypeVar
+
+from operationsgateway_api.src.config import Config
+
+log = logging.getLogger()
+
+T = TypeVar("T")
+
+
+class CPUExecutor:
+    """
+    Runs CPU bound work (e.g. false colour, thumbnails and PNG encoding) outside of the
+    event loop so that it can continue to serve other requests while the work is done.
+
+    Depending on the configuration, work is run in a thread pool (NumPy and Pillow
+    release the GIL for most of their work), a process pool, or inline in the event
+    loop. A maximum number of jobs can be submitted at any one time, beyond which
+    callers wait (without blocking the event loop) for a job to finish.
+    """
+
+    def __init__(
+        self,
+        executor_type: str,
+        max_workers: int | None,
+        max_queue_depth: int,
+    ) -> None:
+        self.executor_type = executor_type
+        self.max_queue_depth = max_queue_depth
+        if executor_type == "thread":
+            self.executor: Executor | None = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="cpu_executor",
+            )
+        elif executor_type == "process":
+            self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self.executor = None
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.busy_seconds = 0.0
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run `function` with the given arguments in the executor and return its result.
+        When using a process pool, the function, its arguments and its result must be
+        picklable
+        """
+        if self.executor is None:
+            return function(*args, **kwargs)
+
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.submitted += 1
+        self.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self.executor,
+                partial(function, *args, **kwargs),
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.busy_seconds += time.perf_counter() - start_time
+            semaphore.release()
+
+        self.completed += 1
+        return result
+
+    def get_stats(self) -> dict[str, int | float | str]:
+        """
+        Return counts of the jobs run in the executor, how many are currently running
+        or waiting to be submitted, and the total time spent running them
+        """
+        return {
+            "executor_type": self.executor_type,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "busy_seconds": self.busy_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """
+        Shut down the executor, waiting for any running jobs to finish
+        """
+        if self.executor is not None:
+            log.info("Shutting down %s executor", self.executor_type)
+            self.executor.shutdown(wait=True)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        The semaphore limiting the queue depth can only be used in a single event loop,
+        so create a new one if the executor is being used from a different loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_queue_depth)
+            self._semaphore_loop = loop
+
+        return self._semaphore
+
+
+@lru_cache
+def get_cpu_executor() -> CPUExecutor:
+    """
+    Returns:
+        CPUExecutor: Cached object for running CPU bound work outside of the event loop.
+    """
+    executor_config = Config.config.executor
+    return CPUExecutor(
+        executor_config.executor_type,
+        executor_config.max_workers,
+        executor_config.max_queue_depth,
+    )
@@ -105,6 +105,12 @@ class EchoS3Error(ApiError):
         super().__init__(msg, status_code, *args, **kwargs)
 
 
+class IngestQueueFullError(ApiError):
+    def __init__(self, msg="Too many files waiting to be ingested", *args, **kwargs):
+        super().__init__(msg, *args, **kwargs)
+        self.status_code = 503
+
+
 class ExperimentDetailsError(ApiError):
     def __init__(self, msg="Error during handling of experiments", *args, **kwargs):
         super().__init__(msg, *args, **kwargs)
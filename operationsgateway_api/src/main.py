@@ -12,6 +12,7 @@ import uvicorn
 from operationsgateway_api.src.backup.backup_runner import BackupRunner
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.constants import LOG_CONFIG_LOCATION, ROUTE_MAPPINGS
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
 import operationsgateway_api.src.experiments.runners as runners
 from operationsgateway_api.src.experiments.unique_worker import (
     assign_event_to_single_worker,
@@ -19,6 +20,7 @@ from operationsgateway_api.src.experiments.unique_worker import (
 )
 from operationsgateway_api.src.mongo.connection import get_mongodb_connection
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
+from operationsgateway_api.src.records.ingestion.ingest_queue import get_ingest_queue
 from operationsgateway_api.src.routes import (
     auth,
     channels,
@@ -30,6 +32,7 @@ from operationsgateway_api.src.routes import (
     images,
     ingest_data,
     maintenance,
+    metrics,
     records,
     sessions,
     user_preferences,
@@ -92,12 +95,7 @@ async def lifespan(app: FastAPI):
         log.info("Backup task has not been enabled")
 
     echo_interface = get_echo_interface()
-    async with echo_interface.session.resource(
-        "s3",
-        endpoint_url=Config.config.echo.url,
-        aws_access_key_id=Config.config.echo.access_key.get_secret_value(),
-        aws_secret_access_key=Config.config.echo.secret_key.get_secret_value(),
-    ) as resource:
+    async with echo_interface.get_resource() as resource:
         await echo_interface.create_bucket(resource, True)
         log.debug("Bucket cached: %s", echo_interface._bucket)
 
@@ -114,6 +112,12 @@ async def lifespan(app: FastAPI):
     experiment_worker.remove_file()
     if Config.config.backup is not None:
         backup_worker.remove_file()
+    # Stop ingesting queued files before the pool and database connection go away
+    await get_ingest_queue().shutdown()
+    get_ingest_queue.cache_clear()
+    # Wait for any CPU bound work to finish before shutting down the pool
+    get_cpu_executor().shutdown()
+    get_cpu_executor.cache_clear()
     # Remove the old mongodb_connection from the cache before we close the connection
     get_mongodb_connection.cache_clear()
     mongodb_connection.mongo_client.close()
@@ -198,6 +202,7 @@ add_router_to_app(functions.router)
 add_router_to_app(filters.router)
 add_router_to_app(maintenance.router)
 add_router_to_app(version.router)
+add_router_to_app(metrics.router)
 
 log.debug("ROUTE_MAPPINGS contents:")
 for item in ROUTE_MAPPINGS.items():
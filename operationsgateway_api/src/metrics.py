@@ -0,0 +1,219 @@
+from operationsgateway_api.src.channels.channel_manifest import ChannelManifest
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
+from operationsgateway_api.src.records.echo_metrics import EchoMetrics, get_echo_metrics
+from operationsgateway_api.src.records.image_array_cache import get_image_array_cache
+from operationsgateway_api.src.records.ingestion.ingest_queue import get_ingest_queue
+from operationsgateway_api.src.records.object_cache import get_object_cache
+from operationsgateway_api.src.records.record import Record
+from operationsgateway_api.src.records.thumbnail_cache import get_thumbnail_cache
+from operationsgateway_api.src.single_flight import get_single_flight_stats
+
+NAMESPACE = "operationsgateway"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    formatted_labels = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+        formatted_labels.append(f'{name}="{value}"')
+
+    return "{" + ",".join(formatted_labels) + "}"
+
+
+def _add_metric(
+    lines: list[str],
+    name: str,
+    metric_type: str,
+    help_text: str,
+    samples: list[tuple[str, dict[str, str], int | float]],
+) -> None:
+    """
+    Add a metric in the Prometheus text format to `lines`, where each sample is the
+    suffix added to `name`, the labels and the value
+    """
+    lines.append(f"# HELP {NAMESPACE}_{name} {help_text}")
+    lines.append(f"# TYPE {NAMESPACE}_{name} {metric_type}")
+    for suffix, labels, value in samples:
+        lines.append(f"{NAMESPACE}_{name}{suffix}{_format_labels(labels)} {value}")
+
+
+def _add_stats(
+    lines: list[str],
+    name: str,
+    help_text: str,
+    stats: dict[str, int | float | str | None],
+    counters: set[str],
+) -> None:
+    """
+    Add each numeric value in `stats` (from one of the existing `get_cache_info()` or
+    `get_stats()` methods) as its own metric. Keys in `counters` only ever increase,
+    so are exposed as counters, the rest as gauges
+    """
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+
+        if key in counters:
+            metric_name, metric_type = f"{name}_{key}_total", "counter"
+        else:
+            metric_name, metric_type = f"{name}_{key}", "gauge"
+
+        help_text_key = f"{help_text}: {key}"
+        _add_metric(lines, metric_name, metric_type, help_text_key, [("", {}, value)])
+
+
+def _add_echo_metrics(lines: list[str]) -> None:
+    echo_stats = get_echo_metrics().get_stats()
+
+    latency_samples = []
+    for latency in echo_stats["latency"]:
+        labels = {"operation": latency["operation"], "prefix": latency["prefix"]}
+        for upper_bound, bucket_count in zip(
+            EchoMetrics.latency_buckets,
+            latency["buckets"],
+        ):
+            bucket_labels = {**labels, "le": str(upper_bound)}
+            latency_samples.append(("_bucket", bucket_labels, bucket_count))
+        latency_samples.append(("_bucket", {**labels, "le": "+Inf"}, latency["count"]))
+        latency_samples.append(("_sum", labels, latency["seconds"]))
+        latency_samples.append(("_count", labels, latency["count"]))
+    _add_metric(
+        lines,
+        "echo_request_duration_seconds",
+        "histogram",
+        "Time taken by requests to Echo",
+        latency_samples,
+    )
+
+    _add_metric(
+        lines,
+        "echo_bytes_total",
+        "counter",
+        "Bytes uploaded to or downloaded from Echo",
+        [
+            (
+                "",
+                {"operation": item["operation"], "prefix": item["prefix"]},
+                item["value"],
+            )
+            for item in echo_stats["bytes"]
+        ],
+    )
+    _add_metric(
+        lines,
+        "echo_errors_total",
+        "counter",
+        "Requests to Echo which failed, by error code",
+        [
+            (
+                "",
+                {
+                    "operation": item["operation"],
+                    "prefix": item["prefix"],
+                    "code": item["code"],
+                },
+                item["value"],
+            )
+            for item in echo_stats["errors"]
+        ],
+    )
+    cache_samples = []
+    for result, key in (("hit", "cache_hits"), ("miss", "cache_misses")):
+        for item in echo_stats[key]:
+            labels = {
+                "operation": item["operation"],
+                "prefix": item["prefix"],
+                "result": result,
+            }
+            cache_samples.append(("", labels, item["value"]))
+    _add_metric(
+        lines,
+        "echo_cache_requests_total",
+        "counter",
+        "Downloads from Echo served from the object cache (hit) or not (miss)",
+        cache_samples,
+    )
+
+
+def _add_single_flight_metrics(lines: list[str]) -> None:
+    single_flight_stats = get_single_flight_stats()
+    for key, metric_type, help_text in (
+        ("calls", "counter", "Calls which may be coalesced with a call in flight"),
+        ("coalesced", "counter", "Calls which waited for a call already in flight"),
+        ("in_flight", "gauge", "Calls currently in flight"),
+    ):
+        suffix = "_total" if metric_type == "counter" else ""
+        _add_metric(
+            lines,
+            f"single_flight_{key}{suffix}",
+            metric_type,
+            help_text,
+            [
+                ("", {"name": name}, stats[key])
+                for name, stats in sorted(single_flight_stats.items())
+            ],
+        )
+
+
+def get_metrics_text() -> str:
+    """
+    Return the metrics recorded by the API in the Prometheus text format. This includes
+    the requests made to Echo, as well as the statistics of the caches, the CPU
+    executor, coalesced downloads/decodes, the ingest queue and record updates
+    """
+    lines = []
+    _add_echo_metrics(lines)
+    _add_single_flight_metrics(lines)
+    _add_stats(
+        lines,
+        "object_cache",
+        "Cache of objects downloaded from Echo",
+        get_object_cache().get_cache_info(),
+        {"hits", "disk_hits", "misses", "evictions", "expirations"},
+    )
+    _add_stats(
+        lines,
+        "thumbnail_cache",
+        "Cache of thumbnails",
+        get_thumbnail_cache().get_cache_info(),
+        {"hits", "misses", "evictions"},
+    )
+    _add_stats(
+        lines,
+        "image_array_cache",
+        "Cache of decoded images",
+        get_image_array_cache().get_cache_info(),
+        {"hits", "misses", "evictions"},
+    )
+    _add_stats(
+        lines,
+        "channel_manifest_cache",
+        "Cache of the most recent channel manifest",
+        ChannelManifest.get_cache_info(),
+        {"hits", "misses"},
+    )
+    _add_stats(
+        lines,
+        "cpu_executor",
+        "Executor for CPU bound work",
+        get_cpu_executor().get_stats(),
+        {"submitted", "completed", "failed", "busy_seconds"},
+    )
+    _add_stats(
+        lines,
+        "ingest_queue",
+        "Queue of files being ingested in the background",
+        get_ingest_queue().get_stats(),
+        {"submitted", "completed", "failed", "busy_seconds"},
+    )
+    _add_stats(
+        lines,
+        "record_updates",
+        "Updates of existing records",
+        Record.get_update_stats(),
+        {"updates", "operations", "seconds"},
+    )
+    return "\n".join(lines) + "\n"
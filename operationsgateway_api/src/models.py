@@ -9,6 +9,7 @@ from pydantic import (
     ConfigDict,
     EmailStr,
     Field,
+    field_serializer,
     field_validator,
     model_validator,
     StringConstraints,
@@ -46,6 +47,39 @@ default_id = Field(None, alias="_id")
 default_exclude_field = Field(None, exclude=True)
 
 
+def to_float_array(value: Any) -> Any:
+    """
+    Used to validate the values of waveforms and vectors. One dimensional arrays of
+    real numbers (such as those read from a HDF file) are kept as read-only float64
+    arrays, rather than each element being converted to a Python float, and are only
+    converted to lists when the model is serialised. Any other array (including complex
+    ones) is converted to a list so its elements are validated as floats
+    """
+    if isinstance(value, np.ndarray):
+        if value.ndim == 1 and value.dtype.kind in "biuf":
+            array = value.astype(np.float64, copy=False).view()
+            array.flags.writeable = False
+            return array
+        elif value.dtype.kind == "c":
+            # Unlike numpy's complex types, Python complex numbers can't be validated as
+            # floats, so the imaginary part isn't dropped and the checks reject them
+            return value.tolist()
+        else:
+            return list(value)
+    else:
+        return value
+
+
+def to_float_list(value: Any) -> Any:
+    """
+    Serialise an array kept by `to_float_array()` as a list of floats
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    else:
+        return value
+
+
 class ChannelDtype(StrEnum):
     IMAGE = "image"
     FLOAT_IMAGE = "float_image"
@@ -73,28 +107,31 @@ class WaveformModel(BaseModel):
     # `exclude=True` inside `Field()` ensures it's not displayed when returned as a
     # response
     path: Optional[str] = default_exclude_field
-    x: Optional[Union[List[float], Any]]
-    y: Optional[Union[List[float], Any]]
+    x: Optional[Union[np.ndarray, List[float], Any]]
+    y: Optional[Union[np.ndarray, List[float], Any]]
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @field_validator("x", "y", mode="before")
     def encode_values(cls, value):  # noqa: N805
-        if isinstance(value, np.ndarray):
-            return list(value)
-        else:
-            return value
+        return to_float_array(value)
+
+    @field_serializer("x", "y")
+    def serialise_values(self, value):
+        return to_float_list(value)
 
 
 class VectorModel(BaseModel):
     path: str | Any | None = default_exclude_field
-    data: list[float] | Any | None
+    data: np.ndarray | list[float] | Any | None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @field_validator("data", mode="before")
     def validate_data(cls, value):  # noqa: N805
-        if isinstance(value, np.ndarray):
-            return list(value)
-        else:
-            return value
+        return to_float_array(value)
+
+    @field_serializer("data")
+    def serialise_data(self, value):
+        return to_float_list(value)
 
 
 class ImageChannelMetadataModel(BaseModel):
@@ -134,6 +171,8 @@ class ImageChannelModel(BaseModel):
     metadata: ImageChannelMetadataModel
     image_path: Optional[Union[str, Any]]
     thumbnail: Optional[Union[bytes, Any]] = None
+    # Factors of the image pyramid levels stored alongside the image, if any
+    pyramid_factors: Optional[Union[List[int], Any]] = None
 
 
 class FloatImageChannelMetadataModel(BaseModel):
@@ -471,3 +510,41 @@ class SubmitHDFResponse(BaseModel):
         description="Detailed information about which channels were "
         "accepted, rejected, and whether there are any warnings.",
     )
+
+
+class SubmitHDFBatchResponse(SubmitHDFResponse):
+    filename: Optional[str] = Field(..., description="Name of the submitted file.")
+    status_code: int = Field(
+        ...,
+        description="HTTP status code the file would have been given by /submit/hdf.",
+    )
+    response: Optional[IngestionResponse] = Field(
+        default=None,
+        description="Detailed information about which channels were "
+        "accepted, rejected, and whether there are any warnings. Not set if the file "
+        "was rejected.",
+    )
+
+
+class IngestJobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+
+class IngestJobModel(BaseModel):
+    id_: str = Field(alias="_id", description="ID of the job.")
+    filename: Optional[str] = Field(..., description="Name of the submitted file.")
+    status: IngestJobStatus = Field(
+        ...,
+        description="Whether the file is waiting to be ingested, being ingested, or "
+        "has finished being ingested (successfully or not).",
+    )
+    submitted: datetime
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+    result: Optional[SubmitHDFBatchResponse] = Field(
+        default=None,
+        description="The status code and response /submit/hdf would have returned for "
+        "the file. Only set once the job has finished.",
+    )
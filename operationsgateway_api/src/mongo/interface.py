@@ -1,10 +1,28 @@
 import logging
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from pymongo.collection import Collection
 from pymongo.cursor import Cursor
-from pymongo.errors import DuplicateKeyError, InvalidName, PyMongoError, WriteError
+from pymongo.errors import (
+    BulkWriteError,
+    DuplicateKeyError,
+    InvalidName,
+    PyMongoError,
+    WriteError,
+)
+from pymongo.operations import UpdateOne
 from pymongo.results import (
+    BulkWriteResult,
     DeleteResult,
     InsertManyResult,
     InsertOneResult,
@@ -102,6 +120,39 @@ class MongoDBInterface:
 
         return await query.to_list(length=Config.config.mongodb.max_documents)
 
+    @staticmethod
+    async def query_to_async_iterator(query: Cursor) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Sends the query to MongoDB and yields the results one document at a time, so
+        the whole result set never needs to be held in memory
+
+        As with `query_to_list()`, the configured maximum number of documents limits the
+        result set. `mongodb_error_handling` cannot wrap an async generator, so errors
+        are converted to `DatabaseError` here instead
+        """
+
+        log.info(
+            "Getting query results and iterating over them: %d",
+            Config.config.mongodb.max_documents,
+        )
+
+        max_documents = Config.config.mongodb.max_documents
+        try:
+            document_count = 0
+            async for document in query:
+                yield document
+                document_count += 1
+                if document_count >= max_documents:
+                    break
+        except PyMongoError as exc:
+            log.error("Database operation: query_to_async_iterator failed")
+            raise DatabaseError(
+                "Database operation failed during query_to_async_iterator",
+            ) from exc
+        finally:
+            # Release the server side cursor if we stopped before exhausting it
+            await query.close()
+
     @staticmethod
     @mongodb_error_handling("find_one")
     async def find_one(
@@ -183,6 +234,34 @@ class MongoDBInterface:
                 collection_name,
             ) from exc
 
+    @staticmethod
+    @mongodb_error_handling("bulk_write")
+    async def bulk_write(
+        collection_name: str,
+        requests: List[UpdateOne],
+        ordered: bool = True,
+    ) -> BulkWriteResult:
+        """
+        Send multiple write operations to a given collection in a single call. PyMongo
+        splits these into as few batches as the server allows
+        """
+
+        log.info(
+            "Sending bulk_write() of %d operations to MongoDB, collection: %s",
+            len(requests),
+            collection_name,
+        )
+
+        collection = MongoDBInterface.get_collection_object(collection_name)
+        try:
+            return await collection.bulk_write(requests, ordered=ordered)
+        except BulkWriteError as exc:
+            log.exception(msg=exc)
+            raise DatabaseError(
+                f"Error when writing multiple documents in {collection_name}"
+                " collection",
+            ) from exc
+
     @staticmethod
     @mongodb_error_handling("insert_one")
     async def insert_one(collection_name: str, data: Dict[str, Any]) -> InsertOneResult:
@@ -211,17 +290,21 @@ class MongoDBInterface:
     async def insert_many(
         collection_name: str,
         data: List[Dict[str, Any]],
+        ordered: bool = True,
     ) -> InsertManyResult:
         """
-        Using the input data, insert multiple documents into a given collection
+        Using the input data, insert multiple documents into a given collection. If
+        `ordered` is False, the remaining documents are still inserted after one fails,
+        and the `BulkWriteError` the raised `DatabaseError` is chained from lists which
+        documents weren't inserted
         """
 
         log.info("Sending insert_many() to MongoDB, collection: %s", collection_name)
 
         collection = MongoDBInterface.get_collection_object(collection_name)
         try:
-            return await collection.insert_many(data)
-        except WriteError as exc:
+            return await collection.insert_many(data, ordered=ordered)
+        except (BulkWriteError, WriteError) as exc:
             log.exception(msg=exc)
             raise DatabaseError(
                 f"Error when inserting multiple documents in {collection_name}"
@@ -259,6 +342,34 @@ class MongoDBInterface:
                 collection_name,
             ) from exc
 
+    @staticmethod
+    @mongodb_error_handling("delete_many")
+    async def delete_many(
+        collection_name: str,
+        filter_: Dict[str, Any],
+    ) -> DeleteResult:
+        """
+        Given a condition, delete all matching documents from a collection
+        """
+
+        log.info("Sending delete_many() to MongoDB, collection: %s", collection_name)
+
+        collection = MongoDBInterface.get_collection_object(collection_name)
+        try:
+            return await collection.delete_many(filter_)
+        except PyMongoError as exc:
+            log.error(
+                "Error removing multiple documents in %s collection. The following "
+                "filter was used: %s",
+                collection_name,
+                filter_,
+            )
+            log.exception(msg=exc)
+            raise DatabaseError(
+                "Error removing documents from MongoDB, collection: %s",
+                collection_name,
+            ) from exc
+
     @staticmethod
     @mongodb_error_handling("count_documents")
     async def count_documents(
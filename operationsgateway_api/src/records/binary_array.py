@@ -0,0 +1,92 @@
+import struct
+
+import numpy as np
+
+from operationsgateway_api.src.exceptions import RecordError
+
+
+class BinaryArray:
+    """
+    Encodes one or more float64 arrays of the same length (e.g. the x and y of a
+    waveform) as a fixed size header followed by the values, stored row by row. Storing
+    the rows contiguously means any slice of the arrays is a single range of bytes at a
+    known offset, which can be requested from Echo with a `Range` GET without first
+    downloading the header, and decoded without copying using `np.frombuffer()`.
+
+    The header contains a magic string, the version of the layout, the number of columns
+    (arrays) and the number of rows (length of each array), all little endian.
+    """
+
+    magic = b"OGBA"
+    version = 1
+    header_format = "<4sHHQ"
+    header_size = struct.calcsize(header_format)
+    dtype = np.dtype("<f8")
+
+    @staticmethod
+    def encode(*columns: list[float] | np.ndarray) -> bytes:
+        """
+        Encode `columns`, which must all have the same length, into the binary layout
+        """
+        rows = np.column_stack(
+            [np.asarray(column, dtype=BinaryArray.dtype) for column in columns],
+        )
+        header = struct.pack(
+            BinaryArray.header_format,
+            BinaryArray.magic,
+            BinaryArray.version,
+            len(columns),
+            len(rows),
+        )
+        return header + rows.tobytes()
+
+    @staticmethod
+    def is_binary_array(data: bytes) -> bool:
+        """
+        Return whether `data` starts with the header of the binary layout
+        """
+        return data[: len(BinaryArray.magic)] == BinaryArray.magic
+
+    @staticmethod
+    def decode(data: bytes) -> np.ndarray:
+        """
+        Decode a complete object in the binary layout, returning a read only array with
+        a row for each element and a column for each of the encoded arrays
+        """
+        if len(data) < BinaryArray.header_size or not BinaryArray.is_binary_array(data):
+            raise RecordError("Object is not a binary array")
+
+        _, version, columns, rows = struct.unpack_from(BinaryArray.header_format, data)
+        if version != BinaryArray.version:
+            raise RecordError(f"Unsupported binary array version: {version}")
+
+        return BinaryArray.decode_rows(
+            memoryview(data)[BinaryArray.header_size :],
+            columns,
+        )[:rows]
+
+    @staticmethod
+    def decode_rows(data: bytes | memoryview, columns: int) -> np.ndarray:
+        """
+        Decode rows of values (without the header), such as those returned by a ranged
+        request for the byte range from `get_byte_range()`
+        """
+        return np.frombuffer(data, dtype=BinaryArray.dtype).reshape(-1, columns)
+
+    @staticmethod
+    def get_byte_range(
+        columns: int,
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> tuple[int, int | None]:
+        """
+        Return the first and last (inclusive, as used by HTTP `Range` headers) bytes
+        containing the rows from `start` up to but not including `stop`. If `stop` is
+        `None`, the last byte is also `None` to request the rest of the object
+        """
+        row_bytes = columns * BinaryArray.dtype.itemsize
+        first_byte = BinaryArray.header_size + (start or 0) * row_bytes
+        if stop is None:
+            return first_byte, None
+        else:
+            return first_byte, BinaryArray.header_size + stop * row_bytes - 1
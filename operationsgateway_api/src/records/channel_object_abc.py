@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
 import logging
+from typing import Any
+
+import numpy as np
 
 from operationsgateway_api.src.exceptions import EchoS3Error
 from operationsgateway_api.src.mongo.interface import MongoDBInterface
+from operationsgateway_api.src.records.binary_array import BinaryArray
 from operationsgateway_api.src.records.echo_interface import (
     EchoInterface,
     get_echo_interface,
@@ -21,19 +25,88 @@ class ChannelObjectABC(ABC):
     @abstractmethod
     def echo_extension(self) -> str: ...
 
+    @classmethod
+    def get_echo_extensions(cls) -> list[str]:
+        """
+        Returns the extensions that objects of this type can be stored with in Echo.
+        The first is used when storing new objects.
+        """
+        return [cls.echo_extension]
+
+    @staticmethod
+    async def get_channel_field(record_id: str, channel_name: str, field: str) -> Any:
+        """
+        Returns the value of `field` stored in the database for this record and channel,
+        or None if it can't be found. Only that field of the record is projected.
+        """
+        record = await MongoDBInterface.find_one(
+            "records",
+            filter_={"_id": record_id},
+            projection=[f"channels.{channel_name}.{field}"],
+        )
+        channel = (record or {}).get("channels", {}).get(channel_name, {})
+        return channel.get(field)
+
+    @classmethod
+    async def get_stored_path(cls, record_id: str, channel_name: str) -> str | None:
+        """
+        Returns the relative path stored in the database for this record and channel,
+        or None if it can't be found. Only classes which define `path_field`, the name
+        of the field the path is stored in, can look up their paths.
+        """
+        return await cls.get_channel_field(record_id, channel_name, cls.path_field)
+
+    @classmethod
+    def get_echo_locations(
+        cls,
+        record_id: str,
+        channel_name: str,
+        stored_path: str | None = None,
+    ) -> list[tuple[str, bool]]:
+        """
+        Returns each extension the object for this record and channel may be stored
+        with, and whether to try the subdirectory layout first for that extension. If
+        `stored_path` is given, its extension and layout come first so the object can
+        be found with a single request.
+        """
+        echo_extensions = cls.get_echo_extensions()
+        if stored_path is None:
+            return [(echo_extension, True) for echo_extension in echo_extensions]
+
+        stored_extension = stored_path.rsplit(".", 1)[-1]
+        if stored_extension not in echo_extensions:
+            return [(echo_extension, True) for echo_extension in echo_extensions]
+
+        flat_path = cls.get_relative_path(
+            record_id=record_id,
+            channel_name=channel_name,
+            use_subdirectories=False,
+            echo_extension=stored_extension,
+        )
+        echo_locations = [(stored_extension, stored_path != flat_path)]
+        for echo_extension in echo_extensions:
+            if echo_extension != stored_extension:
+                echo_locations.append((echo_extension, True))
+        return echo_locations
+
     @classmethod
     def get_relative_path(
         cls,
         record_id: str,
         channel_name: str,
         use_subdirectories: bool = True,
+        echo_extension: str | None = None,
     ) -> str:
         """
         Returns a relative path given a record ID and channel name. The path is relative
-        to the base directory of where objects of this type are stored in Echo.
+        to the base directory of where objects of this type are stored in Echo. If
+        `echo_extension` isn't given, the one used for new objects is used.
         """
+        if echo_extension is None:
+            echo_extension = cls.get_echo_extensions()[0]
+
         directories = EchoInterface.format_record_id(record_id, use_subdirectories)
-        return f"{directories}/{channel_name}.{cls.echo_extension}"
+        return f"{directories}/{channel_name}.{echo_extension}"
 
     @classmethod
     def get_full_path(cls, relative_path: str) -> str:
@@ -49,26 +122,53 @@ class ChannelObjectABC(ABC):
         record_id: str,
         channel_name: str,
         use_subdirectories: bool = True,
+        echo_extension: str | None = None,
+        byte_range: tuple[int, int | None] | None = None,
+        handle_missing: bool = True,
     ) -> bytes:
         """
-        Gets the bytes for this record and channel, handling any exceptions.
+        Gets the bytes for this record and channel, handling any exceptions. If
+        `byte_range` is given, only the bytes from the first to the last byte
+        (inclusive) of the range are downloaded.
+
+        If `handle_missing` is False, the `EchoS3Error` is raised without checking the
+        database for the record, for when the object may be stored with another
+        extension. Objects which are expected to be missing (because another path or
+        extension will be tried next) aren't logged or counted as errors.
         """
         echo_interface = get_echo_interface()
+        missing_ok = use_subdirectories or not handle_missing
         try:
             relative_path = cls.get_relative_path(
                 record_id=record_id,
                 channel_name=channel_name,
                 use_subdirectories=use_subdirectories,
+                echo_extension=echo_extension,
             )
             full_path = cls.get_full_path(relative_path)
-            return await echo_interface.download_file_object(full_path)
+            if byte_range is None:
+                return await echo_interface.download_file_object(
+                    full_path,
+                    missing_ok=missing_ok,
+                )
+            else:
+                return await echo_interface.download_file_object_range(
+                    full_path,
+                    *byte_range,
+                    missing_ok=missing_ok,
+                )
         except EchoS3Error as exc:
             if use_subdirectories:
                 return await cls.get_bytes(
                     record_id=record_id,
                     channel_name=channel_name,
                     use_subdirectories=False,
+                    echo_extension=echo_extension,
+                    byte_range=byte_range,
+                    handle_missing=handle_missing,
                 )
+            elif not handle_missing:
+                raise
             else:
                 await cls.handle_exception(
                     record_id=record_id,
@@ -76,6 +176,55 @@ class ChannelObjectABC(ABC):
                     exc=exc,
                 )
 
+    @classmethod
+    async def get_binary_array(
+        cls,
+        record_id: str,
+        channel_name: str,
+        echo_extension: str,
+        columns: int,
+        start: int | None = None,
+        stop: int | None = None,
+        handle_missing: bool = True,
+        use_subdirectories: bool = True,
+    ) -> np.ndarray:
+        """
+        Gets an object stored using `BinaryArray` for this record and channel, returning
+        the rows from `start` up to but not including `stop`. If either is given, only
+        the bytes for those rows are downloaded using a ranged request.
+        """
+        if start is None and stop is None:
+            array_bytes = await cls.get_bytes(
+                record_id=record_id,
+                channel_name=channel_name,
+                use_subdirectories=use_subdirectories,
+                echo_extension=echo_extension,
+                handle_missing=handle_missing,
+            )
+            return BinaryArray.decode(array_bytes)
+
+        if stop is not None and stop <= (start or 0):
+            # Nothing to download, but check the object exists by getting its header
+            await cls.get_bytes(
+                record_id=record_id,
+                channel_name=channel_name,
+                use_subdirectories=use_subdirectories,
+                echo_extension=echo_extension,
+                handle_missing=handle_missing,
+                byte_range=(0, BinaryArray.header_size - 1),
+            )
+            return np.empty((0, columns), dtype=BinaryArray.dtype)
+
+        array_bytes = await cls.get_bytes(
+            record_id=record_id,
+            channel_name=channel_name,
+            use_subdirectories=use_subdirectories,
+            echo_extension=echo_extension,
+            handle_missing=handle_missing,
+            byte_range=BinaryArray.get_byte_range(columns, start, stop),
+        )
+        return BinaryArray.decode_rows(array_bytes, columns)
+
     @classmethod
     async def handle_exception(
         cls,
@@ -1,14 +1,20 @@
+import asyncio
 from functools import lru_cache
 from io import BytesIO
 import logging
+from typing import AsyncContextManager
 
 import aioboto3
-from async_lru import alru_cache
+from aiobotocore.config import AioConfig
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from mypy_boto3_s3.service_resource import Bucket, Object, S3ServiceResource
 
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.exceptions import EchoS3Error
+from operationsgateway_api.src.records.echo_metrics import get_echo_metrics
+from operationsgateway_api.src.records.object_cache import get_object_cache
+from operationsgateway_api.src.single_flight import get_single_flight
 
 log = logging.getLogger()
 
@@ -25,11 +31,47 @@ class EchoInterface:
     https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html
     """
 
+    delete_objects_batch_size = 1000
+    # Error codes returned when downloading an object which doesn't exist, using
+    # `download_fileobj()` and `get_object()` respectively
+    missing_codes = ("404", "NoSuchKey")
+
     def __init__(self) -> None:
         log.debug("Creating S3 resource to connect to Echo")
         self.session = aioboto3.Session()
         self._bucket = None  # This will be set by the lifespan of the API on startup
 
+    def get_resource(self) -> AsyncContextManager[S3ServiceResource]:
+        """
+        Returns a context manager for an S3 resource connected to Echo. The size of the
+        connection pool and the retry mode are set from the config, so they apply to
+        every request made using the resource (and any bucket created from it)
+        """
+        echo_config = Config.config.echo
+        return self.session.resource(
+            "s3",
+            endpoint_url=echo_config.url,
+            aws_access_key_id=echo_config.access_key.get_secret_value(),
+            aws_secret_access_key=echo_config.secret_key.get_secret_value(),
+            config=AioConfig(
+                max_pool_connections=echo_config.max_pool_connections,
+                retries={"mode": echo_config.retry_mode},
+            ),
+        )
+
+    @staticmethod
+    def get_transfer_config() -> TransferConfig:
+        """
+        Returns the config used when uploading or downloading whole objects, which
+        controls when and how objects are split into multiple parts
+        """
+        echo_config = Config.config.echo
+        return TransferConfig(
+            multipart_threshold=echo_config.multipart_threshold,
+            multipart_chunksize=echo_config.multipart_chunksize,
+            max_concurrency=echo_config.max_transfer_concurrency,
+        )
+
     @staticmethod
     def format_record_id(record_id: str, use_subdirectories: bool = True) -> str:
         """
@@ -112,12 +154,7 @@ class EchoInterface:
         else:
             msg = "EchoInterface._bucket unexpectedly None, creating with new resource"
             log.warning(msg)
-            async with self.session.resource(
-                "s3",
-                endpoint_url=Config.config.echo.url,
-                aws_access_key_id=Config.config.echo.access_key.get_secret_value(),
-                aws_secret_access_key=Config.config.echo.secret_key.get_secret_value(),
-            ) as resource:
+            async with self.get_resource() as resource:
                 return await self.create_bucket(resource)
 
     async def head_object(self, object_path: str) -> bool:
@@ -129,27 +166,101 @@ class EchoInterface:
         log.info("Head object in Echo: %s", object_path)
         bucket = await self.get_bucket()
         try:
-            await bucket.meta.client.head_object(
-                Bucket=Config.config.echo.bucket_name,
-                Key=object_path,
-            )
+            with get_echo_metrics().time_operation("head", object_path):
+                await bucket.meta.client.head_object(
+                    Bucket=Config.config.echo.bucket_name,
+                    Key=object_path,
+                )
             return True
         except ClientError:
             return False
 
-    @alru_cache(maxsize=Config.config.echo.cache_maxsize)
-    async def download_file_object(self, object_path: str) -> bytes:
+    async def list_objects(self, prefix: str) -> set[str]:
+        """
+        https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/list_objects_v2.html
+        Returns the paths of all objects starting with `prefix`, using `ListObjectsV2`
+        requests of up to 1000 keys each. This allows the existence of many objects in
+        the same directory to be checked without sending a `HeadObject` request for each
+        """
+        log.info("Listing objects in Echo: %s", prefix)
+        bucket = await self.get_bucket()
+        paginator = bucket.meta.client.get_paginator("list_objects_v2")
+        object_paths = set()
+        try:
+            with get_echo_metrics().time_operation("list", prefix):
+                async for page in paginator.paginate(
+                    Bucket=Config.config.echo.bucket_name,
+                    Prefix=prefix,
+                ):
+                    contents = page.get("Contents", [])
+                    object_paths.update(item["Key"] for item in contents)
+        except ClientError as exc:
+            code = exc.response["Error"]["Code"]
+            log.exception("%s when listing objects in %s", code, prefix)
+            raise EchoS3Error(f"{code} when listing objects in '{prefix}'") from exc
+
+        return object_paths
+
+    async def download_file_object(
+        self,
+        object_path: str,
+        missing_ok: bool = False,
+    ) -> bytes:
+        """
+        Download an object from S3 using `download_fileobj()` and return the bytes. The
+        bytes are cached, so repeated requests for the same object are not downloaded
+        again until they expire or are invalidated. Requests for an object which is
+        already being downloaded wait for that download rather than starting another
+
+        If `missing_ok`, the object not existing is expected by the caller, so the
+        `EchoS3Error` is raised without logging it or counting it as an error
+        """
+        cached_bytes = await get_object_cache().get_async(object_path)
+        get_echo_metrics().add_cache_result(
+            "download",
+            object_path,
+            cached_bytes is not None,
+        )
+        if cached_bytes is not None:
+            log.debug("Using cached bytes for %s", object_path)
+            return cached_bytes
+
+        return await get_single_flight("echo_download").run(
+            object_path,
+            self._download_file_object,
+            object_path,
+            missing_ok,
+        )
+
+    async def _download_file_object(
+        self,
+        object_path: str,
+        missing_ok: bool = False,
+    ) -> bytes:
         """
-        Download an object from S3 using `download_fileobj()` and return the bytes
+        Download an object from S3 and add it to the cache
         """
+        echo_metrics = get_echo_metrics()
         log.info("Download file from Echo: %s", object_path)
         bucket = await self.get_bucket()
         file = BytesIO()
         try:
-            await bucket.download_fileobj(Fileobj=file, Key=object_path)
+            with echo_metrics.time_operation(
+                "download",
+                object_path,
+                ignored_codes=self.missing_codes if missing_ok else (),
+            ):
+                await bucket.download_fileobj(
+                    Fileobj=file,
+                    Key=object_path,
+                    Config=self.get_transfer_config(),
+                )
         except ClientError as exc:
             code = exc.response["Error"]["Code"]
-            log.exception("%s when downloading file at %s", code, object_path)
+            if missing_ok and code in self.missing_codes:
+                log.debug("%s when downloading file at %s", code, object_path)
+            else:
+                log.exception("%s when downloading file at %s", code, object_path)
             raise EchoS3Error(
                 f"{code} when downloading file at '{object_path}'",
                 status_code=code,
@@ -162,7 +273,77 @@ class EchoInterface:
                 object_path,
             )
 
-        return file.getvalue()
+        object_bytes = file.getvalue()
+        echo_metrics.add_bytes("download", object_path, len(object_bytes))
+        await get_object_cache().put_async(object_path, object_bytes)
+        return object_bytes
+
+    async def download_file_object_range(
+        self,
+        object_path: str,
+        first_byte: int,
+        last_byte: int | None = None,
+        missing_ok: bool = False,
+    ) -> bytes:
+        """
+        https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
+        Download the bytes of an object from `first_byte` to `last_byte` (inclusive)
+        using a `Range` GET, or to the end of the object if `last_byte` is `None`. If
+        `first_byte` is beyond the end of the object, empty bytes are returned.
+
+        If the whole object is already cached, the range is taken from the cached bytes
+        instead. Ranges are not cached themselves. `missing_ok` is used in the same way
+        as for `download_file_object()`.
+        """
+        echo_metrics = get_echo_metrics()
+        end = None if last_byte is None else last_byte + 1
+        cached_bytes = await get_object_cache().get_async(object_path)
+        echo_metrics.add_cache_result(
+            "download_range",
+            object_path,
+            cached_bytes is not None,
+        )
+        if cached_bytes is not None:
+            log.debug("Using cached bytes for range of %s", object_path)
+            return cached_bytes[first_byte:end]
+
+        byte_range = f"bytes={first_byte}-{'' if last_byte is None else last_byte}"
+        log.info("Download %s of file from Echo: %s", byte_range, object_path)
+        bucket = await self.get_bucket()
+        try:
+            with echo_metrics.time_operation(
+                "download_range",
+                object_path,
+                ignored_codes=self.missing_codes if missing_ok else (),
+            ):
+                response = await bucket.meta.client.get_object(
+                    Bucket=Config.config.echo.bucket_name,
+                    Key=object_path,
+                    Range=byte_range,
+                )
+                async with response["Body"] as body:
+                    range_bytes = await body.read()
+        except ClientError as exc:
+            code = exc.response["Error"]["Code"]
+            if code == "InvalidRange":
+                return b""
+
+            if missing_ok and code in self.missing_codes:
+                log.debug("%s when downloading %s of %s", code, byte_range, object_path)
+            else:
+                log.exception(
+                    "%s when downloading %s of %s",
+                    code,
+                    byte_range,
+                    object_path,
+                )
+            raise EchoS3Error(
+                f"{code} when downloading file at '{object_path}'",
+                status_code=code,
+            ) from exc
+
+        echo_metrics.add_bytes("download_range", object_path, len(range_bytes))
+        return range_bytes
 
     async def upload_file_object(self, file_object: BytesIO, object_path: str) -> None:
         """
@@ -172,13 +353,22 @@ class EchoInterface:
         log.info("Uploading file to %s", object_path)
         bucket = await self.get_bucket()
         file_object.seek(0)
+        echo_metrics = get_echo_metrics()
         try:
-            await bucket.upload_fileobj(file_object, object_path)
+            with echo_metrics.time_operation("upload", object_path):
+                await bucket.upload_fileobj(
+                    file_object,
+                    object_path,
+                    Config=self.get_transfer_config(),
+                )
         except ClientError as exc:
             code = exc.response["Error"]["Code"]
             log.exception("%s when uploading file at %s", code, object_path)
             raise EchoS3Error(f"{code} when uploading file at '{object_path}'") from exc
+        finally:
+            get_object_cache().invalidate(object_path)
 
+        echo_metrics.add_bytes("upload", object_path, file_object.getbuffer().nbytes)
         log.debug("Uploaded file successfully to %s", object_path)
 
     async def delete_file_object(self, object_path: str) -> None:
@@ -188,28 +378,97 @@ class EchoInterface:
         log.info("Deleting file from %s", object_path)
         bucket = await self.get_bucket()
         try:
-            obj: Object = await bucket.Object(object_path)
-            await obj.delete()
+            with get_echo_metrics().time_operation("delete", object_path):
+                obj: Object = await bucket.Object(object_path)
+                await obj.delete()
         except ClientError as exc:
             code = exc.response["Error"]["Code"]
             log.exception("%s when deleting file at %s", code, object_path)
             raise EchoS3Error(f"{code} when deleting file at '{object_path}'") from exc
+        finally:
+            get_object_cache().invalidate(object_path)
+
+    async def delete_file_objects(self, object_paths: list[str]) -> None:
+        """
+        https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/delete_objects.html
+        Delete files from Echo using `DeleteObjects` requests of up to 1000 keys (the
+        most allowed in one request), sending up to `echo.delete_concurrency` requests
+        at once. Keys which don't exist are not treated as errors. This is used to
+        delete the objects of records when deleting them by their IDs
+        """
+        batch_size = EchoInterface.delete_objects_batch_size
+        batches = [
+            object_paths[i : i + batch_size]
+            for i in range(0, len(object_paths), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(Config.config.echo.delete_concurrency)
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(self._delete_batch(batch, semaphore))
+                for batch in batches
+            ]
+
+        errors = [error for task in tasks for error in task.result()]
+        if errors:
+            key, code = errors[0]["Key"], errors[0]["Code"]
+            raise EchoS3Error(
+                f"{len(errors)} of {len(object_paths)} files could not be deleted, "
+                f"including {code} when deleting file at '{key}'",
+            )
+
+    async def _delete_batch(
+        self,
+        object_paths: list[str],
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict[str, str]]:
+        """
+        Send a single `DeleteObjects` request, returning the keys and codes of any
+        objects which could not be deleted
+        """
+        async with semaphore:
+            log.info("Deleting %d files from Echo", len(object_paths))
+            bucket = await self.get_bucket()
+            delete = {
+                "Objects": [{"Key": object_path} for object_path in object_paths],
+                "Quiet": True,
+            }
+            try:
+                with get_echo_metrics().time_operation("delete_batch", *object_paths):
+                    response = await bucket.meta.client.delete_objects(
+                        Bucket=Config.config.echo.bucket_name,
+                        Delete=delete,
+                    )
+                errors = response.get("Errors", [])
+            except ClientError as exc:
+                code = exc.response["Error"]["Code"]
+                log.exception("%s when deleting %d files", code, len(object_paths))
+                errors = [{"Key": path, "Code": code} for path in object_paths]
+            finally:
+                object_cache = get_object_cache()
+                for object_path in object_paths:
+                    object_cache.invalidate(object_path)
+
+        for error in errors:
+            log.error("%s when deleting file at %s", error["Code"], error["Key"])
+        return errors
 
     async def delete_directory(self, dir_path: str) -> None:
         """
-        Given a path, delete an entire 'directory' from Echo. This is used to delete
-        waveforms and images when deleting a record by its ID
+        Given a path, delete an entire 'directory' from Echo
         """
 
         log.info("Deleting directory from %s", dir_path)
         bucket = await self.get_bucket()
         try:
-            objects = bucket.objects.filter(Prefix=dir_path)
-            await objects.delete()
+            with get_echo_metrics().time_operation("delete_directory", dir_path):
+                objects = bucket.objects.filter(Prefix=dir_path)
+                await objects.delete()
         except ClientError as exc:
             code = exc.response["Error"]["Code"]
             log.exception("%s when deleting directory %s", code, dir_path)
             raise EchoS3Error(f"{code} when deleting directory '{dir_path}'") from exc
+        finally:
+            get_object_cache().invalidate_prefix(dir_path)
 
 
 @lru_cache
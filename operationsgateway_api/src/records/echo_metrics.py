@@ -0,0 +1,181 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+import logging
+import threading
+import time
+from typing import Iterator
+
+from botocore.exceptions import ClientError
+
+log = logging.getLogger()
+
+
+class EchoMetrics:
+    """
+    Records the latency, number of bytes transferred, errors and cache hits/misses of
+    operations on Echo. Every value is labelled by the operation and the prefix of the
+    object(s) involved (e.g. `images` or `waveforms`), so that the time spent waiting
+    for Echo can be separated from the time spent processing the objects.
+
+    Latencies are stored as cumulative histograms using `latency_buckets`, in the same
+    way as Prometheus, so they can be exposed on `/metrics` without any conversion.
+    """
+
+    latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    prefixes = ("images", "float_images", "waveforms", "vectors")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bucket_counts = defaultdict(lambda: [0] * len(self.latency_buckets))
+        self._counts = Counter()
+        self._seconds = defaultdict(float)
+        self._bytes = Counter()
+        self._errors = Counter()
+        self._cache_hits = Counter()
+        self._cache_misses = Counter()
+
+    @staticmethod
+    def get_prefix(*object_paths: str) -> str:
+        """
+        Returns the top level directory shared by all of `object_paths` if it is one of
+        `prefixes`, `mixed` if they have different prefixes, otherwise `other`
+        """
+        prefixes = {object_path.split("/", 1)[0] for object_path in object_paths}
+        if len(prefixes) > 1:
+            return "mixed"
+
+        prefix = prefixes.pop() if prefixes else ""
+        return prefix if prefix in EchoMetrics.prefixes else "other"
+
+    @contextmanager
+    def time_operation(
+        self,
+        operation: str,
+        *object_paths: str,
+        ignored_codes: tuple[str, ...] = (),
+    ) -> Iterator[None]:
+        """
+        Time the operation performed within the context, counting the code of any
+        `ClientError` raised as an error before re-raising it. Codes in `ignored_codes`
+        are expected by the caller, so aren't counted
+        """
+        start_time = time.perf_counter()
+        error_code = None
+        try:
+            yield
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] not in ignored_codes:
+                error_code = exc.response["Error"]["Code"]
+            raise
+        finally:
+            self.observe(
+                operation,
+                self.get_prefix(*object_paths),
+                time.perf_counter() - start_time,
+                error_code,
+            )
+
+    def observe(
+        self,
+        operation: str,
+        prefix: str,
+        seconds: float,
+        error_code: str | None = None,
+    ) -> None:
+        """
+        Record the latency of a single operation, and its error code if it failed
+        """
+        key = (operation, prefix)
+        with self._lock:
+            self._counts[key] += 1
+            self._seconds[key] += seconds
+            bucket_counts = self._bucket_counts[key]
+            for i, upper_bound in enumerate(self.latency_buckets):
+                if seconds <= upper_bound:
+                    bucket_counts[i] += 1
+            if error_code is not None:
+                self._errors[(operation, prefix, error_code)] += 1
+
+    def add_bytes(self, operation: str, object_path: str, byte_count: int) -> None:
+        """
+        Add to the number of bytes uploaded or downloaded by an operation
+        """
+        with self._lock:
+            self._bytes[(operation, self.get_prefix(object_path))] += byte_count
+
+    def add_cache_result(self, operation: str, object_path: str, hit: bool) -> None:
+        """
+        Count whether an operation was served from the object cache rather than Echo
+        """
+        key = (operation, self.get_prefix(object_path))
+        with self._lock:
+            if hit:
+                self._cache_hits[key] += 1
+            else:
+                self._cache_misses[key] += 1
+
+    def get_stats(self) -> dict[str, list[dict[str, str | int | float | list[int]]]]:
+        """
+        Return the latency histograms, byte counts, error counts and cache hits/misses
+        for each operation and prefix. Histogram bucket counts are cumulative and
+        exclude the implicit `+Inf` bucket, which is equal to `count`
+        """
+        with self._lock:
+            return {
+                "latency": [
+                    {
+                        "operation": operation,
+                        "prefix": prefix,
+                        "count": self._counts[(operation, prefix)],
+                        "seconds": self._seconds[(operation, prefix)],
+                        "buckets": list(self._bucket_counts[(operation, prefix)]),
+                    }
+                    for operation, prefix in sorted(self._counts)
+                ],
+                "bytes": [
+                    {"operation": operation, "prefix": prefix, "value": value}
+                    for (operation, prefix), value in sorted(self._bytes.items())
+                ],
+                "errors": [
+                    {
+                        "operation": operation,
+                        "prefix": prefix,
+                        "code": code,
+                        "value": value,
+                    }
+                    for (operation, prefix, code), value in sorted(self._errors.items())
+                ],
+                "cache_hits": [
+                    {"operation": operation, "prefix": prefix, "value": value}
+                    for (operation, prefix), value in sorted(self._cache_hits.items())
+                ],
+                "cache_misses": [
+                    {"operation": operation, "prefix": prefix, "value": value}
+                    for (operation, prefix), value in sorted(
+                        self._cache_misses.items(),
+                    )
+                ],
+            }
+
+    def clear(self) -> None:
+        """
+        Reset all metrics
+        """
+        with self._lock:
+            self._bucket_counts.clear()
+            self._counts.clear()
+            self._seconds.clear()
+            self._bytes.clear()
+            self._errors.clear()
+            self._cache_hits.clear()
+            self._cache_misses.clear()
+
+
+@lru_cache
+def get_echo_metrics() -> EchoMetrics:
+    """
+    Returns:
+        EchoMetrics: Cached object recording the operations performed on Echo.
+    """
+    return EchoMetrics()
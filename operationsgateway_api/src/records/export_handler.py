@@ -5,6 +5,7 @@ from typing import Any, List, Tuple, Union
 import zipfile
 
 from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
 from operationsgateway_api.src.exceptions import ExportError
 from operationsgateway_api.src.functions.type_transformer import TypeTransformer
 from operationsgateway_api.src.models import (
@@ -18,6 +19,7 @@ from operationsgateway_api.src.models import (
 )
 from operationsgateway_api.src.records.float_image import FloatImage
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.record import Record
 from operationsgateway_api.src.records.record_retriever import RecordRetriever
 from operationsgateway_api.src.records.vector import Vector
 from operationsgateway_api.src.records.waveform import Waveform
@@ -78,6 +80,7 @@ class ExportHandler:
 
         self.functions = functions
         self.function_types = {}
+        self.channel_metadata = None
 
     @staticmethod
     def _ensure_waveform_metadata(channel: PartialWaveformChannelModel) -> None:
@@ -113,6 +116,11 @@ class ExportHandler:
         """
         if self.functions:
             await self._init_function_types()
+            # Resolve any channel metadata not included by the projection in one query,
+            # rather than per channel when each record's functions are evaluated
+            self.channel_metadata = await Record.get_channel_metadata(
+                self.records_data,
+            )
 
         self._create_main_csv_headers()
         tasks = []
@@ -214,6 +222,7 @@ class ExportHandler:
                 limit_bit_depth=self.limit_bit_depth,
                 colourmap_name=self.colourmap_name,
                 return_thumbnails=False,
+                channel_metadata=self.channel_metadata,
             )
             await record_retriever.process_functions()
             raw_data = record_retriever.raw_data
@@ -336,7 +345,8 @@ class ExportHandler:
                 if self.original_image:
                     image_bytes = raw_data[channel_name]
                 else:
-                    image_bytes = Image.apply_false_colour(
+                    image_bytes = await get_cpu_executor().run(
+                        Image.apply_false_colour,
                         image_bytes=raw_data[channel_name],
                         original_image=self.original_image,
                         lower_level=self.lower_level,
@@ -414,7 +424,11 @@ class ExportHandler:
             elif channel_name in raw_data:
                 waveform_model = raw_data[channel_name]
             else:
-                waveform_model = await Waveform.get_waveform(record_id, channel_name)
+                waveform_model = await Waveform.get_waveform(
+                    record_id,
+                    channel_name,
+                    stored_path=getattr(channel, "waveform_path", None),
+                )
         except Exception:
             self.errors_file_in_memory.write(
                 f"Could not find waveform for {record_id} {channel_name}\n",
@@ -439,7 +453,8 @@ class ExportHandler:
         if self.export_waveform_images:
             # if rendered trace images have been requested then add those
             waveform = Waveform(waveform_model)
-            png_bytes = waveform.get_fullsize_png(
+            png_bytes = await get_cpu_executor().run(
+                waveform.get_fullsize_png,
                 x_label=channel.metadata.x_units,
                 y_label=channel.metadata.y_units,
             )
@@ -470,7 +485,11 @@ class ExportHandler:
             channel_name,
         )
         try:
-            vector_model = await Vector.get_vector(record_id, channel_name)
+            vector_model = await Vector.get_vector(
+                record_id,
+                channel_name,
+                stored_path=getattr(channel, "vector_path", None),
+            )
         except Exception:
             self.errors_file_in_memory.write(
                 f"Could not find vector for {record_id} {channel_name}\n",
@@ -493,7 +512,10 @@ class ExportHandler:
 
         if self.export_vector_images:
             vector = Vector(vector_model)
-            vector_image = vector.get_fullsize_png(labels)
+            vector_image = await get_cpu_executor().run(
+                vector.get_fullsize_png,
+                labels,
+            )
             await self._write_to_zip(f"{record_id}_{channel_name}.png", vector_image)
             self._check_zip_file_size()
 
@@ -1,8 +1,11 @@
 import base64
+from functools import lru_cache
 from io import BytesIO
 import logging
 
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
 import numpy as np
 from PIL import Image as PILImage
 
@@ -119,12 +122,10 @@ class FalseColourHandler:
         image_array = np.array(img_src)
         values = image_array[:, :, 0]
         alpha = image_array[:, :, 1]
-        colourmap = plt.cm.get_cmap(colourmap_name)
+        colourmap = matplotlib.colormaps.get_cmap(colourmap_name)
         mapped_array = colourmap(values, alpha=alpha, bytes=True)
-        converted_image_bytes = BytesIO()
-        plt.imsave(converted_image_bytes, mapped_array)
 
-        return converted_image_bytes
+        return FalseColourHandler.encode_png(mapped_array)
 
     @staticmethod
     def apply_false_colour(
@@ -155,15 +156,13 @@ class FalseColourHandler:
                 f"{colourmap_name} is not a valid colour map name",
             )
 
-        converted_image_bytes = BytesIO()
-        plt.imsave(
-            converted_image_bytes,
+        mapped_array = FalseColourHandler.map_colours(
             image_array,
-            vmin=vmin,
-            vmax=vmax,
-            cmap=colourmap_name,
+            vmin,
+            vmax,
+            colourmap_name,
         )
-        return converted_image_bytes
+        return FalseColourHandler.encode_png(mapped_array)
 
     @staticmethod
     def apply_false_colour_float(
@@ -186,16 +185,115 @@ class FalseColourHandler:
             msg = f"{colourmap_name} is not a valid colour map name"
             raise QueryParameterError(msg)
 
-        converted_image_bytes = BytesIO()
-        plt.imsave(
-            converted_image_bytes,
+        mapped_array = FalseColourHandler.map_colours(
             image_array,
-            vmin=-absolute_max,
-            vmax=absolute_max,
-            cmap=colourmap_name,
+            -absolute_max,
+            absolute_max,
+            colourmap_name,
+        )
+        return FalseColourHandler.encode_png(mapped_array)
+
+    @staticmethod
+    def map_colours(
+        image_array: np.ndarray,
+        vmin: float,
+        vmax: float,
+        colourmap_name: str,
+    ) -> np.ndarray:
+        """
+        Map each pixel of a greyscale image to an 8 bit RGBA colour, giving the same
+        result as `plt.imsave`. Integer images are mapped using a lookup table which
+        has an entry for every possible pixel value, so colouring the image is a single
+        indexing operation. Other images are normalised and mapped pixel by pixel
+        """
+        image_array = np.asarray(image_array)
+        lookup_table_size = FalseColourHandler._get_lookup_table_size(image_array)
+        if lookup_table_size is None:
+            scalar_mappable = ScalarMappable(Normalize(vmin, vmax), colourmap_name)
+            return scalar_mappable.to_rgba(image_array, bytes=True)
+
+        lookup_table = FalseColourHandler._get_lookup_table(
+            colourmap_name,
+            vmin,
+            vmax,
+            image_array.dtype.str,
+            lookup_table_size,
+        )
+        # Each RGBA colour is packed into a single uint32 so each pixel is one lookup
+        mapped_array = lookup_table.take(image_array).view(np.uint8)
+        return mapped_array.reshape(image_array.shape + (4,))
+
+    @staticmethod
+    def encode_png(mapped_array: np.ndarray) -> BytesIO:
+        """
+        Encode an RGBA array as a PNG in the same way as `plt.imsave`, without going
+        through any of matplotlib's machinery
+        """
+        mapped_array = np.require(mapped_array, requirements="C")
+        image = PILImage.frombuffer(
+            "RGBA",
+            (mapped_array.shape[1], mapped_array.shape[0]),
+            mapped_array,
+            "raw",
+            "RGBA",
+            0,
+            1,
         )
+        converted_image_bytes = BytesIO()
+        image.save(converted_image_bytes, format="png", dpi=(100, 100))
         return converted_image_bytes
 
+    @staticmethod
+    def _get_lookup_table_size(image_array: np.ndarray) -> "int | None":
+        """
+        Return the number of entries needed in a lookup table to cover every pixel
+        value in `image_array`, or `None` if a lookup table can't be used (for float
+        images, or integer images with values outside of the 16 bit range)
+        """
+        if image_array.dtype == np.uint8:
+            return 2**8
+        elif image_array.dtype == np.uint16:
+            return 2**16
+        elif image_array.dtype.kind in "iu" and image_array.size > 0:
+            minimum = image_array.min()
+            maximum = image_array.max()
+            if minimum >= 0 and maximum < 2**8:
+                return 2**8
+            elif minimum >= 0 and maximum < 2**16:
+                return 2**16
+
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=Config.config.images.lookup_table_cache_maxsize)
+    def _get_lookup_table(
+        colourmap_name: str,
+        vmin: float,
+        vmax: float,
+        dtype: str,
+        size: int,
+    ) -> np.ndarray:
+        """
+        Create an array of RGBA colours, one for each pixel value from 0 to `size - 1`,
+        with each colour packed into a uint32. The pixel values are mapped using the
+        same dtype as the image, so the normalisation has exactly the same rounding as
+        mapping the image directly
+        """
+        log.debug(
+            "Creating %d entry lookup table for %s (%s, %s)",
+            size,
+            colourmap_name,
+            vmin,
+            vmax,
+        )
+        pixel_values = np.arange(size, dtype=np.dtype(dtype))
+        scalar_mappable = ScalarMappable(Normalize(vmin, vmax), colourmap_name)
+        lookup_table = scalar_mappable.to_rgba(pixel_values, bytes=True)
+        lookup_table = np.ascontiguousarray(lookup_table).view(np.uint32).reshape(size)
+        # The same table is shared between requests so must not be modified
+        lookup_table.flags.writeable = False
+        return lookup_table
+
     @staticmethod
     def pixel_limits(
         storage_bit_depth: int,
@@ -8,12 +8,14 @@ from PIL import Image
 
 from operationsgateway_api.src.auth.jwt_handler import JwtHandler
 from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
 from operationsgateway_api.src.exceptions import EchoS3Error
 from operationsgateway_api.src.models import FloatImageModel
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
 from operationsgateway_api.src.records.false_colour_handler import FalseColourHandler
 from operationsgateway_api.src.records.image_abc import ImageABC
 from operationsgateway_api.src.records.thumbnail_handler import ThumbnailHandler
+from operationsgateway_api.src.single_flight import get_single_flight
 
 log = logging.getLogger()
 
@@ -36,12 +38,12 @@ class FloatImage(ImageABC):
         else:
             return np.nanmax(np.absolute(array))
 
-    def create_thumbnail(self) -> None:
+    def create_thumbnail(self) -> bytes:
         """
-        Using the object's image data, create a thumbnail of the image and store it as
-        an attribute of this object as base64. The thumbnail uses the LA mode, with the
-        L channel representing normalised values from the original array and the alpha
-        being 0 for nans and 255 for all other values.
+        Using the object's image data, create a thumbnail of the image, store it as an
+        attribute of this object as base64 and return it. The thumbnail uses the LA
+        mode, with the L channel representing normalised values from the original array
+        and the alpha being 0 for nans and 255 for all other values.
         """
         log.info("Creating image thumbnail for %s", self.image.path)
         absolute_max = FloatImage.get_absolute_max(self.image.data)
@@ -52,6 +54,7 @@ class FloatImage(ImageABC):
         la_image.thumbnail(Config.config.float_images.thumbnail_size)
         self.thumbnail = ThumbnailHandler.convert_to_base64(la_image)
         la_image.close()
+        return self.thumbnail
 
     @staticmethod
     async def upload_image(input_image: FloatImage) -> str | None:
@@ -60,8 +63,10 @@ class FloatImage(ImageABC):
         """
 
         log.info("Storing float image in a Bytes object: %s", input_image.image.path)
-        image_bytes = BytesIO()
-        np.savez_compressed(image_bytes, input_image.image.data)
+        image_bytes = await get_cpu_executor().run(
+            FloatImage.encode_npz,
+            input_image.image.data,
+        )
         storage_path = FloatImage.get_full_path(input_image.image.path)
         log.info("Storing float image on S3: %s", storage_path)
         echo_interface = get_echo_interface()
@@ -74,6 +79,15 @@ class FloatImage(ImageABC):
             log.error("Failed to upload float image for channel: %s", channel_name)
             return channel_name
 
+    @staticmethod
+    def encode_npz(data: np.ndarray) -> BytesIO:
+        """
+        Encode image data as a compressed numpy array (.npz)
+        """
+        image_bytes = BytesIO()
+        np.savez_compressed(image_bytes, data)
+        return image_bytes
+
     @staticmethod
     async def get_image(
         record_id: str,
@@ -85,10 +99,48 @@ class FloatImage(ImageABC):
         The returned BytesIO encode the image as a png. For use when displaying data.
         """
         log.info("Retrieving float image and returning BytesIO object")
+        array = await FloatImage.get_array(record_id, channel_name)
+        return await get_cpu_executor().run(
+            FloatImage.apply_false_colour,
+            array,
+            colourmap_name,
+        )
+
+    @staticmethod
+    async def get_array(record_id: str, channel_name: str) -> np.ndarray:
+        """
+        Retrieve a float image from Echo S3 and decode it, returning a read-only array.
+        Concurrent requests for the same image share a single download and decode
+        """
+        return await get_single_flight("float_image_decode").run(
+            (record_id, channel_name),
+            FloatImage._get_array,
+            record_id,
+            channel_name,
+        )
+
+    @staticmethod
+    async def _get_array(record_id: str, channel_name: str) -> np.ndarray:
         array_bytes = await FloatImage.get_bytes(record_id, channel_name)
+        return await get_cpu_executor().run(FloatImage.decode_npz, array_bytes)
+
+    @staticmethod
+    def decode_npz(array_bytes: bytes) -> np.ndarray:
+        """
+        Load the numpy array from `array_bytes`, which is read-only as it may be shared
+        between requests
+        """
         npz_file = np.load(BytesIO(array_bytes))
         array = npz_file["arr_0"]
         npz_file.close()
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def apply_false_colour(array: np.ndarray, colourmap_name: str) -> BytesIO:
+        """
+        Apply the specified colourmap to the values of `array`, returning a png
+        """
         absolute_max = FloatImage.get_absolute_max(array)
         return FalseColourHandler.apply_false_colour_float(
             array,
@@ -10,6 +10,7 @@ from pydantic import Json
 
 from operationsgateway_api.src.auth.jwt_handler import JwtHandler
 from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
 from operationsgateway_api.src.exceptions import (
     EchoS3Error,
     ImageError,
@@ -22,7 +23,12 @@ from operationsgateway_api.src.models import ImageModel
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
 from operationsgateway_api.src.records.false_colour_handler import FalseColourHandler
 from operationsgateway_api.src.records.image_abc import ImageABC
+from operationsgateway_api.src.records.image_array_cache import (
+    get_image_array_cache,
+    ImageArrayCache,
+)
 from operationsgateway_api.src.records.thumbnail_handler import ThumbnailHandler
+from operationsgateway_api.src.single_flight import get_single_flight
 
 log = logging.getLogger()
 
@@ -31,6 +37,9 @@ class Image(ImageABC):
     lookup_table_16_to_8_bit = [i / 256 for i in range(65536)]
     echo_prefix = "images"
     echo_extension = "png"
+    png_signature = b"\x89PNG\r\n\x1a\n"
+    # Signature, followed by the IHDR chunk's length, type, width and height
+    png_header_size = 24
 
     def __init__(self, image: ImageModel) -> None:
         super().__init__(image)
@@ -69,10 +78,10 @@ class Image(ImageABC):
         # Negative shifts may result in a float output, so cast the type again
         self.image.data = shifted_data.astype(target_dtype)
 
-    def create_thumbnail(self) -> None:
+    def create_thumbnail(self) -> bytes:
         """
-        Using the object's image data, create a thumbnail of the image and store it as
-        an attribute of this object
+        Using the object's image data, create a thumbnail of the image, store it as an
+        attribute of this object and return it
         """
 
         log.info("Creating image thumbnail for %s", self.image.path)
@@ -98,6 +107,7 @@ class Image(ImageABC):
         self.thumbnail = ThumbnailHandler.convert_to_base64(img)
 
         img.close()
+        return self.thumbnail
 
     @staticmethod
     async def upload_image(input_image: Image) -> Optional[str]:
@@ -106,10 +116,209 @@ class Image(ImageABC):
         """
 
         log.info("Storing image in a Bytes object: %s", input_image.image.path)
+        image_bytes = await get_cpu_executor().run(
+            Image.encode_png,
+            input_image.image.data,
+            input_image.image.bit_depth,
+        )
+
+        echo_interface = get_echo_interface()
+        storage_path = Image.get_full_path(input_image.image.path)
+        log.info("Storing image on S3: %s", storage_path)
+
+        try:
+            await echo_interface.upload_file_object(image_bytes, storage_path)
+        except EchoS3Error:
+            # Extract the channel name and propagate it
+            channel_name = input_image.get_channel_name_from_path()
+            log.error("Failed to upload image for channel: %s", channel_name)
+            return channel_name
+
+        await Image.upload_pyramid(input_image)
+        return None  # No failure
+
+    @staticmethod
+    async def upload_pyramid(input_image: Image) -> None:
+        """
+        Store a downsampled copy of the image for each of the configured
+        `pyramid_factors` alongside the original on Echo. These are only used to reduce
+        the size of the image returned for a `max_size`, so if one can't be uploaded the
+        original will be returned instead and this isn't treated as a failure
+        """
+        pyramid_factors = Config.config.images.pyramid_factors
+        if not pyramid_factors:
+            return
+
+        log.info(
+            "Storing image pyramid of %s: %s",
+            input_image.image.path,
+            pyramid_factors,
+        )
+        pyramid_bytes = await get_cpu_executor().run(
+            Image.encode_pyramid,
+            input_image.image.data,
+            input_image.image.bit_depth,
+            pyramid_factors,
+        )
+
+        echo_interface = get_echo_interface()
+        for factor, level_bytes in pyramid_bytes.items():
+            relative_path = Image.get_pyramid_path(input_image.image.path, factor)
+            try:
+                await echo_interface.upload_file_object(
+                    level_bytes,
+                    Image.get_full_path(relative_path),
+                )
+            except EchoS3Error:
+                log.warning("Failed to upload image pyramid level: %s", relative_path)
+
+    @staticmethod
+    def encode_pyramid(
+        data: np.ndarray,
+        bit_depth: int | None,
+        pyramid_factors: list[int],
+    ) -> dict[int, BytesIO]:
+        """
+        Downsample the image data by each of `pyramid_factors`, returning each level
+        encoded as a PNG
+        """
+        return {
+            factor: Image.encode_png(Image.downsample(data, factor), bit_depth)
+            for factor in pyramid_factors
+        }
+
+    @staticmethod
+    def downsample(data: np.ndarray, factor: int) -> np.ndarray:
+        """
+        Reduce the size of the image by `factor` in both dimensions, taking the mean of
+        each block of `factor` by `factor` pixels. If the dimensions aren't a multiple
+        of `factor`, the edges are repeated to fill the last blocks
+        """
+        height, width = data.shape[:2]
+        level_height = -(-height // factor)
+        level_width = -(-width // factor)
+        pad_width = [
+            (0, level_height * factor - height),
+            (0, level_width * factor - width),
+        ]
+        pad_width += [(0, 0)] * (data.ndim - 2)
+        padded_data = np.pad(data, pad_width, mode="edge")
+        blocks = padded_data.reshape(
+            level_height,
+            factor,
+            level_width,
+            factor,
+            *data.shape[2:],
+        )
+        block_sums = blocks.sum(axis=(1, 3), dtype=np.uint64)
+        # Add half a block before dividing so the mean is rounded to the nearest integer
+        block_count = factor * factor
+        block_means = (block_sums + block_count // 2) // block_count
+        return block_means.astype(data.dtype)
+
+    @staticmethod
+    def get_pyramid_extension(factor: int) -> str:
+        """
+        Returns the extension used for the level of the image pyramid downsampled by
+        `factor`, so it's stored next to the original image
+        """
+        return f"{factor}x.{Image.echo_extension}"
+
+    @staticmethod
+    def get_pyramid_path(relative_path: str, factor: int) -> str:
+        """
+        Converts the relative path of an image to that of its level of the image pyramid
+        downsampled by `factor`
+        """
+        path_without_extension = relative_path.rsplit(".", 1)[0]
+        return f"{path_without_extension}.{Image.get_pyramid_extension(factor)}"
+
+    @staticmethod
+    def get_pyramid_factor(
+        width: int,
+        height: int,
+        max_size: int,
+        pyramid_factors: list[int],
+    ) -> int | None:
+        """
+        Returns the largest of `pyramid_factors` for which the downsampled image is
+        still at least `max_size` pixels along its longest side, or `None` if the
+        original image should be used
+        """
+        longest_side = max(width, height)
+        for factor in sorted(pyramid_factors, reverse=True):
+            if -(-longest_side // factor) >= max_size:
+                return factor
+
+        return None
+
+    @staticmethod
+    def get_png_size(png_bytes: bytes) -> tuple[int, int]:
+        """
+        Read the width and height of a PNG from the IHDR chunk at the start of its bytes
+        """
+        if png_bytes[:8] != Image.png_signature or png_bytes[12:16] != b"IHDR":
+            raise ImageError("Image stored on Echo is not a valid PNG")
+
+        width = int.from_bytes(png_bytes[16:20], byteorder="big")
+        height = int.from_bytes(png_bytes[20:24], byteorder="big")
+        return width, height
+
+    @staticmethod
+    async def get_pyramid_bytes(
+        record_id: str,
+        channel_name: str,
+        max_size: int,
+    ) -> bytes | None:
+        """
+        Get the bytes of the smallest level of the image pyramid which is at least
+        `max_size` pixels along its longest side. Only the levels recorded on the
+        channel when the image was ingested are used, and only the header of the
+        original image is downloaded to get its size. Returns `None` if no level is
+        small enough, or if no levels were stored
+        """
+        pyramid_factors = await Image.get_channel_field(
+            record_id,
+            channel_name,
+            "pyramid_factors",
+        )
+        if not pyramid_factors:
+            return None
+
+        header_bytes = await Image.get_bytes(
+            record_id=record_id,
+            channel_name=channel_name,
+            byte_range=(0, Image.png_header_size - 1),
+        )
+        width, height = Image.get_png_size(header_bytes)
+        factor = Image.get_pyramid_factor(width, height, max_size, pyramid_factors)
+        if factor is None:
+            return None
+
+        try:
+            return await Image.get_bytes(
+                record_id=record_id,
+                channel_name=channel_name,
+                echo_extension=Image.get_pyramid_extension(factor),
+                handle_missing=False,
+            )
+        except EchoS3Error:
+            log.warning(
+                "Image pyramid level %sx not found for %s %s, using original image",
+                factor,
+                record_id,
+                channel_name,
+            )
+            return None
+
+    @staticmethod
+    def encode_png(data: np.ndarray, bit_depth: int | None) -> BytesIO:
+        """
+        Encode image data as a PNG, recording the bit depth (if known) in the sBIT chunk
+        """
         image_bytes = BytesIO()
         try:
-            image = PILImage.fromarray(input_image.image.data)
-            bit_depth = input_image.image.bit_depth
+            image = PILImage.fromarray(data)
             if bit_depth is not None and 0 < bit_depth <= 16:
                 info = PngImagePlugin.PngInfo()
                 sbit = bit_depth.to_bytes(1, byteorder="big")
@@ -121,18 +330,7 @@ class Image(ImageABC):
             log.exception(msg=exc)
             raise ImageError("Image data is not in correct format to be read") from exc
 
-        echo_interface = get_echo_interface()
-        storage_path = Image.get_full_path(input_image.image.path)
-        log.info("Storing image on S3: %s", storage_path)
-
-        try:
-            await echo_interface.upload_file_object(image_bytes, storage_path)
-            return None  # No failure
-        except EchoS3Error:
-            # Extract the channel name and propagate it
-            channel_name = input_image.get_channel_name_from_path()
-            log.error("Failed to upload image for channel: %s", channel_name)
-            return channel_name
+        return image_bytes
 
     @staticmethod
     async def get_image(
@@ -143,6 +341,7 @@ class Image(ImageABC):
         upper_level: int,
         limit_bit_depth: int,
         colourmap_name: str,
+        max_size: int | None = None,
     ) -> bytes:
         """
         Retrieve an image from Echo S3 and return the bytes of the image depending on
@@ -152,6 +351,11 @@ class Image(ImageABC):
         image read from Echo S3, otherwise apply false colour to the image either using
         the parameters provided or using defaults where they are not provided.
 
+        If `max_size` is given, the smallest level of the image pyramid which is at
+        least this many pixels along its longest side is used instead of the full size
+        image, if one is stored. This isn't done for the `original_image`, which is
+        always returned at full size.
+
         If an image cannot be found, some error checking is done by looking to see if
         the record ID exists in the first place. Depending on what is found in the
         database, an appropriate exception (and error message) is raised
@@ -159,18 +363,89 @@ class Image(ImageABC):
 
         msg = "Retrieving image and returning BytesIO object: %s %s"
         log.info(msg, record_id, channel_name)
-        image_bytes = await Image.get_bytes(
-            record_id=record_id,
-            channel_name=channel_name,
-        )
-        return Image.apply_false_colour(
-            image_bytes=image_bytes,
-            original_image=original_image,
+        if max_size is not None and not original_image:
+            pyramid_bytes = await Image.get_pyramid_bytes(
+                record_id,
+                channel_name,
+                max_size,
+            )
+            if pyramid_bytes is not None:
+                return await get_cpu_executor().run(
+                    Image.apply_false_colour,
+                    image_bytes=pyramid_bytes,
+                    original_image=False,
+                    lower_level=lower_level,
+                    upper_level=upper_level,
+                    limit_bit_depth=limit_bit_depth,
+                    colourmap_name=colourmap_name,
+                )
+
+        if original_image:
+            log.debug("Original image requested, return unmodified image bytes")
+            return await Image.get_bytes(record_id=record_id, channel_name=channel_name)
+
+        image_array, storage_bit_depth = await Image.get_array(record_id, channel_name)
+        log.debug("False colour requested, applying false colour to image")
+        false_colour_image = await get_cpu_executor().run(
+            FalseColourHandler.apply_false_colour,
+            image_array=image_array,
+            storage_bit_depth=storage_bit_depth,
             lower_level=lower_level,
             upper_level=upper_level,
             limit_bit_depth=limit_bit_depth,
             colourmap_name=colourmap_name,
         )
+        return false_colour_image.getvalue()
+
+    @staticmethod
+    async def get_array(record_id: str, channel_name: str) -> tuple[np.ndarray, int]:
+        """
+        Retrieve an image from Echo S3 and decode it, returning a read-only array of its
+        pixels and the bit depth it was stored with. Decoded images are cached, and
+        concurrent requests for the same image share a single download and decode
+        """
+        cache_key = ImageArrayCache.create_key(record_id, channel_name)
+        cached_array = get_image_array_cache().get(cache_key)
+        if cached_array is not None:
+            return cached_array
+
+        return await get_single_flight("image_decode").run(
+            (record_id, channel_name),
+            Image._get_array,
+            record_id,
+            channel_name,
+        )
+
+    @staticmethod
+    async def _get_array(record_id: str, channel_name: str) -> tuple[np.ndarray, int]:
+        image_bytes = await Image.get_bytes(
+            record_id=record_id,
+            channel_name=channel_name,
+        )
+        image_array, storage_bit_depth = await get_cpu_executor().run(
+            Image.decode_png,
+            image_bytes,
+        )
+        get_image_array_cache().put(
+            ImageArrayCache.create_key(record_id, channel_name),
+            image_array,
+            storage_bit_depth,
+        )
+        return image_array, storage_bit_depth
+
+    @staticmethod
+    def decode_png(image_bytes: bytes) -> tuple[np.ndarray, int]:
+        """
+        Decode a PNG into a read-only array of its pixels, returned along with the bit
+        depth it was stored with
+        """
+        img_src = PILImage.open(BytesIO(image_bytes))
+        image_array = np.array(img_src)
+        storage_bit_depth = FalseColourHandler.get_pixel_depth(img_src)
+        img_src.close()
+        # The array may be shared between requests so must not be modified
+        image_array.flags.writeable = False
+        return image_array, storage_bit_depth
 
     @staticmethod
     def apply_false_colour(
@@ -190,9 +465,7 @@ class Image(ImageABC):
             return image_bytes
         else:
             log.debug("False colour requested, applying false colour to image")
-            img_src = PILImage.open(BytesIO(image_bytes))
-            orig_img_array = np.array(img_src)
-            storage_bit_depth = FalseColourHandler.get_pixel_depth(img_src)
+            orig_img_array, storage_bit_depth = Image.decode_png(image_bytes)
             false_colour_image = FalseColourHandler.apply_false_colour(
                 image_array=orig_img_array,
                 storage_bit_depth=storage_bit_depth,
@@ -201,7 +474,6 @@ class Image(ImageABC):
                 limit_bit_depth=limit_bit_depth,
                 colourmap_name=colourmap_name,
             )
-            img_src.close()
             return false_colour_image.getvalue()
 
     @staticmethod
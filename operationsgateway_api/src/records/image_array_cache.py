@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from functools import lru_cache
+import logging
+import threading
+
+import numpy as np
+
+from operationsgateway_api.src.config import Config
+
+log = logging.getLogger()
+
+ImageArrayCacheKey = tuple[str, str, int | None]
+
+
+class ImageArrayCache:
+    """
+    A least recently used cache of decoded images, so repeated requests for the same
+    image (for example, moving the crosshair around an image, or evaluating several
+    functions which use it) don't need to decode the PNG or shift its bits each time.
+
+    Each entry is an array along with the bit depth the image was stored with. Arrays
+    are made read-only before being cached, so they can be shared between requests
+    without copying. The cache is capped by the total size of the arrays stored in it,
+    and entries for a record should be invalidated when it is updated or deleted.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._arrays: OrderedDict[ImageArrayCacheKey, tuple[np.ndarray, int]] = (
+            OrderedDict()
+        )
+        self._record_keys: dict[str, set[ImageArrayCacheKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_key(
+        record_id: str,
+        channel_name: str,
+        raw_bit_depth: int | None = None,
+    ) -> ImageArrayCacheKey:
+        """
+        Create a key for the image of a channel. If `raw_bit_depth` is given, the key
+        is for the array with its bits shifted back to this depth, otherwise it is for
+        the array as it was stored
+        """
+        return (record_id, channel_name, raw_bit_depth)
+
+    def get(self, key: ImageArrayCacheKey) -> tuple[np.ndarray, int] | None:
+        """
+        Return the cached array and storage bit depth for `key`, or `None` if it isn't
+        cached
+        """
+        with self._lock:
+            entry = self._arrays.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._arrays.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: ImageArrayCacheKey,
+        array: np.ndarray,
+        storage_bit_depth: int,
+    ) -> None:
+        """
+        Make `array` read-only and add it to the cache, evicting the least recently
+        used arrays if the cache would go over `max_bytes`
+        """
+        array.flags.writeable = False
+        array_bytes = array.nbytes
+        if array_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._arrays:
+                self._remove(key)
+
+            while self.current_bytes + array_bytes > self.max_bytes:
+                least_recent_key = next(iter(self._arrays))
+                self._remove(least_recent_key)
+                self.evictions += 1
+
+            self._arrays[key] = (array, storage_bit_depth)
+            self._record_keys.setdefault(key[0], set()).add(key)
+            self.current_bytes += array_bytes
+
+    def invalidate_record(self, record_id: str) -> None:
+        """
+        Remove all cached arrays for a record
+        """
+        with self._lock:
+            keys = list(self._record_keys.get(record_id, ()))
+            for key in keys:
+                self._remove(key)
+
+        if keys:
+            log.debug("Invalidated %d cached image arrays for %s", len(keys), record_id)
+
+    def clear(self) -> None:
+        """
+        Remove all arrays from the cache
+        """
+        with self._lock:
+            self._arrays.clear()
+            self._record_keys.clear()
+            self.current_bytes = 0
+
+    def get_cache_info(self) -> dict[str, int]:
+        """
+        Return the hit, miss and eviction counts, and the current size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._arrays),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: ImageArrayCacheKey) -> None:
+        """
+        Remove a single array. The lock must be held by the caller
+        """
+        array, _ = self._arrays.pop(key)
+        self.current_bytes -= array.nbytes
+        record_keys = self._record_keys[key[0]]
+        record_keys.discard(key)
+        if not record_keys:
+            del self._record_keys[key[0]]
+
+
+@lru_cache
+def get_image_array_cache() -> ImageArrayCache:
+    """
+    Returns:
+        ImageArrayCache: Cache of decoded images, shared between requests.
+    """
+    return ImageArrayCache(Config.config.images.array_cache_max_bytes)
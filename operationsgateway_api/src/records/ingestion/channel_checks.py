@@ -152,6 +152,36 @@ class ChannelChecks:
             if ingested_model.path == path:
                 return ingested_model
 
+    @staticmethod
+    def _is_float_list(values: Any) -> bool:
+        """
+        Returns whether `values` is a list (or one dimensional array) of floats. Arrays,
+        which waveforms and vectors are extracted from HDF files as, are checked using
+        their dtype. Rather than checking the type of each element of a list in a
+        Python loop, the distinct types of the elements are found using `map` and
+        `set` (which iterate in C), and only those are checked
+        """
+        if isinstance(values, np.ndarray):
+            return values.ndim == 1 and values.dtype.kind == "f"
+
+        if not isinstance(values, list):
+            return False
+
+        element_types = set(map(type, values))
+        return all(issubclass(element_type, float) for element_type in element_types)
+
+    @staticmethod
+    def _has_rows(data: Any) -> bool:
+        """
+        Returns whether iterating over `data` only gives arrays, i.e. whether an array
+        has at least two dimensions (or is empty). This is checked using its shape
+        rather than iterating over it in Python
+        """
+        if isinstance(data, np.ndarray):
+            return data.ndim >= 2 or data.size == 0
+
+        return all(isinstance(element, np.ndarray) for element in data)
+
     def required_attribute_checks(self):
         """
         Checks if the required attributes of each channel exists and has the
@@ -191,18 +221,15 @@ class ChannelChecks:
                     self.ingested_waveforms,
                     value.waveform_path,
                 )
-                if (
-                    not isinstance(matching_waveform, WaveformModel)
-                    or not isinstance(matching_waveform.x, list)
-                    or not all(isinstance(e, float) for e in matching_waveform.x)
+                if not (
+                    isinstance(matching_waveform, WaveformModel)
+                    and ChannelChecks._is_float_list(matching_waveform.x)
                 ):
                     rejected_channels.append(
                         {key: "x attribute must be a list of floats"},
                     )
 
-                if not isinstance(matching_waveform.y, list) or not all(
-                    isinstance(element, float) for element in matching_waveform.y
-                ):
+                if not ChannelChecks._is_float_list(matching_waveform.y):
                     rejected_channels.append(
                         {key: "y attribute must be a list of floats"},
                     )
@@ -212,10 +239,7 @@ class ChannelChecks:
                     ingested_list=self.ingested_vectors,
                     path=value.vector_path,
                 )
-                if not (
-                    isinstance(vector.data, list)
-                    and all(isinstance(e, float) for e in vector.data)
-                ):
+                if not ChannelChecks._is_float_list(vector.data):
                     message = "data has wrong datatype, should be list[float]"
                     rejected_channels.append({key: message})
 
@@ -513,10 +537,10 @@ class ChannelChecks:
         this generates a rejected channel message depending on what was fed to this
         function (which dataset and why it failed)
         """
-        if not isinstance(value, list):
+        if not isinstance(value, (list, np.ndarray)):
             rejected_channels.append({key: letter + " attribute has wrong shape"})
         else:
-            if not all(isinstance(element, float) for element in value):
+            if not ChannelChecks._is_float_list(value):
                 rejected_channels.append(
                     {
                         key: letter + " attribute has wrong datatype, should "
@@ -541,7 +565,7 @@ class ChannelChecks:
                 if isinstance(data, np.ndarray) and (
                     data.dtype == np.uint16 or data.dtype == np.uint8
                 ):
-                    if not all(isinstance(element, np.ndarray) for element in data):
+                    if not ChannelChecks._has_rows(data):
                         rejected_channels.append(
                             {key: "data has wrong shape"},
                         )
@@ -558,7 +582,7 @@ class ChannelChecks:
                     value.image_path,
                 )
                 data = image.data
-                if not all(isinstance(element, np.ndarray) for element in data):
+                if not ChannelChecks._has_rows(data):
                     rejected_channels.append(
                         {key: "data has wrong shape"},
                     )
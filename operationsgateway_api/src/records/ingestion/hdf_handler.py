@@ -1,12 +1,15 @@
 from datetime import datetime
 import logging
+from pathlib import Path
 from tempfile import SpooledTemporaryFile
 from typing import Any, Literal
 
 import h5py
+import numpy as np
 from pydantic import ValidationError
 
 from operationsgateway_api.src.channels.channel_manifest import ChannelManifest
+from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.constants import DATA_DATETIME_FORMAT, ID_DATETIME_FORMAT
 from operationsgateway_api.src.exceptions import HDFDataExtractionError, ModelError
 from operationsgateway_api.src.models import (
@@ -46,12 +49,28 @@ class HDFDataHandler:
         "vector": ["data"],
     }
 
-    def __init__(self, hdf_temp_file: SpooledTemporaryFile) -> None:
+    def __init__(
+        self,
+        hdf_temp_file: SpooledTemporaryFile | str | Path,
+        lazy: bool = False,
+    ) -> None:
         """
         Convert a HDF file that comes attached in a HTTP request (not in HDF format)
-        into a HDF file via h5py
+        into a HDF file via h5py. If the path of a file on disk is given instead,
+        datasets stored contiguously in it are memory mapped rather than read (see
+        `_read()`).
+
+        If `lazy` is set, the datasets of images, float images, waveforms and vectors
+        aren't read when the data is extracted, so the whole file is never held in
+        memory at once. Each of these models is extracted with a placeholder for its
+        data, which is read by `load_model()` when the channel is uploaded
         """
         self.hdf_file = h5py.File(hdf_temp_file, "r")
+        self.hdf_path = None
+        if isinstance(hdf_temp_file, (str, Path)):
+            self.hdf_path = hdf_temp_file
+        self.lazy = lazy
+        self.datasets: dict[str, dict[str, h5py.Dataset]] = {}
         self.channels = {}
         self.waveforms = []
         self.images = []
@@ -60,6 +79,7 @@ class HDFDataHandler:
 
     async def extract_data(
         self,
+        manifest: ChannelManifestModel | None = None,
     ) -> tuple[
         RecordModel,
         list[WaveformModel],
@@ -71,7 +91,7 @@ class HDFDataHandler:
         """
         Extract data from a HDF file that is formatted in the OperationsGateway data
         structure format. Metadata of the shot, channel data and its metadata is
-        extracted
+        extracted. If `manifest` isn't given, the most recent manifest is used
         """
         log.debug("Extracting data from HDF files")
 
@@ -88,7 +108,7 @@ class HDFDataHandler:
             ) from exc
 
         self.record_id = metadata_hdf["timestamp"].strftime(ID_DATETIME_FORMAT)
-        await self.extract_channels()
+        await self.extract_channels(manifest)
 
         try:
             record = RecordModel(
@@ -108,6 +128,78 @@ class HDFDataHandler:
             self.internal_failed_channel,
         )
 
+    def _read(self, dataset: h5py.Dataset) -> np.ndarray:
+        """
+        Read all of `dataset`. If the file was opened from a path and the dataset is
+        numeric and stored contiguously (not chunked or compressed), it's memory mapped
+        instead of being copied into memory, so its pages are only read from the file
+        as they're used and can be dropped by the OS rather than swapped out
+        """
+        if self.hdf_path is not None and dataset.dtype.kind in "biuf":
+            offset = dataset.id.get_offset()
+            if offset is not None:
+                return np.memmap(
+                    self.hdf_path,
+                    dtype=dataset.dtype,
+                    mode="r",
+                    offset=offset,
+                    shape=dataset.shape,
+                )
+
+        return dataset[()]
+
+    def _read_dataset(
+        self,
+        path: str,
+        name: str,
+        dataset: Any,
+        float_array: bool = False,
+    ) -> Any:
+        """
+        Read a dataset of a channel which is stored as an object in Echo. When
+        extracting lazily, the dataset is instead remembered (to be read by
+        `load_model()`) and a read-only array with the same shape and dtype is returned
+        in its place. This is broadcast from a single element, so takes no memory, but
+        can still be used by `ChannelChecks`, which only look at the shape and dtype.
+
+        `float_array` should be set for waveforms and vectors, whose models convert
+        real one dimensional arrays to float64 (so the placeholder is float64 too). Any
+        other array (including complex ones) is converted to a list by those models and
+        rejected by the checks, so it's read straight away as before
+        """
+        if not isinstance(dataset, h5py.Dataset):
+            return dataset[()]
+
+        if not self.lazy:
+            return self._read(dataset)
+
+        dtype = dataset.dtype
+        if float_array:
+            if dataset.ndim != 1 or dtype.kind not in "biuf":
+                return self._read(dataset)
+            dtype = np.dtype(np.float64)
+
+        self.datasets.setdefault(path, {})[name] = dataset
+        return np.broadcast_to(np.zeros((), dtype=dtype), dataset.shape)
+
+    def load_model(
+        self,
+        model: ImageModel | FloatImageModel | WaveformModel | VectorModel,
+    ) -> ImageModel | FloatImageModel | WaveformModel | VectorModel:
+        """
+        Return `model` with any datasets that weren't read when it was extracted read
+        from the file. This must be called before the model is used to create an
+        object to upload, as its placeholders don't contain the data
+        """
+        datasets = self.datasets.get(model.path)
+        if not datasets:
+            return model
+
+        fields = dict(model)
+        for name, dataset in datasets.items():
+            fields[name] = self._read(dataset)
+        return type(model)(**fields)
+
     def _unexpected_attribute(self, channel_type, value):
         """
         tells the location it is called whether to stop. Stops if the value for data
@@ -138,9 +230,13 @@ class HDFDataHandler:
         try:
             metadata = ImageChannelMetadataModel(**channel_metadata)
             channel = ImageChannelModel(metadata=metadata, image_path=image_path)
+            if Config.config.images.pyramid_factors:
+                # Record the levels stored with the image, so they're only looked for
+                # (and deleted) for images which have them
+                channel.pyramid_factors = list(Config.config.images.pyramid_factors)
             image_model = ImageModel(
                 path=image_path,
-                data=value["data"][()],
+                data=self._read_dataset(image_path, "data", value["data"]),
                 bit_depth=metadata.bit_depth,
             )
             self.images.append(image_model)
@@ -184,7 +280,7 @@ class HDFDataHandler:
             )
             image_model = FloatImageModel(
                 path=image_path,
-                data=value["data"][()],
+                data=self._read_dataset(image_path, "data", value["data"]),
             )
             self.float_images.append(image_model)
 
@@ -272,8 +368,8 @@ class HDFDataHandler:
             self.waveforms.append(
                 WaveformModel(
                     path=waveform_path,
-                    x=value["x"][()],
-                    y=value["y"][()],
+                    x=self._read_dataset(waveform_path, "x", value["x"], True),
+                    y=self._read_dataset(waveform_path, "y", value["y"], True),
                 ),
             )
 
@@ -317,7 +413,7 @@ class HDFDataHandler:
             )
             model = VectorModel(
                 path=relative_path,
-                data=value["data"][()],
+                data=self._read_dataset(relative_path, "data", value["data"], True),
             )
             self.vectors.append(model)
 
@@ -398,13 +494,17 @@ class HDFDataHandler:
 
         return internal_failed_channel
 
-    async def extract_channels(self) -> None:
+    async def extract_channels(
+        self,
+        manifest: ChannelManifestModel | None = None,
+    ) -> None:
         """
         Extract data from each data channel in the HDF file and place the data into
         relevant Pydantic models
         """
         internal_failed_channel = []
-        manifest = await ChannelManifest.get_most_recent_manifest()
+        if manifest is None:
+            manifest = await ChannelManifest.get_most_recent_manifest()
         for channel_name, value in self.hdf_file.items():
             internal_failed_channel = await self._extract_channel(
                 channel_name=channel_name,
@@ -0,0 +1,254 @@
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+from pathlib import Path
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.exceptions import (
+    IngestQueueFullError,
+    MissingDocumentError,
+)
+from operationsgateway_api.src.models import (
+    IngestJobModel,
+    IngestJobStatus,
+    SubmitHDFBatchResponse,
+)
+from operationsgateway_api.src.mongo.interface import MongoDBInterface
+
+log = logging.getLogger()
+
+IngestFunction = Callable[[str | None, Path], Awaitable[SubmitHDFBatchResponse]]
+
+
+class IngestQueue:
+    """
+    Queue of HDF files submitted to be ingested in the background, so the request which
+    submitted them can return as soon as each file has been written to local disk.
+
+    A fixed number of worker tasks take files from the queue and ingest them. The
+    status of each job (and the response once it has finished) is stored in MongoDB,
+    so it can be looked up by any worker process of the API, not just the one that is
+    ingesting the file. The queue itself is held in memory, so jobs which haven't
+    finished when the process shuts down are marked as finished with a 503 result.
+    """
+
+    collection_name = "ingest_jobs"
+
+    def __init__(self, workers: int, max_size: int) -> None:
+        self.workers = workers
+        self.max_size = max_size
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.busy_seconds = 0.0
+        self._queue = None
+        self._queue_loop = None
+        self._worker_tasks: list[asyncio.Task] = []
+        # Slots in the queue taken by jobs which are being stored, but haven't been put
+        # in the queue yet
+        self._reserved = 0
+        self._running_jobs: dict[str, IngestJobModel] = {}
+
+    async def submit(
+        self,
+        filename: str | None,
+        hdf_path: Path,
+        ingest_function: IngestFunction,
+    ) -> IngestJobModel:
+        """
+        Add a job to ingest the file at `hdf_path` by awaiting `ingest_function`,
+        returning the job as it was stored. The queue takes ownership of the file, and
+        deletes it once the job has finished
+        """
+        queue = self._get_queue()
+        if queue.qsize() + self._reserved >= self.max_size:
+            raise IngestQueueFullError(
+                f"{queue.qsize()} files are already waiting to be ingested, try again "
+                "later",
+            )
+
+        job = IngestJobModel(
+            _id=uuid4().hex,
+            filename=filename,
+            status=IngestJobStatus.QUEUED,
+            submitted=datetime.now(timezone.utc),
+        )
+        # Reserve a slot while the job is stored, so concurrent submissions can't fill
+        # the queue in the meantime
+        self._reserved += 1
+        try:
+            await MongoDBInterface.insert_one(
+                self.collection_name,
+                job.model_dump(by_alias=True, exclude_none=True),
+            )
+        finally:
+            self._reserved -= 1
+        queue.put_nowait((job, hdf_path, ingest_function))
+        self.submitted += 1
+        log.info("Queued %s for ingestion as job %s", filename, job.id_)
+        return job
+
+    @staticmethod
+    async def get_job(job_id: str) -> IngestJobModel:
+        """
+        Return the stored job with the ID `job_id`
+        """
+        job_data = await MongoDBInterface.find_one(
+            IngestQueue.collection_name,
+            filter_={"_id": job_id},
+        )
+        if job_data is None:
+            raise MissingDocumentError(f"Ingest job cannot be found: {job_id}")
+
+        return IngestJobModel(**job_data)
+
+    def get_stats(self) -> dict[str, int | float]:
+        """
+        Return the number of files waiting to be ingested or being ingested, counts of
+        the jobs which have finished and the total time spent ingesting files
+        """
+        return {
+            "workers": self.workers,
+            "max_size": self.max_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "busy_seconds": self.busy_seconds,
+        }
+
+    async def shutdown(self) -> None:
+        """
+        Cancel the worker tasks. Files still in the queue are deleted, and their jobs
+        (along with any which were running) are marked as finished with a 503 result,
+        so clients polling for them don't wait forever
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        unfinished_jobs = list(self._running_jobs.values())
+        self._running_jobs = {}
+        if self._queue is not None:
+            while not self._queue.empty():
+                job, hdf_path, _ = self._queue.get_nowait()
+                hdf_path.unlink(missing_ok=True)
+                unfinished_jobs.append(job)
+
+        if unfinished_jobs:
+            log.warning(
+                "%d ingest jobs were not finished before shutdown",
+                len(unfinished_jobs),
+            )
+            self.failed += len(unfinished_jobs)
+        for job in unfinished_jobs:
+            result = SubmitHDFBatchResponse(
+                filename=job.filename,
+                status_code=503,
+                message="The API shut down before the file was ingested, resubmit it",
+            )
+            try:
+                await self._finish_job(job.id_, result)
+            except Exception:
+                log.exception("Error marking ingest job %s as finished", job.id_)
+
+    def _get_queue(self) -> asyncio.Queue:
+        """
+        The queue and its workers can only be used in a single event loop, so create
+        new ones if the queue is being used from a different loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._queue_loop is not loop:
+            self._queue = asyncio.Queue(self.max_size)
+            self._queue_loop = loop
+            self._worker_tasks = [
+                loop.create_task(self._work()) for _ in range(self.workers)
+            ]
+        return self._queue
+
+    async def _work(self) -> None:
+        while True:
+            job, hdf_path, ingest_function = await self._queue.get()
+            try:
+                await self._run_job(job, hdf_path, ingest_function)
+            except Exception:
+                log.exception("Error running ingest job %s", job.id_)
+                self._running_jobs.pop(job.id_, None)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(
+        self,
+        job: IngestJobModel,
+        hdf_path: Path,
+        ingest_function: IngestFunction,
+    ) -> None:
+        self.running += 1
+        self._running_jobs[job.id_] = job
+        start_time = time.perf_counter()
+        try:
+            await self._update_job(
+                job.id_,
+                status=IngestJobStatus.RUNNING,
+                started=datetime.now(timezone.utc),
+            )
+            result = await ingest_function(job.filename, hdf_path)
+        except Exception:
+            log.exception("Error ingesting %s for job %s", job.filename, job.id_)
+            result = SubmitHDFBatchResponse(
+                filename=job.filename,
+                status_code=500,
+                message="Unknown error",
+            )
+        finally:
+            hdf_path.unlink(missing_ok=True)
+            self.running -= 1
+            self.busy_seconds += time.perf_counter() - start_time
+
+        if result.status_code >= 400:
+            self.failed += 1
+        else:
+            self.completed += 1
+        await self._finish_job(job.id_, result)
+        del self._running_jobs[job.id_]
+        log.info(
+            "Ingest job %s finished with status %d, took %.3fs",
+            job.id_,
+            result.status_code,
+            time.perf_counter() - start_time,
+        )
+
+    async def _finish_job(self, job_id: str, result: SubmitHDFBatchResponse) -> None:
+        await self._update_job(
+            job_id,
+            status=IngestJobStatus.FINISHED,
+            finished=datetime.now(timezone.utc),
+            result=result.model_dump(),
+        )
+
+    async def _update_job(self, job_id: str, **fields) -> None:
+        await MongoDBInterface.update_one(
+            self.collection_name,
+            filter_={"_id": job_id},
+            update={"$set": fields},
+        )
+
+
+@lru_cache
+def get_ingest_queue() -> IngestQueue:
+    """
+    Returns:
+        IngestQueue: Queue of files being ingested in the background, shared between
+        requests.
+    """
+    return IngestQueue(
+        Config.config.ingest.queue_workers,
+        Config.config.ingest.queue_max_size,
+    )
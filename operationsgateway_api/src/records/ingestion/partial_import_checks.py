@@ -1,5 +1,8 @@
+import asyncio
 import logging
+import time
 
+from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.exceptions import RejectRecordError
 from operationsgateway_api.src.models import (
     FloatImageChannelModel,
@@ -91,27 +94,30 @@ class PartialImportChecks:
         For image and waveform channels, a check is conducted to determine whether the
         associated image/waveform is stored in Echo; there could be a situation where
         there's an image channel in the record, but the image isn't stored in Echo
-        (perhaps due to a failure in ingestion or someone's manually deleted it)
+        (perhaps due to a failure in ingestion or someone's manually deleted it). The
+        path stored in the record is checked rather than the path of the ingested
+        channel, as the stored object may be in a different format (e.g. a waveform
+        stored as JSON before binary waveforms became the default)
         """
+        object_paths = {}
+        for channel_name in self.ingested_record.channels:
+            if channel_name in self.stored_record.channels:
+                object_path = PartialImportChecks._get_object_path(
+                    self.stored_record.channels[channel_name],
+                )
+                if object_path is not None:
+                    object_paths[channel_name] = object_path
+
+        objects_stored = await PartialImportChecks._check_objects_stored(
+            list(object_paths.values()),
+        )
+
         accepted_channels = []
         rejected_channels = {}
-        echo_interface = get_echo_interface()
-        for channel_name, channel_model in self.ingested_record.channels.items():
+        for channel_name in self.ingested_record.channels:
             if channel_name in self.stored_record.channels:
-                if isinstance(channel_model, ImageChannelModel):
-                    path = Image.get_full_path(channel_model.image_path)
-                    object_stored = await echo_interface.head_object(path)
-                elif isinstance(channel_model, FloatImageChannelModel):
-                    path = FloatImage.get_full_path(channel_model.image_path)
-                    object_stored = await echo_interface.head_object(path)
-                elif isinstance(channel_model, WaveformChannelModel):
-                    path = Waveform.get_full_path(channel_model.waveform_path)
-                    object_stored = await echo_interface.head_object(path)
-                elif isinstance(channel_model, VectorChannelModel):
-                    path = Vector.get_full_path(channel_model.vector_path)
-                    object_stored = await echo_interface.head_object(path)
-                else:
-                    object_stored = True
+                object_path = object_paths.get(channel_name)
+                object_stored = object_path is None or objects_stored[object_path]
                 if object_stored:
                     rejected_channels[channel_name] = (
                         "Channel is already present in existing record"
@@ -131,3 +137,67 @@ class PartialImportChecks:
             "accepted_channels": accepted_channels,
             "rejected_channels": rejected_channels,
         }
+
+    @staticmethod
+    def _get_object_path(channel_model) -> str | None:
+        """
+        Returns the full path in Echo of the object for a channel, or None if the
+        channel type doesn't store an object
+        """
+        if isinstance(channel_model, ImageChannelModel):
+            return Image.get_full_path(channel_model.image_path)
+        elif isinstance(channel_model, FloatImageChannelModel):
+            return FloatImage.get_full_path(channel_model.image_path)
+        elif isinstance(channel_model, WaveformChannelModel):
+            return Waveform.get_full_path(channel_model.waveform_path)
+        elif isinstance(channel_model, VectorChannelModel):
+            return Vector.get_full_path(channel_model.vector_path)
+        else:
+            return None
+
+    @staticmethod
+    async def _check_objects_stored(object_paths: list[str]) -> dict[str, bool]:
+        """
+        Check whether each of `object_paths` is stored in Echo, sending up to
+        `echo.existence_check_concurrency` requests at once. Depending on
+        `echo.existence_check_method`, either each object is checked with a HEAD request
+        or each directory containing the objects is listed
+        """
+        if not object_paths:
+            return {}
+
+        echo_config = Config.config.echo
+        echo_interface = get_echo_interface()
+        semaphore = asyncio.Semaphore(echo_config.existence_check_concurrency)
+        start_time = time.perf_counter()
+
+        async def bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        if echo_config.existence_check_method == "list":
+            directories = {path.rsplit("/", 1)[0] + "/" for path in object_paths}
+            listings = await asyncio.gather(
+                *[
+                    bounded(echo_interface.list_objects(directory))
+                    for directory in directories
+                ],
+            )
+            stored_paths = set().union(*listings)
+            objects_stored = {path: path in stored_paths for path in object_paths}
+            request_count = len(directories)
+        else:
+            results = await asyncio.gather(
+                *[bounded(echo_interface.head_object(path)) for path in object_paths],
+            )
+            objects_stored = dict(zip(object_paths, results))
+            request_count = len(object_paths)
+
+        log.info(
+            "Checked %d objects in Echo using %d %s request(s), took %.3fs",
+            len(object_paths),
+            request_count,
+            echo_config.existence_check_method,
+            time.perf_counter() - start_time,
+        )
+        return objects_stored
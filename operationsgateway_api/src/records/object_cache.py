@@ -0,0 +1,338 @@
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+
+from operationsgateway_api.src.config import Config
+
+log = logging.getLogger()
+
+
+class ObjectCache:
+    """
+    A least recently used cache of the bytes of objects downloaded from Echo, keyed by
+    their path in the bucket.
+
+    The cache is capped by the total size of the objects stored in it rather than the
+    number of entries, and entries expire after a time to live so changes made by other
+    instances of the API are eventually seen. Entries can be invalidated individually
+    or by prefix (e.g. all objects for a record).
+
+    Optionally, objects can also be written to a directory on local disk. This is
+    slower than memory but is shared between all the workers on the same machine, so an
+    object downloaded by one worker doesn't need to be downloaded again by the others.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float | None = None,
+        disk_directory: Path | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_directory = disk_directory
+        self.disk_max_bytes = disk_max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._objects: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes_since_prune = 0
+
+        if self.disk_directory is not None:
+            self.disk_directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Return the cached bytes for `key` from memory, or from disk if not in memory.
+        Returns `None` if the object isn't cached or has expired
+        """
+        value = self._get_memory(key)
+        if value is None:
+            value = self._get_disk(key)
+        return value
+
+    async def get_async(self, key: str) -> bytes | None:
+        """
+        As `get`, but if the object isn't in memory it's read from disk in a thread, so
+        the event loop isn't blocked by reading large objects
+        """
+        value = self._get_memory(key)
+        if value is None:
+            if self._disk_enabled():
+                value = await asyncio.to_thread(self._get_disk, key)
+            else:
+                value = self._get_disk(key)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Add an object to the cache, evicting the least recently used objects if the
+        cache would go over `max_bytes`
+        """
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    async def put_async(self, key: str, value: bytes) -> None:
+        """
+        As `put`, but the object is written to disk (and the disk pruned, if needed) in
+        a thread, so the event loop isn't blocked
+        """
+        self._put_memory(key, value)
+        if self._disk_enabled():
+            await asyncio.to_thread(self._write_disk, key, value)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove a single object from the cache
+        """
+        with self._lock:
+            if key in self._objects:
+                self._remove(key)
+
+        disk_path = self._get_disk_path(key)
+        if disk_path is not None:
+            disk_path.unlink(missing_ok=True)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """
+        Remove all objects with keys starting with `prefix` from the cache
+        """
+        with self._lock:
+            keys = [key for key in self._objects if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+
+        if keys:
+            log.debug("Invalidated %d cached objects with prefix %s", len(keys), prefix)
+
+        if self.disk_directory is not None:
+            directory, _, name_prefix = prefix.rpartition("/")
+            disk_directory = self._get_disk_path(directory)
+            if disk_directory is None or not disk_directory.is_dir():
+                return
+
+            for path in disk_directory.iterdir():
+                if path.name.startswith(name_prefix):
+                    if path.is_dir():
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Remove all objects from the cache
+        """
+        with self._lock:
+            self._objects.clear()
+            self.current_bytes = 0
+
+        if self.disk_directory is not None:
+            for path in self.disk_directory.iterdir():
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+
+    def get_cache_info(self) -> dict[str, int | float]:
+        """
+        Return the hit, miss, eviction and expiration counts, and the current size of
+        the cache in memory
+        """
+        with self._lock:
+            requests = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / requests if requests else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._objects),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _disk_enabled(self) -> bool:
+        return self.disk_directory is not None and self.disk_max_bytes > 0
+
+    def _get_memory(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._objects.get(key)
+            if entry is None:
+                return None
+
+            value, expiry = entry
+            if expiry is None or expiry > time.monotonic():
+                self._objects.move_to_end(key)
+                self.hits += 1
+                return value
+
+            self._remove(key)
+            self.expirations += 1
+            return None
+
+    def _get_disk(self, key: str) -> bytes | None:
+        """
+        Read an object from disk, adding it to memory if found. The miss is counted
+        here, as this is only called when the object isn't in memory
+        """
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.disk_hits += 1
+
+        self._put_memory(key, value)
+        return value
+
+    def _put_memory(self, key: str, value: bytes) -> None:
+        value_bytes = len(value)
+        if value_bytes > self.max_bytes:
+            return
+
+        if self.ttl_seconds is None:
+            expiry = None
+        else:
+            expiry = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if key in self._objects:
+                self._remove(key)
+
+            while self.current_bytes + value_bytes > self.max_bytes:
+                least_recent_key = next(iter(self._objects))
+                self._remove(least_recent_key)
+                self.evictions += 1
+
+            self._objects[key] = (value, expiry)
+            self.current_bytes += value_bytes
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove a single object from memory. The lock must be held by the caller
+        """
+        value, _ = self._objects.pop(key)
+        self.current_bytes -= len(value)
+
+    def _get_disk_path(self, key: str) -> Path | None:
+        """
+        Get the path on disk for `key`, which mirrors its path in the bucket. Returns
+        `None` if there is no disk tier, or the key would be outside of the directory
+        """
+        if self.disk_directory is None:
+            return None
+
+        path = (self.disk_directory / key).resolve()
+        if not path.is_relative_to(self.disk_directory.resolve()):
+            log.warning("Not caching %s on disk as it is outside the cache", key)
+            return None
+
+        return path
+
+    def _read_disk(self, key: str) -> bytes | None:
+        disk_path = self._get_disk_path(key)
+        if disk_path is None or self.disk_max_bytes == 0:
+            return None
+
+        try:
+            if self.ttl_seconds is not None:
+                age = time.time() - disk_path.stat().st_mtime
+                if age > self.ttl_seconds:
+                    disk_path.unlink(missing_ok=True)
+                    with self._lock:
+                        self.expirations += 1
+                    return None
+
+            return disk_path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        """
+        Write an object to disk. The object is written to a temporary file which is
+        then renamed, so other workers never read a partially written object
+        """
+        disk_path = self._get_disk_path(key)
+        if disk_path is None or len(value) > self.disk_max_bytes:
+            return
+
+        try:
+            disk_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=disk_path.parent,
+                prefix=".tmp",
+                delete=False,
+            ) as temporary_file:
+                temporary_file.write(value)
+            os.replace(temporary_file.name, disk_path)
+        except OSError:
+            log.exception("Failed to cache %s on disk", key)
+            return
+
+        with self._lock:
+            self._disk_bytes_since_prune += len(value)
+            prune = self._disk_bytes_since_prune > self.disk_max_bytes / 10
+            if prune:
+                self._disk_bytes_since_prune = 0
+
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """
+        Remove the least recently modified objects from disk until the total size is
+        below `disk_max_bytes`. As the directory is shared between workers, this can't
+        be tracked in memory so the directory is scanned periodically instead
+        """
+        files = []
+        total_bytes = 0
+        for directory, _, filenames in os.walk(self.disk_directory):
+            for filename in filenames:
+                path = Path(directory, filename)
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total_bytes += stat.st_size
+
+        files.sort()
+        removed = 0
+        for _, size, path in files:
+            if total_bytes <= self.disk_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            log.debug("Removed %d objects from the disk cache", removed)
+
+
+@lru_cache
+def get_object_cache() -> ObjectCache:
+    """
+    Returns:
+        ObjectCache: Cache of objects downloaded from Echo, shared between requests.
+    """
+    echo_config = Config.config.echo
+    return ObjectCache(
+        max_bytes=echo_config.cache_max_bytes,
+        ttl_seconds=echo_config.cache_ttl_seconds,
+        disk_directory=echo_config.cache_disk_directory,
+        disk_max_bytes=echo_config.cache_disk_max_bytes,
+    )
@@ -0,0 +1,158 @@
+from io import BytesIO
+import logging
+import threading
+from typing import Sequence
+
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+log = logging.getLogger()
+
+
+class PlotRenderer:
+    """
+    Renders waveforms (as line plots) and vectors (as bar charts) to PNGs using
+    matplotlib's object oriented API, rather than the global state of pyplot.
+
+    Creating a figure is a significant part of the cost of rendering a thumbnail, so
+    thumbnail figures are created once per thread and reused. Each thread has its own
+    figures, so thumbnails can be rendered concurrently (e.g. in the CPU executor).
+    Full size plots are rendered less often and vary more (labels, units), so a new
+    figure is created for each of these.
+    """
+
+    _local = threading.local()
+
+    @staticmethod
+    def render_line_thumbnail(
+        x: Sequence[float],
+        y: Sequence[float],
+        thumbnail_size: tuple[int, int],
+        line_width: float,
+    ) -> bytes:
+        """
+        Render a thumbnail sized line plot of `x` and `y`, with no axis decorations
+        """
+        key = ("line", tuple(thumbnail_size), line_width)
+        figure, axes, line = PlotRenderer._get_thumbnail_figure(key)
+        line.set_data(x, y)
+        axes.relim()
+        axes.autoscale_view()
+        return PlotRenderer._save_thumbnail(figure)
+
+    @staticmethod
+    def render_bar_thumbnail(
+        data: Sequence[float],
+        thumbnail_size: tuple[int, int],
+    ) -> bytes:
+        """
+        Render a thumbnail sized bar chart of `data`, with no axis decorations other
+        than a line at 0
+        """
+        key = ("bar", tuple(thumbnail_size))
+        figure, axes, _ = PlotRenderer._get_thumbnail_figure(key)
+        # Each call to bar() moves on to the next colour, so go back to the first one
+        # to match the colour of a new figure
+        axes.set_prop_cycle(None)
+        # Reset the data limits to those of the line at 0 before adding the bars (which
+        # update the limits as they're added), rather than recalculating them after
+        axes.relim()
+        bars = axes.bar(range(len(data)), data)
+        try:
+            axes.autoscale_view()
+            return PlotRenderer._save_thumbnail(figure)
+        finally:
+            # Remove the bars so the figure can be reused for the next vector
+            bars.remove()
+
+    @staticmethod
+    def render_line(
+        x: Sequence[float],
+        y: Sequence[float],
+        x_label: str | None,
+        y_label: str | None,
+    ) -> bytes:
+        """
+        Render a full size line plot of `x` and `y`, with labelled axes
+        """
+        figure = Figure(figsize=(8, 6))
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.plot(x, y)
+        axes.set_xlabel(x_label)
+        axes.set_ylabel(y_label)
+        return PlotRenderer._save(figure, pad_inches=0.1)
+
+    @staticmethod
+    def render_bar(labels: Sequence[str | int], data: Sequence[float]) -> bytes:
+        """
+        Render a full size bar chart of `data`, with each bar labelled
+        """
+        figure = Figure(figsize=(8, 6))
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.bar(labels, data)
+        return PlotRenderer._save(figure, pad_inches=0.1)
+
+    @staticmethod
+    def _get_thumbnail_figure(key: tuple) -> tuple[Figure, Axes, Line2D]:
+        """
+        Get this thread's thumbnail figure for `key`, creating it if needed. Line
+        figures contain an empty line to set the data of, bar figures contain a
+        horizontal line at 0
+        """
+        figures = getattr(PlotRenderer._local, "figures", None)
+        if figures is None:
+            figures = PlotRenderer._local.figures = {}
+
+        if key not in figures:
+            log.debug("Creating thumbnail figure for %s", key)
+            thumbnail_size = key[1]
+            # 1 in figsize = 100px
+            figure = Figure(figsize=(thumbnail_size[0] / 100, thumbnail_size[1] / 100))
+            FigureCanvasAgg(figure)
+            axes = figure.add_subplot()
+            # Removes the notches on the plot that provide a scale
+            axes.set_xticks([])
+            axes.set_yticks([])
+            if key[0] == "line":
+                # Line width is configurable - thickness of line in the waveform
+                (line,) = axes.plot([], [], linewidth=key[2])
+            else:
+                line = axes.axhline(c="black")
+            # Disables all axis decorations
+            axes.axis("off")
+            # Removes the frame around the plot
+            axes.set_frame_on(False)
+            figures[key] = (figure, axes, line)
+
+        return figures[key]
+
+    @staticmethod
+    def _save_thumbnail(figure: Figure) -> bytes:
+        """
+        Setting bbox_inches="tight" and pad_inches=0 removes padding around figure to
+        make best use of the limited pixels available in a thumbnail. Because of this,
+        dpi has been set to 130 to offset the tight bbox removing white space around
+        the figure and there keeps the thumbnail size calculation correct. The default
+        dpi is 100 but that will result in thumbnails smaller than the configuration
+        setting, hence the value of 130
+        """
+        return PlotRenderer._save(figure, pad_inches=0)
+
+    @staticmethod
+    def _save(figure: Figure, pad_inches: float) -> bytes:
+        """
+        Save `figure` as a PNG and return the bytes
+        """
+        with BytesIO() as buffer:
+            figure.savefig(
+                buffer,
+                format="PNG",
+                bbox_inches="tight",
+                pad_inches=pad_inches,
+                dpi=130,
+            )
+            return buffer.getvalue()
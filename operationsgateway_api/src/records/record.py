@@ -1,10 +1,11 @@
-import asyncio
 import base64
 from datetime import datetime
 from io import BytesIO
 import logging
-from typing import Any, Dict, List, Tuple, Union
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
 
+import bson
 import numpy as np
 from PIL import Image as PILImage
 from pydantic import ValidationError
@@ -12,6 +13,7 @@ import pymongo
 from pymongo.results import DeleteResult
 
 from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
 from operationsgateway_api.src.exceptions import (
     ChannelSummaryError,
     DatabaseError,
@@ -28,18 +30,23 @@ from operationsgateway_api.src.functions.variable_models import (
 from operationsgateway_api.src.models import (
     ChannelDtype,
     DateConverterRange,
-    FloatImageModel,
-    ImageModel,
     PartialChannelModel,
+    PartialChannels,
     PartialRecordModel,
     PartialScalarChannelModel,
     RecordModel,
     ShotnumConverterRange,
 )
 from operationsgateway_api.src.mongo.interface import MongoDBInterface
+from operationsgateway_api.src.records.echo_interface import get_echo_interface
 from operationsgateway_api.src.records.false_colour_handler import FalseColourHandler
 from operationsgateway_api.src.records.float_image import FloatImage
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.image_array_cache import get_image_array_cache
+from operationsgateway_api.src.records.thumbnail_cache import (
+    get_thumbnail_cache,
+    ThumbnailCache,
+)
 from operationsgateway_api.src.records.vector import Vector
 from operationsgateway_api.src.records.waveform import Waveform
 
@@ -47,6 +54,10 @@ log = logging.getLogger()
 
 
 class Record:
+    update_count = 0
+    update_operations = 0
+    update_seconds = 0.0
+
     def __init__(self, record: Union[RecordModel, dict]) -> None:
         """
         Store a record within the object. If the input is a dictionary, it will be
@@ -75,71 +86,117 @@ class Record:
         Use the `MongoDBInterface` to insert the object's record into the `records`
         collection in the database
         """
+        # Images may have been cached for a record with this ID which has since been
+        # deleted (e.g. by another instance of the API), so would now be stale
+        get_image_array_cache().invalidate_record(self.record.id_)
         await MongoDBInterface.insert_one(
             "records",
             self.record.model_dump(by_alias=True, exclude_unset=True),
         )
 
-    async def concurrent_upload(
-        self,
-        images: list[ImageModel] | list[FloatImageModel],
-        image_class: Image.__class__ | FloatImage.__class__,
-    ) -> list[str]:
-        log.debug("Processing %ss", image_class.__name__)
-        failed_image_uploads = []
-        tasks = []
-        async with asyncio.TaskGroup() as task_group:
-            for image_model in images:
-                image = image_class(image_model)
-                image.create_thumbnail()
-                self.store_thumbnail(image)  # in the record not echo
-                task = task_group.create_task(image_class.upload_image(image))
-                tasks.append(task)
-        for task in tasks:
-            channel_name = task.result()
-            if channel_name:
-                failed_image_uploads.append(channel_name)
-
-        return failed_image_uploads
+    @staticmethod
+    async def insert_many(records: List["Record"]) -> None:
+        """
+        Insert several records into the `records` collection at once. The inserts are
+        unordered, so one record failing doesn't prevent the rest from being inserted
+        """
+        image_array_cache = get_image_array_cache()
+        for record in records:
+            # As for `insert()`, images may be cached for a deleted record with this ID
+            image_array_cache.invalidate_record(record.record.id_)
+        await MongoDBInterface.insert_many(
+            "records",
+            [
+                record.record.model_dump(by_alias=True, exclude_unset=True)
+                for record in records
+            ],
+            ordered=False,
+        )
 
     async def update(self) -> None:
         """
         Update a record which already exists in the database
 
-        This update query has been split into two one (which is iterated in a loop) to
-        add record metadata, and another to add each of the channels. Based on some
-        quick dev testing while making sure it worked, this doesn't slow down ingestion
-        times
+        The version, each metadata key and each channel are set in a single update.
+        If the update would be too large to send at once, it's split into several
+        updates which are sent together in a bulk write
         """
+        get_thumbnail_cache().invalidate_record(self.record.id_)
+        get_image_array_cache().invalidate_record(self.record.id_)
 
-        await MongoDBInterface.update_one(
-            "records",
-            {"_id": self.record.id_},
-            {"$set": {"version": self.record.version}},
+        start_time = time.perf_counter()
+        set_documents = self._get_update_set_documents()
+        if len(set_documents) == 1:
+            await MongoDBInterface.update_one(
+                "records",
+                {"_id": self.record.id_},
+                {"$set": set_documents[0]},
+            )
+        else:
+            await MongoDBInterface.bulk_write(
+                "records",
+                [
+                    pymongo.UpdateOne({"_id": self.record.id_}, {"$set": document})
+                    for document in set_documents
+                ],
+            )
+
+        duration = time.perf_counter() - start_time
+        Record.update_count += 1
+        Record.update_operations += len(set_documents)
+        Record.update_seconds += duration
+        log.info(
+            "Updated record %s with %d fields in %d operation(s), took %.3fs",
+            self.record.id_,
+            sum(len(document) for document in set_documents),
+            len(set_documents),
+            duration,
         )
+
+    def _get_update_set_documents(self) -> List[Dict[str, Any]]:
+        """
+        Build the `$set` document(s) needed to update the version, metadata and
+        channels of this record. Fields are split across multiple documents if they
+        would go over `max_update_bytes` when encoded as BSON
+        """
+        fields = {"version": self.record.version}
         for metadata_key, value in self.record.metadata.model_dump(
             exclude_unset=True,
             exclude={"epac_ops_data_version"},
         ).items():
-            await MongoDBInterface.update_one(
-                "records",
-                {"_id": self.record.id_},
-                {"$set": {f"metadata.{metadata_key}": value}},
-            )
+            fields[f"metadata.{metadata_key}"] = value
 
         for channel_name, channel_value in self.record.channels.items():
-            await MongoDBInterface.update_one(
-                "records",
-                {"_id": self.record.id_},
-                {
-                    "$set": {
-                        f"channels.{channel_name}": channel_value.model_dump(
-                            exclude_unset=True,
-                        ),
-                    },
-                },
+            fields[f"channels.{channel_name}"] = channel_value.model_dump(
+                exclude_unset=True,
             )
 
+        max_update_bytes = Config.config.records.max_update_bytes
+        set_documents = [{}]
+        document_bytes = 0
+        for field, value in fields.items():
+            field_bytes = len(bson.encode({field: value}))
+            if set_documents[-1] and document_bytes + field_bytes > max_update_bytes:
+                set_documents.append({})
+                document_bytes = 0
+
+            set_documents[-1][field] = value
+            document_bytes += field_bytes
+
+        return set_documents
+
+    @staticmethod
+    def get_update_stats() -> Dict[str, int | float]:
+        """
+        Return the number of records updated, the number of update operations sent to
+        the database and the total time taken
+        """
+        return {
+            "updates": Record.update_count,
+            "operations": Record.update_operations,
+            "seconds": Record.update_seconds,
+        }
+
     def remove_channel(self, channel_name: str) -> None:
         if channel_name in self.record.channels:
             log.info("Removing channel '%s' from record.", channel_name)
@@ -191,6 +248,64 @@ class Record:
         else:
             return None
 
+    @staticmethod
+    async def find_existing_records(
+        records: list[RecordModel],
+    ) -> dict[str, RecordModel]:
+        """
+        Equivalent to calling `find_existing_record()` then (if nothing is found)
+        `find_record_by_shotnum()` for each of `records`, but using a single query.
+        Returns a dictionary of the stored records, keyed by the ID of the record they
+        were found for
+        """
+        if not records:
+            return {}
+
+        log.debug(
+            "Querying MongoDB to see if %d records are already stored in the database",
+            len(records),
+        )
+        record_ids = [record.id_ for record in records]
+        shotnums = [
+            record.metadata.shotnum
+            for record in records
+            if record.metadata.shotnum is not None
+        ]
+        query = MongoDBInterface.find(
+            "records",
+            filter_={
+                "$or": [
+                    {"_id": {"$in": record_ids}},
+                    {"metadata.shotnum": {"$in": shotnums}},
+                ],
+            },
+        )
+        record_dicts = await MongoDBInterface.query_to_list(query)
+        records_by_id = {
+            record_dict["_id"]: record_dict for record_dict in record_dicts
+        }
+        records_by_shotnum = {
+            record_dict["metadata"].get("shotnum"): record_dict
+            for record_dict in record_dicts
+        }
+
+        stored_records = {}
+        for record in records:
+            if record.id_ in records_by_id:
+                stored_records[record.id_] = RecordModel(**records_by_id[record.id_])
+            elif (
+                record.metadata.shotnum is not None
+                and record.metadata.shotnum in records_by_shotnum
+            ):
+                record_dict = records_by_shotnum[record.metadata.shotnum]
+                stored_records[record.id_] = RecordModel(
+                    _id=record_dict["_id"],
+                    metadata=record_dict["metadata"],
+                    channels=record_dict["channels"],
+                )
+
+        return stored_records
+
     @staticmethod
     async def find_record(
         conditions: Dict[str, Any],
@@ -214,6 +329,29 @@ class Record:
         records_data = await MongoDBInterface.query_to_list(records_query)
         return [PartialRecordModel(**record) for record in records_data]
 
+    @staticmethod
+    async def find_record_iterator(
+        conditions: Dict[str, Any],
+        skip: int,
+        limit: int,
+        sort: List[Tuple[str, int]],
+        projection: List[str],
+    ) -> AsyncIterator[PartialRecordModel]:
+        """
+        Using the database query parameters, find record(s) that match the query and
+        yield them one at a time as they are returned by the database cursor
+        """
+        records_query = MongoDBInterface.find(
+            collection_name="records",
+            filter_=conditions,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+            projection=projection,
+        )
+        async for record in MongoDBInterface.query_to_async_iterator(records_query):
+            yield PartialRecordModel(**record)
+
     @staticmethod
     async def find_record_by_id(
         id_: str,
@@ -329,8 +467,141 @@ class Record:
 
     @staticmethod
     async def delete_record(id_: str) -> DeleteResult:
+        get_thumbnail_cache().invalidate_record(id_)
+        get_image_array_cache().invalidate_record(id_)
         return await MongoDBInterface.delete_one("records", {"_id": id_})
 
+    @staticmethod
+    async def delete_records(filter_: dict) -> list[str]:
+        """
+        Delete the records matching `filter_` from the database, along with all of
+        their objects in Echo. At most `mongodb.max_documents` records are deleted in
+        one call. The keys of the objects are built from the paths stored in each
+        record's channels rather than by listing prefixes in the bucket, and are
+        deleted in batches. Returns the IDs of the deleted records.
+
+        The objects are deleted before the records, as their keys can't be built once
+        the records are gone. If deleting the objects fails, the records are kept so
+        the deletion can be retried
+        """
+        object_paths = await Record.get_object_paths(
+            filter_,
+            limit=Config.config.mongodb.max_documents,
+        )
+        record_ids = list(object_paths)
+        if not record_ids:
+            return []
+
+        all_object_paths = [path for paths in object_paths.values() for path in paths]
+        log.info(
+            "Deleting %d objects for %d records",
+            len(all_object_paths),
+            len(record_ids),
+        )
+        await get_echo_interface().delete_file_objects(all_object_paths)
+
+        log.info("Deleting %d records", len(record_ids))
+        await MongoDBInterface.delete_many("records", {"_id": {"$in": record_ids}})
+        thumbnail_cache = get_thumbnail_cache()
+        image_array_cache = get_image_array_cache()
+        for record_id in record_ids:
+            thumbnail_cache.invalidate_record(record_id)
+            image_array_cache.invalidate_record(record_id)
+
+        return record_ids
+
+    @staticmethod
+    async def get_object_paths(
+        filter_: dict,
+        limit: int | None = None,
+    ) -> dict[str, list[str]]:
+        """
+        Get the full paths of the objects in Echo for each of the records matching
+        `filter_` (up to `limit` records, if given), keyed by record ID. Only the
+        channel paths are returned by the database, not the thumbnails or other data.
+
+        In principle historic data might be in the old directory format on Echo, so the
+        path in the other format is included as well as the one stored in the record.
+        Waveforms and vectors may have been stored in either format, so paths with each
+        of their extensions are included.
+        The levels of each image's pyramid recorded on its channel are also included,
+        along with those for the currently configured `pyramid_factors` in case the
+        image was ingested before the levels were recorded
+        """
+        channel_objects = {
+            ChannelDtype.IMAGE: Image,
+            ChannelDtype.FLOAT_IMAGE: FloatImage,
+            ChannelDtype.WAVEFORM: Waveform,
+            ChannelDtype.VECTOR: Vector,
+        }
+        path = {
+            "$ifNull": [
+                "$$channel.v.image_path",
+                {"$ifNull": ["$$channel.v.waveform_path", "$$channel.v.vector_path"]},
+            ],
+        }
+        pipeline = [{"$match": filter_}]
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        pipeline.append(
+            {
+                "$project": {
+                    "channels": {
+                        "$map": {
+                            "input": {"$objectToArray": "$channels"},
+                            "as": "channel",
+                            "in": {
+                                "name": "$$channel.k",
+                                "channel_dtype": "$$channel.v.metadata.channel_dtype",
+                                "path": path,
+                                "pyramid_factors": "$$channel.v.pyramid_factors",
+                            },
+                        },
+                    },
+                },
+            },
+        )
+        records = await MongoDBInterface.aggregate("records", pipeline)
+
+        object_paths = {}
+        for record in records:
+            record_id = record["_id"]
+            record_object_paths = set()
+            for channel in record.get("channels") or []:
+                channel_object = channel_objects.get(channel.get("channel_dtype"))
+                relative_path = channel.get("path")
+                if channel_object is None or not relative_path:
+                    continue
+
+                record_object_paths.add(channel_object.get_full_path(relative_path))
+                echo_extensions = [
+                    relative_path.rsplit(".", 1)[-1],
+                    *channel_object.get_echo_extensions(),
+                ]
+                if channel_object is Image:
+                    pyramid_factors = {
+                        *(channel.get("pyramid_factors") or []),
+                        *Config.config.images.pyramid_factors,
+                    }
+                    echo_extensions.extend(
+                        Image.get_pyramid_extension(factor)
+                        for factor in pyramid_factors
+                    )
+                for echo_extension in echo_extensions:
+                    for use_subdirectories in (True, False):
+                        other_relative_path = channel_object.get_relative_path(
+                            record_id,
+                            channel["name"],
+                            use_subdirectories,
+                            echo_extension,
+                        )
+                        other_path = channel_object.get_full_path(other_relative_path)
+                        record_object_paths.add(other_path)
+
+            object_paths[record_id] = sorted(record_object_paths)
+
+        return object_paths
+
     @staticmethod
     def truncate_thumbnails(record: PartialRecordModel) -> None:
         """
@@ -356,6 +627,7 @@ class Record:
         float_colourmap_name: str,
         vector_skip: int | None,
         vector_limit: int | None,
+        channel_metadata: dict[str, PartialChannels] | None = None,
     ) -> None:
         """
         Apply false colour to any greyscale image thumbnails in the record.
@@ -365,50 +637,162 @@ class Record:
         These will be the greyscale images which need to have false colour applied.
         Note: there will also be "thumbnail" entries in 'rgb-image' and 'waveform'
         channels but they should not have false colour applied to them.
+
+        `channel_metadata` can be passed from `get_channel_metadata()` if it has already
+        been resolved for a page of records, otherwise it is looked up for this record.
         """
         record_id = record.id_
+        if channel_metadata is None:
+            channel_metadata = await Record.get_channel_metadata([record])
+
+        thumbnail_cache = get_thumbnail_cache()
         for channel_name, value in record.channels.items():
             channel_dtype = await Record.get_channel_dtype(
                 record_id,
                 channel_name,
                 value,
+                channel_metadata,
             )
             b64_thumbnail_str = getattr(value, "thumbnail", None)
             thumbnail_set = b64_thumbnail_str is not None
             skip_limit_set = vector_skip or vector_limit
             if channel_dtype == "image" and thumbnail_set:
-                thumbnail_bytes = FalseColourHandler.apply_false_colour_to_b64_img(
-                    base64_image=b64_thumbnail_str,
-                    lower_level=lower_level,
-                    upper_level=upper_level,
-                    colourmap_name=colourmap_name,
+                cache_key = ThumbnailCache.create_key(
+                    record_id,
+                    channel_name,
+                    b64_thumbnail_str,
+                    channel_dtype,
+                    colourmap_name,
+                    lower_level,
+                    upper_level,
                 )
-                value.thumbnail = base64.b64encode(thumbnail_bytes.getvalue())
+                thumbnail = thumbnail_cache.get(cache_key)
+                if thumbnail is None:
+                    thumbnail_bytes = await get_cpu_executor().run(
+                        FalseColourHandler.apply_false_colour_to_b64_img,
+                        base64_image=b64_thumbnail_str,
+                        lower_level=lower_level,
+                        upper_level=upper_level,
+                        colourmap_name=colourmap_name,
+                    )
+                    thumbnail = base64.b64encode(thumbnail_bytes.getvalue())
+                    thumbnail_cache.put(cache_key, thumbnail)
+                value.thumbnail = thumbnail
             elif channel_dtype == "float_image" and thumbnail_set:
-                thumbnail_bytes = (
-                    FalseColourHandler.apply_false_colour_to_b64_float_img(
+                cache_key = ThumbnailCache.create_key(
+                    record_id,
+                    channel_name,
+                    b64_thumbnail_str,
+                    channel_dtype,
+                    float_colourmap_name,
+                )
+                thumbnail = thumbnail_cache.get(cache_key)
+                if thumbnail is None:
+                    thumbnail_bytes = await get_cpu_executor().run(
+                        FalseColourHandler.apply_false_colour_to_b64_float_img,
                         b64_thumbnail_str,
                         float_colourmap_name,
                     )
-                )
-                value.thumbnail = base64.b64encode(thumbnail_bytes.getvalue())
+                    thumbnail = base64.b64encode(thumbnail_bytes.getvalue())
+                    thumbnail_cache.put(cache_key, thumbnail)
+                value.thumbnail = thumbnail
             elif channel_dtype == "vector" and thumbnail_set and skip_limit_set:
                 # Only re-generate thumbnail if either skip or limit are truthy, i.e.
                 # non-None and non-zero int
-                vector_model = await Vector.get_vector(record_id, channel_name)
-                vector = Vector(vector_model)
-                vector.create_thumbnail(vector_skip, vector_limit)
-                value.thumbnail = vector.thumbnail
+                cache_key = ThumbnailCache.create_key(
+                    record_id,
+                    channel_name,
+                    b64_thumbnail_str,
+                    channel_dtype,
+                    vector_skip,
+                    vector_limit,
+                )
+                thumbnail = thumbnail_cache.get(cache_key)
+                if thumbnail is None:
+                    vector_model = await Vector.get_vector(
+                        record_id,
+                        channel_name,
+                        stored_path=getattr(value, "vector_path", None),
+                    )
+                    vector = Vector(vector_model)
+                    thumbnail = await get_cpu_executor().run(
+                        vector.create_thumbnail,
+                        vector_skip,
+                        vector_limit,
+                    )
+                    thumbnail_cache.put(cache_key, thumbnail)
+                value.thumbnail = thumbnail
+
+    @staticmethod
+    async def get_channel_metadata(
+        records: List[PartialRecordModel],
+    ) -> dict[str, PartialChannels]:
+        """
+        Find the channels in `records` which have been projected without their metadata
+        and look up their "channel_dtype" and "bit_depth" in a single query. The result
+        is keyed by record ID and then channel name, and can be passed to
+        `get_channel_dtype()` and `get_raw_bit_depth()` so they don't need to query the
+        database for each channel
+        """
+        record_ids = set()
+        projection = set()
+        for record in records:
+            for channel_name, channel_value in (record.channels or {}).items():
+                if getattr(channel_value, "metadata", None) is None:
+                    record_ids.add(record.id_)
+                    projection.add(f"channels.{channel_name}.metadata.channel_dtype")
+                    projection.add(f"channels.{channel_name}.metadata.bit_depth")
+
+        if not record_ids:
+            return {}
+
+        log.debug(
+            "Looking up metadata of %d channels for %d records",
+            len(projection) // 2,
+            len(record_ids),
+        )
+        query = MongoDBInterface.find(
+            collection_name="records",
+            filter_={"_id": {"$in": list(record_ids)}},
+            projection=list(projection),
+        )
+        records_data = await MongoDBInterface.query_to_list(query)
+
+        channel_metadata = {}
+        for record_data in records_data:
+            record = PartialRecordModel(**record_data)
+            channel_metadata[record.id_] = record.channels or {}
+
+        return channel_metadata
+
+    @staticmethod
+    def _lookup_channel_value(
+        record_id: str,
+        channel_name: str,
+        channel_metadata: dict[str, PartialChannels] | None,
+    ) -> PartialChannelModel | None:
+        """
+        Get a channel from the output of `get_channel_metadata()`, if it's present
+        """
+        if not channel_metadata:
+            return None
+
+        channel_value = channel_metadata.get(record_id, {}).get(channel_name)
+        if getattr(channel_value, "metadata", None) is None:
+            return None
+
+        return channel_value
 
     @staticmethod
     async def get_channel_dtype(
         record_id: str,
         channel_name: str,
         channel_value: PartialChannelModel,
+        channel_metadata: dict[str, PartialChannels] | None = None,
     ) -> ChannelDtype:
         """
-        Extract "channel_dtype" from `channel_value`, or if not present, retrieve with a
-        separate lookup.
+        Extract "channel_dtype" from `channel_value`, or if not present, from
+        `channel_metadata` or else retrieve with a separate lookup.
         """
         try:
             channel_dtype = channel_value.metadata.channel_dtype
@@ -416,6 +800,14 @@ class Record:
             # if a projection has been applied then the record will only contain
             # the requested fields and probably not the channel_dtype
             # so it needs to be looked up separately
+            stored_value = Record._lookup_channel_value(
+                record_id,
+                channel_name,
+                channel_metadata,
+            )
+            if stored_value is not None:
+                return stored_value.metadata.channel_dtype
+
             record = await Record.find_record_by_id(
                 record_id,
                 {},
@@ -430,16 +822,19 @@ class Record:
         record_id: str,
         channel_name: str,
         channel_value: PartialChannelModel,
+        channel_metadata: dict[str, PartialChannels] | None = None,
     ) -> "int | None":
         """
-        Extract "bit_depth" from `channel_value`, or if not present, retrieve with a
-        separate lookup.
+        Extract "bit_depth" from `channel_value`, or if not present, from
+        `channel_metadata` or else retrieve with a separate lookup.
 
         Args:
             record_id (str): Record identifier
             channel_name (str): Channel name to get the bit depth for
             channel_value (dict):
                 Previously fetched channel (may not include all the metadata).
+            channel_metadata (dict | None):
+                Output of `get_channel_metadata()` for the page of records, if any.
 
         Returns:
             int | None: The bit_depth if found, `None` otherwise.
@@ -450,6 +845,14 @@ class Record:
             # if a projection has been applied then the record will only contain
             # the requested fields and probably not the channel_dtype
             # so it needs to be looked up separately
+            stored_value = Record._lookup_channel_value(
+                record_id,
+                channel_name,
+                channel_metadata,
+            )
+            if stored_value is not None:
+                return getattr(stored_value.metadata, "bit_depth", None)
+
             record_dict = await Record.find_record_by_id(
                 record_id,
                 {},
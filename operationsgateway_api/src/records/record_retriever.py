@@ -1,9 +1,7 @@
 import asyncio
-from io import BytesIO
 import logging
 
 import numpy as np
-from PIL import Image as PILImage
 
 from operationsgateway_api.src.channels.channel_manifest import ChannelManifest
 from operationsgateway_api.src.exceptions import FunctionParseError
@@ -12,8 +10,12 @@ from operationsgateway_api.src.functions.expression_transformer import (
 )
 from operationsgateway_api.src.functions.variable_models import WaveformVariable
 from operationsgateway_api.src.functions.variable_transformer import VariableTransformer
-from operationsgateway_api.src.models import PartialRecordModel
+from operationsgateway_api.src.models import PartialChannels, PartialRecordModel
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.image_array_cache import (
+    get_image_array_cache,
+    ImageArrayCache,
+)
 from operationsgateway_api.src.records.record import Record
 from operationsgateway_api.src.records.waveform import Waveform
 
@@ -66,6 +68,7 @@ class RecordRetriever:
         vector_limit: int | None = None,
         return_thumbnails: bool = True,
         truncate: bool = False,
+        channel_metadata: dict[str, PartialChannels] | None = None,
     ) -> None:
         # Request parameters and the record as is from the database
         self.record = record
@@ -79,6 +82,9 @@ class RecordRetriever:
         self.vector_limit = vector_limit
         self.return_thumbnails = return_thumbnails
         self.truncate = truncate
+        # Channel metadata missing from the projected record, see
+        # `Record.get_channel_metadata()`
+        self.channel_metadata = channel_metadata
 
         # Functions specific objects
         self.functions_data = [FunctionData(f) for f in functions] if functions else []
@@ -98,6 +104,7 @@ class RecordRetriever:
         and applying functions.
         """
         if self.record.channels:
+            await self._resolve_channel_metadata()
             await Record.apply_false_colour_to_thumbnails(
                 self.record,
                 self.lower_level,
@@ -106,6 +113,7 @@ class RecordRetriever:
                 self.float_colourmap_name,
                 vector_skip=self.vector_skip,
                 vector_limit=self.vector_limit,
+                channel_metadata=self.channel_metadata,
             )
 
             if self.truncate:
@@ -144,6 +152,7 @@ class RecordRetriever:
                 self.record.channels.update(record_extra.channels)
 
         # Build and execute a list of coroutines to fetch the data concurrently
+        await self._resolve_channel_metadata()
         for variable in all_variables:
             await self._extract_variable(variable)
 
@@ -200,6 +209,14 @@ class RecordRetriever:
 
         self.record.channels = self.record.channels
 
+    async def _resolve_channel_metadata(self) -> None:
+        """
+        If it wasn't resolved for the whole page of records, look up the metadata of
+        any channels projected without it using a single query for this record
+        """
+        if self.channel_metadata is None:
+            self.channel_metadata = await Record.get_channel_metadata([self.record])
+
     async def _extract_variable(self, variable: str) -> None:
         """
         Depending on the channel type, add the coroutine to fetch the data to `self`.
@@ -210,12 +227,14 @@ class RecordRetriever:
                 record_id=self.record.id_,
                 channel_name=variable,
                 channel_value=self.record.channels[variable],
+                channel_metadata=self.channel_metadata,
             )
             if channel_dtype == "image":
                 raw_bit_depth = await Record.get_raw_bit_depth(
                     record_id=self.record.id_,
                     channel_name=variable,
                     channel_value=self.record.channels[variable],
+                    channel_metadata=self.channel_metadata,
                 )
                 if raw_bit_depth is not None:
                     self.bit_depths[variable] = raw_bit_depth
@@ -232,6 +251,7 @@ class RecordRetriever:
                     self.record.id_,
                     variable,
                     getattr(self.record.channels[variable].metadata, "x_units", None),
+                    getattr(self.record.channels[variable], "waveform_path", None),
                 )
                 self.coroutines.append(coroutine)
 
@@ -260,22 +280,55 @@ class RecordRetriever:
         )
         self.raw_data[channel_name] = image_bytes
 
-        img_src = PILImage.open(BytesIO(image_bytes))
-        img_array = np.array(img_src)
-        variable_value = Record._bit_shift_to_raw(
+        self.variable_data[channel_name] = await self._get_raw_image_array(
+            record_id=record_id,
+            channel_name=channel_name,
+            raw_bit_depth=raw_bit_depth,
+        )
+
+    @staticmethod
+    async def _get_raw_image_array(
+        record_id: str,
+        channel_name: str,
+        raw_bit_depth: int | None,
+    ) -> np.ndarray:
+        """
+        Get the read-only array of an image with its bits shifted back to their raw
+        positions. The array is cached and shared with any other request using the same
+        image. Images stored without a shift are already cached by `Image.get_array()`,
+        so are not cached again here
+        """
+        if raw_bit_depth in (None, 8, 16):
+            img_array, _ = await Image.get_array(record_id, channel_name)
+            return img_array
+
+        image_array_cache = get_image_array_cache()
+        cache_key = ImageArrayCache.create_key(record_id, channel_name, raw_bit_depth)
+        cached_array = image_array_cache.get(cache_key)
+        if cached_array is not None:
+            return cached_array[0]
+
+        img_array, storage_bit_depth = await Image.get_array(record_id, channel_name)
+        raw_array = Record._bit_shift_to_raw(
             img_array=img_array,
             raw_bit_depth=raw_bit_depth,
         )
-        self.variable_data[channel_name] = variable_value
+        image_array_cache.put(cache_key, raw_array, storage_bit_depth)
+        return raw_array
 
     async def _get_waveform_variable(
         self,
         record_id: str,
         channel_name: str,
         x_units: str,
+        waveform_path: str | None = None,
     ) -> None:
         """Coroutine to fetch Waveform data."""
-        waveform = await Waveform.get_waveform(record_id, channel_name)
+        waveform = await Waveform.get_waveform(
+            record_id,
+            channel_name,
+            stored_path=waveform_path,
+        )
         self.raw_data[channel_name] = waveform
         self.variable_data[channel_name] = WaveformVariable(waveform, x_units=x_units)
 
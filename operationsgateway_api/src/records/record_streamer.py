@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+import logging
+from typing import Any, AsyncIterator
+
+import orjson
+
+from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.models import PartialRecordModel
+from operationsgateway_api.src.records.record_retriever import RecordRetriever
+
+log = logging.getLogger()
+
+
+class RecordStreamer:
+    """
+    Processes records from an async iterator (typically a MongoDB cursor) in a bounded
+    window and yields each one as a line of newline delimited JSON (NDJSON) as soon as
+    it is ready. Records are yielded in the same order as they are received, and at
+    most `window` records are held in memory at any one time, regardless of how many
+    records the query matches.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        records: AsyncIterator[PartialRecordModel],
+        window: int | None = None,
+        **retriever_kwargs: Any,
+    ) -> None:
+        """
+        Store the iterator of records and the arguments that should be passed to the
+        `RecordRetriever` created for each of them
+        """
+        self.records = records
+        self.window = window or Config.config.records.stream_window
+        self.retriever_kwargs = retriever_kwargs
+
+    @staticmethod
+    def accepts_ndjson(accept: str | None) -> bool:
+        """
+        Return whether the value of an `Accept` header requests an NDJSON response
+        """
+        if not accept:
+            return False
+
+        media_types = [value.split(";")[0].strip() for value in accept.split(",")]
+        return RecordStreamer.media_type in media_types
+
+    @staticmethod
+    def serialise(record: PartialRecordModel) -> bytes:
+        """
+        Convert a record into a single line of JSON. This mirrors how FastAPI serialises
+        the non-streamed response (unset fields excluded and NaN values as null)
+        """
+        record_dict = record.model_dump(mode="json", by_alias=True, exclude_unset=True)
+        return orjson.dumps(record_dict) + b"\n"
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Create a task to process each record as it is read from `self.records`. Once
+        `self.window` tasks are pending, the oldest is awaited and its record yielded
+        before the next record is read
+        """
+        pending: deque[tuple[PartialRecordModel, asyncio.Task]] = deque()
+        record_count = 0
+        try:
+            async for record in self.records:
+                record_retriever = RecordRetriever(
+                    record=record,
+                    **self.retriever_kwargs,
+                )
+                task = asyncio.create_task(record_retriever.process_record())
+                pending.append((record, task))
+                if len(pending) >= self.window:
+                    yield await self._next_line(pending)
+                    record_count += 1
+
+            while pending:
+                yield await self._next_line(pending)
+                record_count += 1
+        finally:
+            # If the client disconnects or processing fails, do not leave orphaned tasks
+            for _, task in pending:
+                task.cancel()
+
+            log.info("Streamed %d records", record_count)
+
+    @staticmethod
+    async def _next_line(
+        pending: deque[tuple[PartialRecordModel, asyncio.Task]],
+    ) -> bytes:
+        """
+        Wait for the oldest pending record to finish processing and serialise it
+        """
+        record, task = pending.popleft()
+        await task
+        return RecordStreamer.serialise(record)
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+from functools import lru_cache
+import logging
+import threading
+from typing import Any
+
+from operationsgateway_api.src.config import Config
+
+log = logging.getLogger()
+
+ThumbnailCacheKey = tuple[Any, ...]
+
+
+class ThumbnailCache:
+    """
+    A least recently used cache of thumbnails which have had false colour applied (or
+    been regenerated, for vectors), so repeated requests for the same page of records
+    don't need to decode, colour and encode each thumbnail again.
+
+    The cache is capped by the total size of the thumbnails stored in it, rather than
+    the number of entries. Keys include a hash of the thumbnail stored in the database,
+    so a record which is replaced (possibly by another instance of the API) won't
+    return a stale thumbnail, but entries for a record should still be invalidated when
+    it is updated or deleted to free up the space.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._thumbnails: OrderedDict[ThumbnailCacheKey, bytes] = OrderedDict()
+        self._record_keys: dict[str, set[ThumbnailCacheKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_key(
+        record_id: str,
+        channel_name: str,
+        stored_thumbnail: bytes | str,
+        *args: Any,
+    ) -> ThumbnailCacheKey:
+        """
+        Create a key from the channel, the thumbnail stored in the database and any
+        other arguments that affect the output (e.g. colour map and levels)
+        """
+        return (record_id, channel_name, hash(stored_thumbnail), *args)
+
+    def get(self, key: ThumbnailCacheKey) -> bytes | None:
+        """
+        Return the cached thumbnail for `key`, or `None` if it isn't cached
+        """
+        with self._lock:
+            thumbnail = self._thumbnails.get(key)
+            if thumbnail is None:
+                self.misses += 1
+                return None
+
+            self._thumbnails.move_to_end(key)
+            self.hits += 1
+            return thumbnail
+
+    def put(self, key: ThumbnailCacheKey, thumbnail: bytes) -> None:
+        """
+        Add a thumbnail to the cache, evicting the least recently used thumbnails if
+        the cache would go over `max_bytes`
+        """
+        thumbnail_bytes = len(thumbnail)
+        if thumbnail_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._thumbnails:
+                self._remove(key)
+
+            while self.current_bytes + thumbnail_bytes > self.max_bytes:
+                least_recent_key = next(iter(self._thumbnails))
+                self._remove(least_recent_key)
+                self.evictions += 1
+
+            self._thumbnails[key] = thumbnail
+            self._record_keys.setdefault(key[0], set()).add(key)
+            self.current_bytes += thumbnail_bytes
+
+    def invalidate_record(self, record_id: str) -> None:
+        """
+        Remove all cached thumbnails for a record
+        """
+        with self._lock:
+            keys = list(self._record_keys.get(record_id, ()))
+            for key in keys:
+                self._remove(key)
+
+        if keys:
+            log.debug("Invalidated %d cached thumbnails for %s", len(keys), record_id)
+
+    def clear(self) -> None:
+        """
+        Remove all thumbnails from the cache
+        """
+        with self._lock:
+            self._thumbnails.clear()
+            self._record_keys.clear()
+            self.current_bytes = 0
+
+    def get_cache_info(self) -> dict[str, int]:
+        """
+        Return the hit, miss and eviction counts, and the current size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._thumbnails),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: ThumbnailCacheKey) -> None:
+        """
+        Remove a single thumbnail. The lock must be held by the caller
+        """
+        thumbnail = self._thumbnails.pop(key)
+        self.current_bytes -= len(thumbnail)
+        record_keys = self._record_keys[key[0]]
+        record_keys.discard(key)
+        if not record_keys:
+            del self._record_keys[key[0]]
+
+
+@lru_cache
+def get_thumbnail_cache() -> ThumbnailCache:
+    """
+    Returns:
+        ThumbnailCache: Cache of false coloured thumbnails, shared between requests.
+    """
+    return ThumbnailCache(Config.config.records.thumbnail_cache_max_bytes)
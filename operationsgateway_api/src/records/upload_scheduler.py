@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.cpu_executor import get_cpu_executor
+from operationsgateway_api.src.records.float_image import FloatImage
+from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.image_abc import ImageABC
+from operationsgateway_api.src.records.record import Record
+from operationsgateway_api.src.records.vector import Vector
+from operationsgateway_api.src.records.waveform import Waveform
+
+log = logging.getLogger()
+
+ChannelObject = Image | FloatImage | Waveform | Vector
+
+
+class UploadScheduler:
+    """
+    Creates thumbnails for, and uploads, all of the channel objects (images, float
+    images, waveforms and vectors) of a record concurrently.
+
+    Channel objects are taken from the iterable passed to `upload()` by a fixed number
+    of workers (`ingest.max_channels_in_memory`), each of which thumbnails and uploads
+    one object before taking the next. If the iterable creates the objects as they're
+    taken (e.g. reading them from a HDF file), only that many are held in memory at
+    any one time.
+
+    The number of uploads to Echo in progress at any one time is limited by a
+    semaphore, and failed uploads are retried with an exponential backoff. Thumbnails
+    are created in the CPU executor at the same time as the object is uploaded, so the
+    time taken is roughly that of the slowest upload rather than the sum of them all.
+    """
+
+    def __init__(self, record: Record) -> None:
+        echo_config = Config.config.echo
+        self.record = record
+        self.max_retries = echo_config.upload_max_retries
+        self.retry_backoff_seconds = echo_config.upload_retry_backoff_seconds
+        self.semaphore = asyncio.Semaphore(echo_config.upload_concurrency)
+        self.workers = Config.config.ingest.max_channels_in_memory
+        self.uploads = 0
+        self.retries = 0
+
+    async def upload(self, channel_objects: Iterable[ChannelObject]) -> list[str]:
+        """
+        Create thumbnails for and upload each of `channel_objects`, storing the
+        thumbnails in the record. Returns the names of the channels which failed to
+        upload after all retries, in the order the objects were given
+        """
+        start_time = time.perf_counter()
+        channel_object_iterator = enumerate(channel_objects)
+        channel_object_count = 0
+        failed_uploads = {}
+
+        async def worker() -> None:
+            nonlocal channel_object_count
+            # The iterator is shared, so each object is taken by exactly one worker
+            for i, channel_object in channel_object_iterator:
+                channel_object_count += 1
+                failed_upload = await self._thumbnail_and_upload(channel_object)
+                if failed_upload:
+                    failed_uploads[i] = failed_upload
+
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(self.workers):
+                task_group.create_task(worker())
+
+        log.info(
+            "Uploaded %d channel objects (%d retries, %d failed) in %.3fs",
+            channel_object_count,
+            self.retries,
+            len(failed_uploads),
+            time.perf_counter() - start_time,
+        )
+        return [failed_uploads[i] for i in sorted(failed_uploads)]
+
+    async def _thumbnail_and_upload(self, channel_object: ChannelObject) -> str | None:
+        """
+        Create the thumbnail for a channel object in the CPU executor while it's
+        uploaded to Echo. Returns the channel name if the upload fails
+        """
+        thumbnail, failed_upload = await asyncio.gather(
+            get_cpu_executor().run(channel_object.create_thumbnail),
+            self._upload_with_retries(channel_object),
+        )
+        channel_object.thumbnail = thumbnail
+        self.record.store_thumbnail(channel_object)  # in the record not echo
+        return failed_upload
+
+    async def _upload_with_retries(self, channel_object: ChannelObject) -> str | None:
+        """
+        Upload a channel object, retrying (after waiting for an increasing amount of
+        time) if it fails. Returns the channel name if every attempt fails
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                backoff = self.retry_backoff_seconds * 2 ** (attempt - 1)
+                log.warning(
+                    "Retrying upload of %s in %ss (attempt %d of %d)",
+                    channel_object.get_channel_name_from_path(),
+                    backoff,
+                    attempt + 1,
+                    self.max_retries + 1,
+                )
+                self.retries += 1
+                await asyncio.sleep(backoff)
+
+            async with self.semaphore:
+                self.uploads += 1
+                failed_upload = await UploadScheduler._upload(channel_object)
+
+            if failed_upload is None:
+                return None
+
+        return failed_upload
+
+    @staticmethod
+    async def _upload(channel_object: ChannelObject) -> str | None:
+        """
+        Upload a channel object once. Each type handles (and logs) an `EchoS3Error`,
+        returning the channel name if the upload fails
+        """
+        if isinstance(channel_object, ImageABC):
+            return await type(channel_object).upload_image(channel_object)
+        else:
+            return await channel_object.insert()
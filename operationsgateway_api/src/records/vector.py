@@ -3,14 +3,14 @@ from io import BytesIO
 import json
 import logging
 
-from matplotlib import pyplot as plt
-
 from operationsgateway_api.src.auth.jwt_handler import JwtHandler
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.exceptions import EchoS3Error
 from operationsgateway_api.src.models import VectorModel
+from operationsgateway_api.src.records.binary_array import BinaryArray
 from operationsgateway_api.src.records.channel_object_abc import ChannelObjectABC
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
+from operationsgateway_api.src.records.plot_renderer import PlotRenderer
 from operationsgateway_api.src.users.preferences import UserPreferences
 
 log = logging.getLogger()
@@ -19,24 +19,89 @@ log = logging.getLogger()
 class Vector(ChannelObjectABC):
     echo_prefix = "vectors"
     echo_extension = "json"
+    binary_echo_extension = "bin"
+    path_field = "vector_path"
 
     def __init__(self, vector: VectorModel) -> None:
         self.vector = vector
         self.thumbnail = None
 
+    @classmethod
+    def get_echo_extensions(cls) -> list[str]:
+        """
+        Vectors can be stored as JSON or `BinaryArray`s, with new vectors stored in the
+        format set in the config.
+        """
+        if Config.config.vectors.storage_format == "binary":
+            return [cls.binary_echo_extension, cls.echo_extension]
+        else:
+            return [cls.echo_extension, cls.binary_echo_extension]
+
     @staticmethod
-    async def get_vector(record_id: str, channel_name: str) -> VectorModel:
+    async def get_vector(
+        record_id: str,
+        channel_name: str,
+        skip: int | None = None,
+        limit: int | None = None,
+        stored_path: str | None = None,
+    ) -> VectorModel:
         """
         Get vector data from storage and return it as a VectorModel. If no vector can be
         found, an Exception will be raised.
+
+        As for thumbnails, only the elements from `skip` up to but not including `limit`
+        are returned. For binary vectors, only these elements are downloaded.
+
+        The vector is read using the format and layout of `stored_path`, the path of the
+        channel in the database, which is looked up if it isn't given.
         """
         log.info("Retrieving vector and returning a VectorModel")
-        bytes_io = await Vector.get_bytes(
-            record_id=record_id,
-            channel_name=channel_name,
-        )
-        vector_dict = json.loads(bytes_io.decode())
-        return VectorModel(**vector_dict)
+        if stored_path is None:
+            stored_path = await Vector.get_stored_path(record_id, channel_name)
+        echo_locations = Vector.get_echo_locations(record_id, channel_name, stored_path)
+        ranged = skip is not None or limit is not None
+        for echo_extension, use_subdirectories in echo_locations:
+            # Only check the database if the vector can't be found with any extension
+            handle_missing = echo_extension == echo_locations[-1][0]
+            try:
+                if ranged and echo_extension == Vector.binary_echo_extension:
+                    rows = await Vector.get_binary_array(
+                        record_id=record_id,
+                        channel_name=channel_name,
+                        echo_extension=echo_extension,
+                        columns=1,
+                        start=skip,
+                        stop=limit,
+                        handle_missing=handle_missing,
+                        use_subdirectories=use_subdirectories,
+                    )
+                    return VectorModel(data=rows[:, 0])
+                else:
+                    vector_bytes = await Vector.get_bytes(
+                        record_id=record_id,
+                        channel_name=channel_name,
+                        use_subdirectories=use_subdirectories,
+                        echo_extension=echo_extension,
+                        handle_missing=handle_missing,
+                    )
+                    vector_model = Vector.from_bytes(vector_bytes)
+                    if ranged:
+                        vector_model.data = vector_model.data[skip:limit]
+                    return vector_model
+            except EchoS3Error:
+                if handle_missing:
+                    raise
+
+    @staticmethod
+    def from_bytes(vector_bytes: bytes) -> VectorModel:
+        """
+        Decode a vector stored as either a `BinaryArray` or JSON, detecting the format
+        from the bytes themselves.
+        """
+        if BinaryArray.is_binary_array(vector_bytes):
+            return VectorModel(data=BinaryArray.decode(vector_bytes)[:, 0])
+        else:
+            return VectorModel(**json.loads(vector_bytes.decode()))
 
     @staticmethod
     async def get_skip_limit(access_token: str) -> tuple[int | None, int | None]:
@@ -64,7 +129,7 @@ class Vector(ChannelObjectABC):
         """
         Get the channel name from the storage path.
         """
-        return self.vector.path.split("/")[-1].split(".json")[0]
+        return self.vector.path.split("/")[-1].rsplit(".", 1)[0]
 
     async def insert(self) -> str | None:
         """
@@ -74,7 +139,10 @@ class Vector(ChannelObjectABC):
         log.info("Storing vector: %s", self.vector.path)
         echo_interface = get_echo_interface()
         try:
-            bytes_io = BytesIO(self.vector.model_dump_json(indent=2).encode())
+            if self.vector.path.endswith(f".{Vector.binary_echo_extension}"):
+                bytes_io = BytesIO(BinaryArray.encode(self.vector.data))
+            else:
+                bytes_io = BytesIO(self.vector.model_dump_json(indent=2).encode())
             full_path = Vector.get_full_path(self.vector.path)
             await echo_interface.upload_file_object(bytes_io, full_path)
             return  # Successful upload
@@ -88,31 +156,16 @@ class Vector(ChannelObjectABC):
         self,
         skip: int | None = None,
         limit: int | None = None,
-    ) -> None:
-        """
-        Create a thumbnail of the vector data and store it in this object.
-        """
-        data = self.vector.data[skip:limit]
-        with BytesIO() as bytes_io:
-            thumbnail_size = Config.config.vectors.thumbnail_size
-            # 1 in figsize = 100px
-            plt.figure(figsize=(thumbnail_size[0] / 100, thumbnail_size[1] / 100))
-            plt.xticks([])
-            plt.yticks([])
-            plt.bar(range(len(data)), data)
-            plt.axis("off")
-            plt.axhline(c="black")
-            plt.box(False)
-            plt.savefig(
-                bytes_io,
-                format="PNG",
-                bbox_inches="tight",
-                pad_inches=0,
-                dpi=130,
-            )
-            plt.clf()
-            plt.close()
-            self.thumbnail = base64.b64encode(bytes_io.getvalue())
+    ) -> bytes:
+        """
+        Create a thumbnail of the vector data, store it in this object and return it.
+        """
+        thumbnail = PlotRenderer.render_bar_thumbnail(
+            self.vector.data[skip:limit],
+            Config.config.vectors.thumbnail_size,
+        )
+        self.thumbnail = base64.b64encode(thumbnail)
+        return self.thumbnail
 
     def get_fullsize_png(self, labels: list[str] | None) -> bytes:
         """
@@ -121,15 +174,4 @@ class Vector(ChannelObjectABC):
         if not labels:
             labels = range(len(self.vector.data))
 
-        with BytesIO() as bytes_io:
-            plt.figure(figsize=(8, 6))
-            plt.bar(labels, self.vector.data)
-            plt.savefig(
-                bytes_io,
-                format="PNG",
-                bbox_inches="tight",
-                pad_inches=0.1,
-                dpi=130,
-            )
-            plt.clf()
-            return bytes_io.getvalue()
+        return PlotRenderer.render_bar(labels, self.vector.data)
@@ -4,16 +4,14 @@ import json
 import logging
 from typing import Optional
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt  # noqa: I202
-
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.exceptions import EchoS3Error
 from operationsgateway_api.src.models import WaveformModel
+from operationsgateway_api.src.records.binary_array import BinaryArray
 from operationsgateway_api.src.records.channel_object_abc import ChannelObjectABC
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
+from operationsgateway_api.src.records.plot_renderer import PlotRenderer
+from operationsgateway_api.src.single_flight import get_single_flight
 
 log = logging.getLogger()
 
@@ -21,12 +19,25 @@ log = logging.getLogger()
 class Waveform(ChannelObjectABC):
     echo_prefix = "waveforms"
     echo_extension = "json"
+    binary_echo_extension = "bin"
+    path_field = "waveform_path"
 
     def __init__(self, waveform: WaveformModel) -> None:
         self.waveform = waveform
         self.thumbnail = None
         self.is_stored = False
 
+    @classmethod
+    def get_echo_extensions(cls) -> list[str]:
+        """
+        Waveforms can be stored as JSON or `BinaryArray`s, with new waveforms stored in
+        the format set in the config
+        """
+        if Config.config.waveforms.storage_format == "binary":
+            return [cls.binary_echo_extension, cls.echo_extension]
+        else:
+            return [cls.echo_extension, cls.binary_echo_extension]
+
     def to_json(self):
         """
         Use `self.waveform` and return a JSON file stored in a BytesIO object
@@ -36,16 +47,26 @@ class Waveform(ChannelObjectABC):
         b.seek(0)
         return b
 
+    def to_binary(self) -> BytesIO:
+        """
+        Use `self.waveform` and return a `BinaryArray` stored in a BytesIO object
+        """
+        return BytesIO(BinaryArray.encode(self.waveform.x, self.waveform.y))
+
     async def insert(self) -> Optional[str]:
         """
-        Store the waveform from this object in Echo
+        Store the waveform from this object in Echo, in the format given by the
+        extension of its path
         """
         log.info("Storing waveform: %s", self.waveform.path)
-        bytes_json = self.to_json()
+        if self.waveform.path.endswith(f".{Waveform.binary_echo_extension}"):
+            waveform_bytes = self.to_binary()
+        else:
+            waveform_bytes = self.to_json()
         echo_interface = get_echo_interface()
         try:
             await echo_interface.upload_file_object(
-                bytes_json,
+                waveform_bytes,
                 Waveform.get_full_path(self.waveform.path),
             )
             return None  # Successful upload
@@ -58,21 +79,30 @@ class Waveform(ChannelObjectABC):
             )
             return channel_name
 
-    def create_thumbnail(self) -> None:
+    def create_thumbnail(self) -> bytes:
         """
-        Create a thumbnail of the waveform data and store it in this object
+        Create a thumbnail of the waveform data, store it in this object and return it
         """
-        with BytesIO() as waveform_image_buffer:
-            self._create_thumbnail_plot(waveform_image_buffer)
-            self.thumbnail = base64.b64encode(waveform_image_buffer.getvalue())
+        thumbnail = PlotRenderer.render_line_thumbnail(
+            self.waveform.x,
+            self.waveform.y,
+            Config.config.waveforms.thumbnail_size,
+            # Line width is configurable - thickness of line in the waveform
+            Config.config.waveforms.line_width,
+        )
+        self.thumbnail = base64.b64encode(thumbnail)
+        return self.thumbnail
 
     def get_fullsize_png(self, x_label, y_label) -> bytes:
         """
         Create a full size of the waveform data and return it
         """
-        with BytesIO() as waveform_image_buffer:
-            self._create_fullsize_plot(waveform_image_buffer, x_label, y_label)
-            return waveform_image_buffer.getvalue()
+        return PlotRenderer.render_line(
+            self.waveform.x,
+            self.waveform.y,
+            x_label,
+            y_label,
+        )
 
     def get_channel_name_from_path(self) -> str:
         """
@@ -80,66 +110,105 @@ class Waveform(ChannelObjectABC):
         """
         return self.waveform.path.split("/")[-1].split(".")[0]
 
-    def _create_thumbnail_plot(self, buffer) -> None:
-        """
-        Using Matplotlib, create a thumbnail sized plot of the waveform data and save
-        it to a bytes IO object provided as a parameter to this function
+    @staticmethod
+    async def get_waveform(
+        record_id: str,
+        channel_name: str,
+        start: int | None = None,
+        stop: int | None = None,
+        stored_path: str | None = None,
+    ) -> WaveformModel:
         """
-        thumbnail_size = Config.config.waveforms.thumbnail_size
-        # 1 in figsize = 100px
-        plt.figure(figsize=(thumbnail_size[0] / 100, thumbnail_size[1] / 100))
-        # Removes the notches on the plot that provide a scale
-        plt.xticks([])
-        plt.yticks([])
-        # Line width is configurable - thickness of line in the waveform
-        plt.plot(
-            self.waveform.x,
-            self.waveform.y,
-            linewidth=Config.config.waveforms.line_width,
+        Given a waveform path, find the waveform from Echo. This function assumes that
+        the waveform should exist; if no waveform can be found, an Exception will
+        be raised
+
+        The waveform is read using the format and layout of `stored_path`, the path of
+        the channel in the database, which is looked up if it isn't given
+
+        Only the points from `start` up to but not including `stop` are returned. For
+        binary waveforms, only these points are downloaded. Concurrent requests for the
+        same points of a waveform share a single download and decode, so the returned
+        model must not be modified
+        """
+        return await get_single_flight("waveform_decode").run(
+            (record_id, channel_name, start, stop),
+            Waveform._get_waveform,
+            record_id,
+            channel_name,
+            start,
+            stop,
+            stored_path,
         )
-        # Disables all axis decorations
-        plt.axis("off")
-        # Removes the frame around the plot
-        plt.box(False)
-
-        # Setting bbox_inches="tight" and pad_inches=0 removes padding around figure
-        # to make best use of the limited pixels available in a thumbnail. Because of
-        # this, dpi has been set to 130 to offset the tight bbox removing white space
-        # around the figure and there keeps the thumbnail size calculation correct. The
-        # default dpi is 100 but that will result in thumbnails smaller than the
-        # configuration setting, hence the value of 130
-        plt.savefig(buffer, format="PNG", bbox_inches="tight", pad_inches=0, dpi=130)
-        # Flushes the plot to remove data from previously ingested waveforms
-        plt.clf()
-        plt.close()
-
-    def _create_fullsize_plot(self, buffer, x_label, y_label) -> None:
-        """
-        Using Matplotlib, create a full sized plot of the waveform data and save it to
-        a bytes IO object provided as a parameter to this function
-        """
-        plt.figure(figsize=(8, 6))
-        plt.plot(
-            self.waveform.x,
-            self.waveform.y,
+
+    @staticmethod
+    async def _get_waveform(
+        record_id: str,
+        channel_name: str,
+        start: int | None,
+        stop: int | None,
+        stored_path: str | None,
+    ) -> WaveformModel:
+        if stored_path is None:
+            stored_path = await Waveform.get_stored_path(record_id, channel_name)
+        echo_locations = Waveform.get_echo_locations(
+            record_id,
+            channel_name,
+            stored_path,
         )
-        plt.xlabel(x_label)
-        plt.ylabel(y_label)
+        ranged = start is not None or stop is not None
+        for echo_extension, use_subdirectories in echo_locations:
+            # Only check the database if the waveform can't be found with any extension
+            handle_missing = echo_extension == echo_locations[-1][0]
+            try:
+                if ranged and echo_extension == Waveform.binary_echo_extension:
+                    rows = await Waveform.get_binary_array(
+                        record_id=record_id,
+                        channel_name=channel_name,
+                        echo_extension=echo_extension,
+                        columns=2,
+                        start=start,
+                        stop=stop,
+                        handle_missing=handle_missing,
+                        use_subdirectories=use_subdirectories,
+                    )
+                    return WaveformModel(x=rows[:, 0], y=rows[:, 1])
+                else:
+                    waveform_bytes = await Waveform.get_bytes(
+                        record_id=record_id,
+                        channel_name=channel_name,
+                        use_subdirectories=use_subdirectories,
+                        echo_extension=echo_extension,
+                        handle_missing=handle_missing,
+                    )
+                    waveform = Waveform.from_bytes(waveform_bytes)
+                    return Waveform.slice_waveform(waveform, start, stop)
+            except EchoS3Error:
+                if handle_missing:
+                    raise
 
-        plt.savefig(buffer, format="PNG", bbox_inches="tight", pad_inches=0.1, dpi=130)
-        # Flushes the plot to remove data from previously ingested waveforms
-        plt.clf()
+    @staticmethod
+    def from_bytes(waveform_bytes: bytes) -> WaveformModel:
+        """
+        Decode a waveform stored as either a `BinaryArray` or JSON, detecting the format
+        from the bytes themselves
+        """
+        if BinaryArray.is_binary_array(waveform_bytes):
+            rows = BinaryArray.decode(waveform_bytes)
+            return WaveformModel(x=rows[:, 0], y=rows[:, 1])
+        else:
+            return WaveformModel(**json.loads(waveform_bytes.decode()))
 
     @staticmethod
-    async def get_waveform(record_id: str, channel_name: str) -> WaveformModel:
+    def slice_waveform(
+        waveform: WaveformModel,
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> WaveformModel:
         """
-        Given a waveform path, find the waveform from Echo. This function assumes that
-        the waveform should exist; if no waveform can be found, an Exception will
-        be raised
+        Return the points of `waveform` from `start` up to but not including `stop`
         """
-        waveform_bytes = await Waveform.get_bytes(
-            record_id=record_id,
-            channel_name=channel_name,
-        )
-        waveform_data = json.loads(waveform_bytes.decode())
-        return WaveformModel(**waveform_data)
+        if start is None and stop is None:
+            return waveform
+
+        return WaveformModel(x=waveform.x[start:stop], y=waveform.y[start:stop])
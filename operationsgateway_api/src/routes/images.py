@@ -79,6 +79,15 @@ async def get_full_image(
         None,
         description="Functions to evaluate on the record data being returned",
     ),
+    max_size: Optional[int] = Query(
+        None,
+        description=(
+            "The size in pixels the image will be displayed at. If given, a smaller "
+            "copy of the image which is at least this size along its longest side may "
+            "be returned instead of the full-size image"
+        ),
+        ge=1,
+    ),
 ):
     """
     This endpoint can be used to retrieve a full-size image by specifying the shot
@@ -86,6 +95,11 @@ async def get_full_image(
     file, by default with false colour applied or optionally as the original image by
     setting 'original_image' to True.
 
+    If `max_size` is given and smaller copies of the image were stored when it was
+    ingested, the smallest copy that is at least `max_size` pixels along its longest
+    side is returned. This is not applied to the original image or to images generated
+    by `functions`.
+
     If `channel_name` matches one of the entries in `functions`, then that will be
     evaluated to generate the returned image.
     """
@@ -102,6 +116,7 @@ async def get_full_image(
         limit_bit_depth=limit_bit_depth,
         original_image=original_image,
         functions=functions,
+        max_size=max_size,
     )
     return Response(image_bytes, media_type="image/png")
 
@@ -263,6 +278,7 @@ async def get_image_bytes(
     limit_bit_depth: int,
     original_image: bool,
     functions: "list[dict]",
+    max_size: int | None = None,
 ) -> bytes:
     """Get the bytes for the requested image (possibly as the output from
     one of the defined `functions`).
@@ -291,6 +307,7 @@ async def get_image_bytes(
         upper_level=upper_level,
         limit_bit_depth=limit_bit_depth,
         colourmap_name=colourmap_name,
+        max_size=max_size,
     )
 
 
@@ -324,14 +341,19 @@ async def get_image_array(
                 await record_retriever.process_functions()
                 return record_retriever.record.channels[channel_name].variable_value
 
-    image_bytes = await Image.get_image(
-        record_id=record_id,
-        channel_name=channel_name,
-        original_image=original_image,
-        lower_level=lower_level,
-        upper_level=upper_level,
-        limit_bit_depth=limit_bit_depth,
-        colourmap_name=colourmap_name,
-    )
-    image = PILImage.open(BytesIO(image_bytes))
-    return np.array(image)
+    if not original_image:
+        image_bytes = await Image.get_image(
+            record_id=record_id,
+            channel_name=channel_name,
+            original_image=original_image,
+            lower_level=lower_level,
+            upper_level=upper_level,
+            limit_bit_depth=limit_bit_depth,
+            colourmap_name=colourmap_name,
+        )
+        image = PILImage.open(BytesIO(image_bytes))
+        return np.array(image)
+
+    # The decoded image is cached, and read-only as it's shared between requests
+    image_array, _ = await Image.get_array(record_id, channel_name)
+    return image_array
@@ -1,25 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
 import ctypes
 import logging
+import os
+from pathlib import Path
+import shutil
+from tempfile import NamedTemporaryFile
+import time
+from typing import Any, AsyncIterator, Iterator
 
 from fastapi import APIRouter, Depends, status, UploadFile
 from fastapi.responses import JSONResponse
+from pymongo.errors import BulkWriteError
 from typing_extensions import Annotated
 
 from operationsgateway_api.src.auth.authorisation import authorise_route
 from operationsgateway_api.src.backup.x_root_d_client import XRootDClient
 from operationsgateway_api.src.channels.channel_manifest import ChannelManifest
+from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.error_handling import endpoint_error_handling
-from operationsgateway_api.src.models import SubmitHDFResponse
+from operationsgateway_api.src.exceptions import ApiError
+from operationsgateway_api.src.models import (
+    ChannelManifestModel,
+    FloatImageModel,
+    ImageModel,
+    IngestJobModel,
+    RecordModel,
+    SubmitHDFBatchResponse,
+    SubmitHDFResponse,
+    VectorModel,
+    WaveformModel,
+)
 from operationsgateway_api.src.records.float_image import FloatImage
 from operationsgateway_api.src.records.image import Image
 from operationsgateway_api.src.records.ingestion.channel_checks import ChannelChecks
 from operationsgateway_api.src.records.ingestion.file_checks import FileChecks
 from operationsgateway_api.src.records.ingestion.hdf_handler import HDFDataHandler
+from operationsgateway_api.src.records.ingestion.ingest_queue import (
+    get_ingest_queue,
+    IngestQueue,
+)
 from operationsgateway_api.src.records.ingestion.partial_import_checks import (
     PartialImportChecks,
 )
 from operationsgateway_api.src.records.ingestion.record_checks import RecordChecks
 from operationsgateway_api.src.records.record import Record
+from operationsgateway_api.src.records.upload_scheduler import (
+    ChannelObject,
+    UploadScheduler,
+)
 from operationsgateway_api.src.records.vector import Vector
 from operationsgateway_api.src.records.waveform import Waveform
 from operationsgateway_api.src.routes.ingest_data_example_responses import (
@@ -29,7 +58,16 @@ from operationsgateway_api.src.routes.ingest_data_example_responses import (
 
 log = logging.getLogger()
 router = APIRouter()
+SPILL_FILE_MODE = 0o644
 AuthoriseRoute = Annotated[str, Depends(authorise_route)]
+ExtractedData = tuple[
+    RecordModel,
+    list[WaveformModel],
+    list[ImageModel],
+    list[FloatImageModel],
+    list[VectorModel],
+    list[dict[str, str]],
+]
 
 
 def _update_checker_response(
@@ -45,59 +83,98 @@ def _update_checker_response(
     checker_response["rejected_channels"][channel].append("Upload to Echo failed")
 
 
-async def _insert(
-    entity: Waveform | Vector,
-    failed_uploads: list[str],
-    record: Record,
-) -> None:
-    failed_upload = await entity.insert()  # Returns channel name if failed
-    if failed_upload:
-        # if the upload to echo fails, don't process the any further
-        return failed_uploads.append(failed_upload)
+def _copy_to_spill_file(file: UploadFile) -> Path:
+    with NamedTemporaryFile(
+        dir=Config.config.ingest.spill_directory,
+        suffix=".h5",
+        delete=False,
+    ) as temporary_file:
+        # NamedTemporaryFile creates the file readable only by its owner, but it's
+        # hardlinked into the backup cache so needs the usual permissions
+        os.fchmod(temporary_file.fileno(), SPILL_FILE_MODE)
+        file.file.seek(0)
+        shutil.copyfileobj(file.file, temporary_file)
+    return Path(temporary_file.name)
 
-    entity.create_thumbnail()
-    record.store_thumbnail(entity)  # in the record not echo
 
+async def _spill_file(file: UploadFile) -> Path:
+    """
+    Copy an uploaded file to a temporary file on local disk (in
+    `ingest.spill_directory`) and return its path. The copy is done in a thread so the
+    event loop isn't blocked by large files. The caller is responsible for deleting the
+    file
+    """
+    return await asyncio.to_thread(_copy_to_spill_file, file)
 
-@router.post(
-    "/submit/hdf",
-    summary="Submit a HDF file for ingestion into MongoDB",
-    response_description="ID of the record document that has been inserted/updated",
-    tags=["Ingestion"],
-    response_model=SubmitHDFResponse,
-    responses={
-        201: {
-            "model": SubmitHDFResponse,
-            "description": "Created and inserted new record with warning",
-            "content": {
-                "application/json": {"example": example_created_response_with_warning},
-            },
-        },
-        200: {
-            "model": SubmitHDFResponse,
-            "description": "Updated existing record",
-            "content": {"application/json": {"example": example_updated_response}},
-        },
-    },
-)
-@endpoint_error_handling
-async def submit_hdf(
-    file: UploadFile,
-    access_token: AuthoriseRoute,
-):
+
+@asynccontextmanager
+async def _spill_to_disk(files: list[UploadFile]) -> AsyncIterator[list[Path]]:
     """
-    This endpoint accepts a HDF file, processes it and stores the data in MongoDB (with
-    images being stored on disk). The HDF file should follow the format specified for
-    the OperationsGateway project. Example files can be obtained via
-    https://github.com/CentralLaserFacility/OG-HDF5, when you provide this tool with
-    exported ecat data
+    Copy each uploaded file to a temporary file on local disk, yielding their paths and
+    deleting them on exit. HDF files are then opened by h5py from these paths, so
+    contiguous datasets can be memory mapped, and are hardlinked into the backup cache
+    rather than read into memory again
     """
+    hdf_paths = []
+    try:
+        for file in files:
+            hdf_paths.append(await _spill_file(file))
+        yield hdf_paths
+    finally:
+        for hdf_path in hdf_paths:
+            hdf_path.unlink(missing_ok=True)
 
-    log.info("Submitting CLF data in HDF file to be processed then stored in MongoDB")
-    log.debug("Filename: %s, Content: %s", file.filename, file.content_type)
 
-    warnings = []
-    hdf_handler = HDFDataHandler(file.file)
+async def _find_stored_record(record: Record) -> RecordModel | None:
+    """
+    A record is deemed existing in the db if the timestamp or shotnum exists
+    """
+    stored_record = await record.find_existing_record()
+    if stored_record is None and record.record.metadata.shotnum is not None:
+        stored_record = await record.find_record_by_shotnum()
+
+    return stored_record
+
+
+def _load_channel_objects(
+    hdf_handler: HDFDataHandler,
+    waveforms: list[WaveformModel],
+    images: list[ImageModel],
+    float_images: list[FloatImageModel],
+    vectors: list[VectorModel],
+) -> Iterator[ChannelObject]:
+    """
+    Create the channel objects to upload, reading the data of each from the HDF file
+    only when it's needed, so that objects which have been uploaded can be released
+    before the rest are read
+    """
+    for channel_object_type, models in (
+        (Waveform, waveforms),
+        (Image, images),
+        (FloatImage, float_images),
+        (Vector, vectors),
+    ):
+        for model in models:
+            yield channel_object_type(hdf_handler.load_model(model))
+
+
+async def _check_and_upload(
+    hdf_handler: HDFDataHandler,
+    extracted_data: ExtractedData,
+    stored_record: RecordModel | None,
+    manifest: ChannelManifestModel,
+) -> tuple[Record, dict[str, Any], str | None]:
+    """
+    Check the data extracted from a HDF file (against the manifest and the stored
+    record, if there is one), then upload the accepted channel objects to Echo. If
+    `hdf_handler` extracted the data lazily, the checks are run against placeholders
+    with the shape and dtype of each dataset, and the datasets are read as they're
+    uploaded.
+
+    Returns the record to be inserted or merged into the stored record, the response
+    from the checks and, if there's a stored record, whether to accept the record as a
+    merge or as new
+    """
     (
         record_data,
         waveforms,
@@ -105,14 +182,10 @@ async def submit_hdf(
         float_images,
         vectors,
         internal_failed_channel,
-    ) = await hdf_handler.extract_data()
-
-    record_original = Record(record_data)
-    # a record is deemed existing in the db if the timestamp or shotnum exists
-    stored_record = await record_original.find_existing_record()
-    if stored_record is None and record_original.record.metadata.shotnum is not None:
-        stored_record = await record_original.find_record_by_shotnum()
+    ) = extracted_data
 
+    start_time = time.perf_counter()
+    warnings = []
     file_checker = FileChecks(record_data)
     warning = file_checker.epac_data_version_checks()
     if warning:
@@ -130,10 +203,10 @@ async def submit_hdf(
         ingested_vectors=vectors,
         internal_failed_channels=internal_failed_channel,
     )
-    manifest = await ChannelManifest.get_most_recent_manifest()
     channel_checker.set_channels(manifest)
     channel_dict = await channel_checker.channel_checks()
 
+    accept_type = None
     if stored_record:
         partial_import_checker = PartialImportChecks(record_data, stored_record)
         accept_type = partial_import_checker.metadata_checks()
@@ -142,6 +215,12 @@ async def submit_hdf(
         checker_response = channel_dict
 
     checker_response["warnings"] = warnings
+    log.info(
+        "Checked record %s against the manifest%s, took %.3fs",
+        record_data.id_,
+        " and stored record" if stored_record else "",
+        time.perf_counter() - start_time,
+    )
 
     record_data, images, float_images, waveforms, vectors = HDFDataHandler._update_data(
         checker_response,
@@ -154,34 +233,35 @@ async def submit_hdf(
 
     record = Record(record_data)
 
-    log.debug("Processing waveforms")
-    failed_waveform_uploads = []
-    for w in waveforms:
-        await _insert(Waveform(w), failed_waveform_uploads, record)
-
-    failed_image_uploads = await record.concurrent_upload(images, Image)
-    failed_float_image_uploads = await record.concurrent_upload(
+    log.debug("Processing waveforms, images, float images and vectors")
+    channel_objects = _load_channel_objects(
+        hdf_handler,
+        waveforms,
+        images,
         float_images,
-        FloatImage,
+        vectors,
     )
+    all_failed_upload_channels = await UploadScheduler(record).upload(channel_objects)
 
-    log.debug("Processing vectors")
-    failed_vector_uploads = []
-    for vector_model in vectors:
-        await _insert(Vector(vector_model), failed_vector_uploads, record)
-
-    # Combine failed channels from waveforms and images and remove them from the record
+    # Remove channels which failed to upload from the record
     # Update the channel checker to reflect failed uploads
-    all_failed_upload_channels = (
-        failed_waveform_uploads
-        + failed_image_uploads
-        + failed_float_image_uploads
-        + failed_vector_uploads
-    )
     for channel in all_failed_upload_channels:
         record.remove_channel(channel)
         _update_checker_response(checker_response, channel)
 
+    return record, checker_response, accept_type
+
+
+async def _store_record(
+    record: Record,
+    stored_record: RecordModel | None,
+    accept_type: str | None,
+    hdf_path: Path,
+) -> tuple[int, str]:
+    """
+    Merge `record` into the stored record, or insert it as a new record, and cache the
+    file it was extracted from. Returns the status code and message for the response
+    """
     if stored_record and accept_type == "accept_merge":
         log.debug(
             "Record matching ID %s already exists in the database, updating existing"
@@ -190,41 +270,431 @@ async def submit_hdf(
         )
         record.record.version = stored_record.version + 1
         await record.update()
-        XRootDClient.cache_hdf(record_model=record.record, buffer=file.file)
-
-        content = {
-            "message": f"Updated {stored_record.id_}",
-            "response": checker_response,
-        }
-        ctypes.CDLL("libc.so.6").malloc_trim(0)
-        return content
+        XRootDClient.cache_hdf(record_model=record.record, hdf_path=hdf_path)
+        return status.HTTP_200_OK, f"Updated {stored_record.id_}"
     else:
         log.debug("Inserting new record into MongoDB")
         await record.insert()
-        XRootDClient.cache_hdf(record_model=record.record, buffer=file.file)
-        record_id = record.record.id_
-        content = {
-            "message": f"Added as {record_id}",
-            "response": checker_response,
-        }
-
-        # Emptying variables to save memory
-        images = []
-        float_images = []
-        hdf_handler.images = []
-        hdf_handler.float_images = []
-        hdf_handler.vectors = []
-        hdf_handler = None
-        channel_checker = None
-        waveforms = None
-        ctypes.CDLL("libc.so.6").malloc_trim(0)
+        XRootDClient.cache_hdf(record_model=record.record, hdf_path=hdf_path)
+        return status.HTTP_201_CREATED, f"Added as {record.record.id_}"
+
+
+def _get_error_response(
+    filename: str | None,
+    exc: BaseException,
+) -> SubmitHDFBatchResponse:
+    """
+    Convert an exception raised while ingesting one file of a batch to the response
+    for that file, in the same way `endpoint_error_handling` would for a single file
+    """
+    if isinstance(exc, ApiError):
+        log.error("Error ingesting %s: %s", filename, exc.args[0])
+        return SubmitHDFBatchResponse(
+            filename=filename,
+            status_code=exc.status_code,
+            message=exc.args[0],
+        )
+    else:
+        log.error("Error ingesting %s", filename, exc_info=exc)
+        return SubmitHDFBatchResponse(
+            filename=filename,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            message="Unknown error",
+        )
+
+
+def _get_failed_inserts(
+    file_indexes: list[int],
+    exc: ApiError,
+) -> dict[int, ApiError]:
+    """
+    Work out which of the records inserted by an unordered `insert_many` weren't
+    inserted, from the `BulkWriteError` that `exc` was raised from. Returns the error
+    for each of these, keyed by the index of the file in the batch. If the error isn't
+    from a bulk write (e.g. the database couldn't be reached), none of the records are
+    assumed to have been inserted
+    """
+    if not isinstance(exc.__cause__, BulkWriteError):
+        return {i: exc for i in file_indexes}
+
+    return {
+        file_indexes[write_error["index"]]: exc
+        for write_error in exc.__cause__.details.get("writeErrors", [])
+    }
+
+
+def _extract_hdf_file(
+    hdf_path: Path,
+    manifest: ChannelManifestModel,
+) -> tuple[HDFDataHandler, ExtractedData]:
+    """
+    Open and extract the HDF file at `hdf_path`. This is synchronous h5py work, so is
+    run in a thread to keep it off the event loop. As `manifest` is given, extracting
+    doesn't wait on anything, so the coroutine is run to completion in the thread
+    """
+    hdf_handler = HDFDataHandler(hdf_path, lazy=True)
+    return hdf_handler, asyncio.run(hdf_handler.extract_data(manifest))
+
+
+async def _extract_hdf(
+    file: UploadFile,
+    hdf_path: Path,
+    manifest: ChannelManifestModel,
+    semaphore: asyncio.Semaphore,
+) -> tuple[HDFDataHandler, ExtractedData]:
+    async with semaphore:
+        log.debug("Extracting %s", file.filename)
+        return await asyncio.to_thread(_extract_hdf_file, hdf_path, manifest)
+
+
+async def _check_and_upload_bounded(
+    hdf_handler: HDFDataHandler,
+    extracted_data: ExtractedData,
+    stored_record: RecordModel | None,
+    manifest: ChannelManifestModel,
+    semaphore: asyncio.Semaphore,
+) -> tuple[Record, dict[str, Any], str | None]:
+    async with semaphore:
+        return await _check_and_upload(
+            hdf_handler,
+            extracted_data,
+            stored_record,
+            manifest,
+        )
+
+
+async def _ingest_hdf(
+    filename: str | None,
+    hdf_path: Path,
+) -> tuple[int, dict[str, Any], str]:
+    """
+    Extract, check and upload the HDF file at `hdf_path`, then store its record.
+    Returns the status code and content of the response, and the id of the record
+    """
+    manifest = await ChannelManifest.get_most_recent_manifest()
+    start_time = time.perf_counter()
+    hdf_handler, extracted_data = await asyncio.to_thread(
+        _extract_hdf_file,
+        hdf_path,
+        manifest,
+    )
+    log.info(
+        "Extracted %s, took %.3fs",
+        filename,
+        time.perf_counter() - start_time,
+    )
+    stored_record = await _find_stored_record(Record(extracted_data[0]))
+    record, checker_response, accept_type = await _check_and_upload(
+        hdf_handler,
+        extracted_data,
+        stored_record,
+        manifest,
+    )
+
+    start_time = time.perf_counter()
+    status_code, message = await _store_record(
+        record,
+        stored_record,
+        accept_type,
+        hdf_path,
+    )
+    log.info(
+        "Stored record %s, took %.3fs",
+        record.record.id_,
+        time.perf_counter() - start_time,
+    )
+    content = {"message": message, "response": checker_response}
+    ctypes.CDLL("libc.so.6").malloc_trim(0)
+    return status_code, content, record.record.id_
+
+
+async def _ingest_hdf_job(
+    filename: str | None,
+    hdf_path: Path,
+) -> SubmitHDFBatchResponse:
+    """
+    Ingest a file taken from the ingest queue, converting any error to the response
+    `/submit/hdf` would have returned for it
+    """
+    try:
+        status_code, content, _ = await _ingest_hdf(filename, hdf_path)
+    except Exception as exc:
+        return _get_error_response(filename, exc)
+
+    return SubmitHDFBatchResponse(filename=filename, status_code=status_code, **content)
+
+
+@router.post(
+    "/submit/hdf",
+    summary="Submit a HDF file for ingestion into MongoDB",
+    response_description="ID of the record document that has been inserted/updated",
+    tags=["Ingestion"],
+    response_model=SubmitHDFResponse,
+    responses={
+        201: {
+            "model": SubmitHDFResponse,
+            "description": "Created and inserted new record with warning",
+            "content": {
+                "application/json": {"example": example_created_response_with_warning},
+            },
+        },
+        200: {
+            "model": SubmitHDFResponse,
+            "description": "Updated existing record",
+            "content": {"application/json": {"example": example_updated_response}},
+        },
+        202: {
+            "model": IngestJobModel,
+            "description": "Queued to be ingested, when submitted with asynchronous",
+        },
+    },
+)
+@endpoint_error_handling
+async def submit_hdf(
+    file: UploadFile,
+    access_token: AuthoriseRoute,
+    asynchronous: bool = False,
+):
+    """
+    This endpoint accepts a HDF file, processes it and stores the data in MongoDB (with
+    images being stored on disk). The HDF file should follow the format specified for
+    the OperationsGateway project. Example files can be obtained via
+    https://github.com/CentralLaserFacility/OG-HDF5, when you provide this tool with
+    exported ecat data
+
+    If `asynchronous` is set, the file is queued to be ingested in the background and
+    202 is returned straight away with the ID of the job, which can be passed to
+    `/submit/jobs/{job_id}` to get the response once the file has been ingested
+    """
+
+    log.info("Submitting CLF data in HDF file to be processed then stored in MongoDB")
+    log.debug("Filename: %s, Content: %s", file.filename, file.content_type)
+
+    if asynchronous:
+        hdf_path = await _spill_file(file)
+        try:
+            job = await get_ingest_queue().submit(
+                file.filename,
+                hdf_path,
+                _ingest_hdf_job,
+            )
+        except BaseException:
+            hdf_path.unlink(missing_ok=True)
+            raise
+
+        return JSONResponse(
+            job.model_dump(mode="json", by_alias=True),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"/submit/jobs/{job.id_}"},
+        )
+
+    async with _spill_to_disk([file]) as [hdf_path]:
+        status_code, content, record_id = await _ingest_hdf(file.filename, hdf_path)
+
+    if status_code == status.HTTP_200_OK:
+        return content
+    else:
         return JSONResponse(
             content,
-            status_code=status.HTTP_201_CREATED,
+            status_code=status_code,
             headers={"Location": f"/records/{record_id}"},
         )
 
 
+@router.post(
+    "/submit/hdf/batch",
+    summary="Submit multiple HDF files for ingestion into MongoDB",
+    response_description="The result of ingesting each file, in the order submitted",
+    tags=["Ingestion"],
+    response_model=list[SubmitHDFBatchResponse],
+)
+@endpoint_error_handling
+async def submit_hdf_batch(
+    files: list[UploadFile],
+    access_token: AuthoriseRoute,
+):
+    """
+    This endpoint accepts multiple HDF files and ingests each of them in the same way
+    as `/submit/hdf`, but shares the work that is common between the files: the channel
+    manifest is loaded once, existing records are found with a single query, files are
+    extracted in threads and processed concurrently, and new records are inserted
+    together.
+
+    A response is returned for each file, containing the HTTP status code and message
+    that `/submit/hdf` would have returned for it. A file being rejected does not
+    prevent the other files from being ingested.
+    """
+
+    log.info(
+        "Submitting %d HDF files to be processed then stored in MongoDB",
+        len(files),
+    )
+    async with _spill_to_disk(files) as hdf_paths:
+        manifest = await ChannelManifest.get_most_recent_manifest()
+        semaphore = asyncio.Semaphore(Config.config.ingest.batch_concurrency)
+        responses: list[SubmitHDFBatchResponse | None] = [None] * len(files)
+
+        extract_results = await asyncio.gather(
+            *[
+                _extract_hdf(file, hdf_path, manifest, semaphore)
+                for file, hdf_path in zip(files, hdf_paths)
+            ],
+            return_exceptions=True,
+        )
+        extracted_files = {}
+        for i, extract_result in enumerate(extract_results):
+            if isinstance(extract_result, BaseException):
+                responses[i] = _get_error_response(files[i].filename, extract_result)
+            else:
+                extracted_files[i] = extract_result
+
+        # Files for the same record (or shotnum) as a file earlier in the batch need to
+        # be merged into that record once it's stored, so are processed afterwards
+        batch_files = {}
+        deferred_files = {}
+        record_keys = set()
+        for i, (hdf_handler, extracted_data) in extracted_files.items():
+            record_data = extracted_data[0]
+            keys = {record_data.id_, ("shotnum", record_data.metadata.shotnum)}
+            keys.discard(("shotnum", None))
+            if keys & record_keys:
+                deferred_files[i] = (hdf_handler, extracted_data)
+            else:
+                batch_files[i] = (hdf_handler, extracted_data)
+            record_keys.update(keys)
+
+        stored_records = await Record.find_existing_records(
+            [extracted_data[0] for _, extracted_data in batch_files.values()],
+        )
+        check_results = await asyncio.gather(
+            *[
+                _check_and_upload_bounded(
+                    hdf_handler,
+                    extracted_data,
+                    stored_records.get(extracted_data[0].id_),
+                    manifest,
+                    semaphore,
+                )
+                for hdf_handler, extracted_data in batch_files.values()
+            ],
+            return_exceptions=True,
+        )
+        extracted_files = None
+        batch_files = dict(zip(batch_files, check_results))
+
+        new_records = {}
+        merged_records = {}
+        for i, check_result in batch_files.items():
+            if isinstance(check_result, BaseException):
+                responses[i] = _get_error_response(files[i].filename, check_result)
+                continue
+
+            record, checker_response, accept_type = check_result
+            stored_record = stored_records.get(record.record.id_)
+            if stored_record and accept_type == "accept_merge":
+                merged_records[i] = (record, checker_response, stored_record)
+            else:
+                new_records[i] = (record, checker_response)
+
+        if new_records:
+            log.debug("Inserting %d new records into MongoDB", len(new_records))
+            failed_inserts = {}
+            try:
+                await Record.insert_many(
+                    [record for record, _ in new_records.values()],
+                )
+            except ApiError as exc:
+                failed_inserts = _get_failed_inserts(list(new_records), exc)
+
+            for i, (record, checker_response) in new_records.items():
+                if i in failed_inserts:
+                    responses[i] = _get_error_response(
+                        files[i].filename,
+                        failed_inserts[i],
+                    )
+                    continue
+
+                XRootDClient.cache_hdf(
+                    record_model=record.record,
+                    hdf_path=hdf_paths[i],
+                )
+                responses[i] = SubmitHDFBatchResponse(
+                    filename=files[i].filename,
+                    status_code=status.HTTP_201_CREATED,
+                    message=f"Added as {record.record.id_}",
+                    response=checker_response,
+                )
+
+        for i, (record, checker_response, stored_record) in merged_records.items():
+            try:
+                status_code, message = await _store_record(
+                    record,
+                    stored_record,
+                    "accept_merge",
+                    hdf_paths[i],
+                )
+            except Exception as exc:
+                responses[i] = _get_error_response(files[i].filename, exc)
+            else:
+                responses[i] = SubmitHDFBatchResponse(
+                    filename=files[i].filename,
+                    status_code=status_code,
+                    message=message,
+                    response=checker_response,
+                )
+
+        for i, (hdf_handler, extracted_data) in deferred_files.items():
+            try:
+                stored_record = await _find_stored_record(Record(extracted_data[0]))
+                record, checker_response, accept_type = await _check_and_upload(
+                    hdf_handler,
+                    extracted_data,
+                    stored_record,
+                    manifest,
+                )
+                status_code, message = await _store_record(
+                    record,
+                    stored_record,
+                    accept_type,
+                    hdf_paths[i],
+                )
+            except Exception as exc:
+                responses[i] = _get_error_response(files[i].filename, exc)
+            else:
+                responses[i] = SubmitHDFBatchResponse(
+                    filename=files[i].filename,
+                    status_code=status_code,
+                    message=message,
+                    response=checker_response,
+                )
+
+    ctypes.CDLL("libc.so.6").malloc_trim(0)
+    return responses
+
+
+@router.get(
+    "/submit/jobs/{job_id}",
+    summary="Get the status of a HDF file submitted to be ingested asynchronously",
+    response_description="The job, with the response for the file once it's finished",
+    tags=["Ingestion"],
+    response_model=IngestJobModel,
+)
+@endpoint_error_handling
+async def get_ingest_job(
+    job_id: str,
+    access_token: AuthoriseRoute,
+):
+    """
+    This endpoint returns the status of a job created by submitting a file to
+    `/submit/hdf` with `asynchronous` set. Once the job has finished, `result` contains
+    the status code and response that `/submit/hdf` would have returned for the file
+    """
+
+    log.info("Getting ingest job %s", job_id)
+    job = await IngestQueue.get_job(job_id)
+    return job.model_dump(by_alias=True)
+
+
 @router.post(
     "/submit/manifest",
     summary="Submit a channel manifest file for ingestion into MongoDB",
@@ -0,0 +1,32 @@
+import logging
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from operationsgateway_api.src.error_handling import endpoint_error_handling
+from operationsgateway_api.src.metrics import get_metrics_text
+
+log = logging.getLogger()
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    summary="Gets the metrics recorded by this worker of the API",
+    response_description="Metrics in the Prometheus text format",
+    response_class=PlainTextResponse,
+    tags=["Metrics"],
+)
+@endpoint_error_handling
+async def get_metrics():
+    """
+    Returns the latency, bytes transferred, errors and cache hits/misses of requests to
+    Echo (labelled by operation and object prefix), along with the statistics of the
+    object, thumbnail and channel manifest caches, the CPU executor and record updates.
+    Each worker records its own metrics.
+    """
+    log.info("Getting metrics")
+    return PlainTextResponse(
+        get_metrics_text(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
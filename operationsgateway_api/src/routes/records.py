@@ -3,7 +3,8 @@ from http import HTTPStatus
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Path, Query, Response
+from fastapi import APIRouter, Depends, Header, Path, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import Json
 from typing_extensions import Annotated
 
@@ -14,16 +15,12 @@ from operationsgateway_api.src.auth.authorisation import (
 from operationsgateway_api.src.error_handling import endpoint_error_handling
 from operationsgateway_api.src.exceptions import QueryParameterError
 from operationsgateway_api.src.models import PartialRecordModel
-from operationsgateway_api.src.records.echo_interface import (
-    EchoInterface,
-    get_echo_interface,
-)
 from operationsgateway_api.src.records.float_image import FloatImage
 from operationsgateway_api.src.records.image import Image
 from operationsgateway_api.src.records.record import Record as Record
 from operationsgateway_api.src.records.record_retriever import RecordRetriever
+from operationsgateway_api.src.records.record_streamer import RecordStreamer
 from operationsgateway_api.src.records.vector import Vector
-from operationsgateway_api.src.records.waveform import Waveform
 from operationsgateway_api.src.routes.common_parameters import ParameterHandler
 
 log = logging.getLogger()
@@ -92,12 +89,25 @@ async def get_records(
         None,
         description="Functions to evaluate on the record data being returned",
     ),
+    accept: Annotated[
+        Optional[str],
+        Header(
+            description="Set to `application/x-ndjson` to stream the records as"
+            " newline delimited JSON, one record per line, as soon as each one has been"
+            " processed",
+        ),
+    ] = None,
 ) -> list[PartialRecordModel]:
     """
     This endpoint uses MongoDB's find() method to query the records
     collection. As a result, this endpoint exposes some of this functionality, which
     you can find more information about at:
     https://www.mongodb.com/docs/manual/reference/method/db.collection.find
+
+    If the `Accept` header is `application/x-ndjson` then the records are streamed as
+    they are read from the database and processed, rather than being returned as a
+    single JSON list once all of them are ready. This keeps memory usage flat for
+    large pages of records
     """
 
     log.info("Getting records by query")
@@ -105,6 +115,40 @@ async def get_records(
     query_order = list(ParameterHandler.extract_order_data(order)) if order else ""
     ParameterHandler.encode_date_for_conditions(conditions)
 
+    colourmap_name = colourmap_name or await Image.get_preferred_colourmap(access_token)
+    float_colourmap_name = (
+        float_colourmap_name or await FloatImage.get_preferred_colourmap(access_token)
+    )
+
+    vector_skip, vector_limit = await Vector.get_skip_limit(access_token)
+
+    if RecordStreamer.accepts_ndjson(accept):
+        log.info("Streaming records as NDJSON")
+        records_iterator = Record.find_record_iterator(
+            conditions,
+            skip,
+            limit,
+            query_order,
+            projection,
+        )
+        record_streamer = RecordStreamer(
+            records=records_iterator,
+            functions=functions,
+            original_image=False,
+            lower_level=lower_level,
+            upper_level=upper_level,
+            limit_bit_depth=8,  # We are returning thumbnails, so limits are 8 bit
+            colourmap_name=colourmap_name,
+            float_colourmap_name=float_colourmap_name,
+            vector_skip=vector_skip,
+            vector_limit=vector_limit,
+            truncate=truncate,
+        )
+        return StreamingResponse(
+            record_streamer.stream(),
+            media_type=RecordStreamer.media_type,
+        )
+
     records_data = await Record.find_record(
         conditions,
         skip,
@@ -112,13 +156,9 @@ async def get_records(
         query_order,
         projection,
     )
+    # Resolve any channel metadata not included by the projection for the whole page
+    channel_metadata = await Record.get_channel_metadata(records_data)
 
-    colourmap_name = colourmap_name or await Image.get_preferred_colourmap(access_token)
-    float_colourmap_name = (
-        float_colourmap_name or await FloatImage.get_preferred_colourmap(access_token)
-    )
-
-    vector_skip, vector_limit = await Vector.get_skip_limit(access_token)
     tasks = []
     async with asyncio.TaskGroup() as task_group:
         for record_data in records_data:
@@ -134,6 +174,7 @@ async def get_records(
                 vector_skip=vector_skip,
                 vector_limit=vector_limit,
                 truncate=truncate,
+                channel_metadata=channel_metadata,
             )
             coroutine = record_retriever.process_record()
             task = task_group.create_task(coroutine)
@@ -294,32 +335,47 @@ async def delete_record_by_id(
     access_token: Annotated[str, Depends(authorise_route)],
 ):
     log.info("Deleting record by ID: %s", id_)
+    await Record.delete_records({"_id": id_})
+    return Response(status_code=HTTPStatus.NO_CONTENT.value)
 
-    await Record.delete_record(id_)
-    echo_interface = get_echo_interface()
-    # In principle historic data might be in the old directory format on Echo, so delete
-    # in both locations
-    sub_directories = EchoInterface.format_record_id(record_id=id_)
-    directory = EchoInterface.format_record_id(record_id=id_, use_subdirectories=False)
-
-    log.info("Deleting waveforms for record ID '%s'", id_)
-    await echo_interface.delete_directory(f"{Waveform.echo_prefix}/{sub_directories}/")
-    await echo_interface.delete_directory(f"{Waveform.echo_prefix}/{directory}/")
-
-    log.info("Deleting images for record ID '%s'", id_)
-    await echo_interface.delete_directory(f"{Image.echo_prefix}/{sub_directories}/")
-    await echo_interface.delete_directory(f"{Image.echo_prefix}/{directory}/")
 
-    log.info("Deleting vectors for record ID '%s'", id_)
-    await echo_interface.delete_directory(f"{Vector.echo_prefix}/{sub_directories}/")
-    await echo_interface.delete_directory(f"{Vector.echo_prefix}/{directory}/")
+@router.delete(
+    "/records",
+    summary="Delete multiple records specified by their IDs or by conditions",
+    response_description="IDs of the deleted records",
+    tags=["Records"],
+)
+@endpoint_error_handling
+async def delete_records(
+    access_token: Annotated[str, Depends(authorise_route)],
+    record_ids: Optional[List[str]] = Query(
+        None,
+        description="`_id`s of the records to delete from the database",
+    ),
+    conditions: Json = Query(
+        None,
+        description="Conditions to select the records to delete, as for `GET /records`",
+    ),
+) -> list[str]:
+    """
+    Delete all of the records given by `record_ids` and/or matching `conditions`, along
+    with their images, float images, waveforms and vectors in object storage. At least
+    one of `record_ids` and `conditions` must be given. If both are given, only records
+    in `record_ids` which match `conditions` are deleted.
 
-    log.info("Deleting float images for record ID '%s'", id_)
-    dir_path = f"{FloatImage.echo_prefix}/{sub_directories}/"
-    await echo_interface.delete_directory(dir_path)
-    await echo_interface.delete_directory(f"{FloatImage.echo_prefix}/{directory}/")
+    At most `mongodb.max_documents` records are deleted in one request.
+    """
+    if not record_ids and not conditions:
+        raise QueryParameterError(
+            "record_ids and/or conditions must be given to delete records",
+        )
 
-    # In case any of the old data was in the cache, clear it
-    echo_interface.download_file_object.cache_clear()
+    filters = []
+    if record_ids:
+        filters.append({"_id": {"$in": record_ids}})
+    if conditions:
+        ParameterHandler.encode_date_for_conditions(conditions)
+        filters.append(conditions)
 
-    return Response(status_code=HTTPStatus.NO_CONTENT.value)
+    log.info("Deleting records matching: %s", filters)
+    return await Record.delete_records({"$and": filters})
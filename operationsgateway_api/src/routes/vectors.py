@@ -1,6 +1,7 @@
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query
 from typing_extensions import Annotated
 
 
@@ -35,11 +36,24 @@ async def get_vector_by_id(
         ),
     ],
     access_token: Annotated[str, Depends(authorise_token)],
+    skip: Annotated[
+        Optional[int],
+        Query(description="Index of the first element of the vector to return", ge=0),
+    ] = None,
+    limit: Annotated[
+        Optional[int],
+        Query(description="Index after the last element of the vector to return", ge=0),
+    ] = None,
 ):
     """
     This endpoint gets a single vector object by channel name and the record ID that
     the vector belongs to.
+
+    If `skip` and/or `limit` are given, only the elements from `skip` up to but not
+    including `limit` are returned, in the same way as the vector skip and limit
+    preferences are applied to thumbnails. For vectors stored in the binary format, only
+    these elements are downloaded from object storage.
     """
     msg = "Getting vector by record_id, channel_name: %s, %s"
     log.info(msg, record_id, channel_name)
-    return await Vector.get_vector(record_id, channel_name)
+    return await Vector.get_vector(record_id, channel_name, skip, limit)
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Path, Query
 from pydantic import Json
@@ -8,7 +8,7 @@ from typing_extensions import Annotated
 
 from operationsgateway_api.src.auth.authorisation import authorise_token
 from operationsgateway_api.src.error_handling import endpoint_error_handling
-from operationsgateway_api.src.models import PartialRecordModel
+from operationsgateway_api.src.models import PartialRecordModel, WaveformModel
 from operationsgateway_api.src.records.record_retriever import RecordRetriever
 from operationsgateway_api.src.records.waveform import Waveform
 
@@ -43,6 +43,16 @@ async def get_waveform_by_id(
         None,
         description="Functions to evaluate on the record data being returned",
     ),
+    start: Optional[int] = Query(
+        None,
+        description="Index of the first point of the waveform to return",
+        ge=0,
+    ),
+    stop: Optional[int] = Query(
+        None,
+        description="Index after the last point of the waveform to return",
+        ge=0,
+    ),
 ):
     """
     This endpoint gets a single waveform object by channel name and the record ID that
@@ -53,6 +63,10 @@ async def get_waveform_by_id(
 
     If `channel_name` matches one of the entries in `functions`, then that will be
     evaluated to generate the returned waveform.
+
+    If `start` and/or `stop` are given, only the points from `start` up to but not
+    including `stop` are returned. For waveforms stored in the binary format, only
+    these points are downloaded from object storage.
     """
     if functions:
         for function_dict in functions:
@@ -67,8 +81,11 @@ async def get_waveform_by_id(
                     return_thumbnails=False,
                 )
                 await record_retriever.process_functions()
-                return record_retriever.record.channels[channel_name].data
+                waveform = record_retriever.record.channels[channel_name].data
+                if isinstance(waveform, WaveformModel):
+                    return Waveform.slice_waveform(waveform, start, stop)
+                return waveform
 
     msg = "Getting waveform by record_id, channel_name: %s, %s"
     log.info(msg, record_id, channel_name)
-    return await Waveform.get_waveform(record_id, channel_name)
+    return await Waveform.get_waveform(record_id, channel_name, start, stop)
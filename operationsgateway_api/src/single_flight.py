@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+log = logging.getLogger()
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key, so that only one of them does the work
+    (e.g. downloading an object from Echo or decoding it) and the others await its
+    result. Once the work is finished the key is forgotten, so later calls do the work
+    again; results should be cached separately if they are to be reused.
+
+    The work is run in its own task, so if the caller which started it is cancelled
+    (for example because its client disconnected), the other callers still get the
+    result. Any exception raised is raised in every caller.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        function: Callable[..., Awaitable[T]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Await `function` with the given arguments, unless it's already being awaited
+        for `key`, in which case wait for that call to finish and return its result
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and task.get_loop() is loop:
+            log.debug("Waiting for %s already in flight: %s", self.name, key)
+            self.coalesced += 1
+        else:
+            task = loop.create_task(function(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done_task: self._forget(key, done_task))
+
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Return the number of calls, how many of them waited for a call already in
+        flight, and how many keys are currently in flight
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        # If every caller was cancelled, nothing awaits the task, so retrieve its
+        # exception to avoid it being logged as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+
+_single_flights: dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """
+    Returns:
+        SingleFlight: Cached object for coalescing calls of the given `name`, created
+        the first time it's requested.
+    """
+    if name not in _single_flights:
+        _single_flights[name] = SingleFlight(name)
+
+    return _single_flights[name]
+
+
+def get_single_flight_stats() -> dict[str, dict[str, int]]:
+    """
+    Return the stats of every `SingleFlight` created by `get_single_flight()`
+    """
+    return {
+        name: single_flight.get_stats()
+        for name, single_flight in _single_flights.items()
+    }
@@ -12,8 +12,11 @@ class User:
 
     authorised_route_list = [
         "/submit/hdf POST",
+        "/submit/hdf/batch POST",
+        "/submit/jobs/{job_id} GET",
         "/submit/manifest POST",
         "/records/{id_} DELETE",
+        "/records DELETE",
         "/experiments POST",
         "/users POST",
         "/users PATCH",
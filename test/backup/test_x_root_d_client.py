@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from operationsgateway_api.src.backup.x_root_d_client import XRootDClient
+from operationsgateway_api.src.config import BackupConfig
+from operationsgateway_api.src.models import RecordModel
+
+
+@pytest.fixture
+def mocked_config(tmp_path: Path) -> Generator[BackupConfig, None, None]:
+    cache_directory = tmp_path / "cache"
+    cache_directory.mkdir()
+    backup = BackupConfig(
+        cache_directory=cache_directory,
+        target_url="",
+        copy_cron_string="* * * * *",
+        worker_file_path="",
+    )
+    with patch("operationsgateway_api.src.config.Config.config.backup", backup):
+        yield backup
+
+
+def get_record_model() -> RecordModel:
+    return RecordModel(
+        _id="20230605080000",
+        metadata={"epac_ops_data_version": "1.0", "timestamp": "2023-06-05T08:00"},
+        channels={},
+        version=2,
+    )
+
+
+class TestXRootDClient:
+    def test_cache_hdf_hardlink(self, mocked_config: BackupConfig, tmp_path: Path):
+        hdf_path = tmp_path / "upload.h5"
+        hdf_path.write_bytes(b"test")
+
+        XRootDClient.cache_hdf(get_record_model(), hdf_path)
+
+        cached_path = mocked_config.cache_directory / "2023/06/05/080000/2.hdf5"
+        assert cached_path.read_bytes() == b"test"
+        assert cached_path.samefile(hdf_path)
+
+    def test_cache_hdf_copy(self, mocked_config: BackupConfig, tmp_path: Path):
+        hdf_path = tmp_path / "upload.h5"
+        hdf_path.write_bytes(b"test")
+        cached_path = mocked_config.cache_directory / "2023/06/05/080000/2.hdf5"
+        cached_path.parent.mkdir(parents=True)
+        cached_path.write_bytes(b"previous")
+
+        with patch(
+            "operationsgateway_api.src.backup.x_root_d_client.os.link",
+            side_effect=OSError("Invalid cross-device link"),
+        ):
+            XRootDClient.cache_hdf(get_record_model(), hdf_path)
+
+        assert cached_path.read_bytes() == b"test"
+        assert not cached_path.samefile(hdf_path)
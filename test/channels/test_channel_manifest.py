@@ -107,3 +107,45 @@ class TestChannelManifest:
     def test_use_model(self, data, expected_return):
         model = ChannelManifest._use_model(data)
         assert model == expected_return
+
+    @pytest.mark.asyncio
+    async def test_get_most_recent_manifest_cache(self):
+        manifest_data = json.loads(success_manifest_content)
+        newer_manifest_data = {**manifest_data, "_id": "19830222132432"}
+        ChannelManifest.invalidate_cache()
+        cache_info = ChannelManifest.get_cache_info()
+
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.find_one",
+            side_effect=[
+                {"_id": "19830222132431"},
+                manifest_data,
+                {"_id": "19830222132431"},
+                {"_id": "19830222132432"},
+                newer_manifest_data,
+            ],
+        ) as find_one:
+            first_manifest = await ChannelManifest.get_most_recent_manifest()
+            second_manifest = await ChannelManifest.get_most_recent_manifest()
+            third_manifest = await ChannelManifest.get_most_recent_manifest()
+
+        assert find_one.await_count == 5
+        assert first_manifest == ChannelManifestModel(**manifest_data)
+        assert second_manifest is first_manifest
+        assert third_manifest == ChannelManifestModel(**newer_manifest_data)
+        assert ChannelManifest.get_cache_info() == {
+            "hits": cache_info["hits"] + 1,
+            "misses": cache_info["misses"] + 2,
+            "manifest_id": "19830222132432",
+        }
+
+        ChannelManifest.invalidate_cache()
+        assert ChannelManifest.get_cache_info()["manifest_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_most_recent_manifest_none_stored(self):
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.find_one",
+            return_value=None,
+        ):
+            assert await ChannelManifest.get_most_recent_manifest() is None
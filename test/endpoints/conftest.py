@@ -143,6 +143,16 @@ async def record_for_delete_records():
                 "waveform_path": f"{record_id}/test-waveform-channel-id.json",
                 "thumbnail": "i5~9=",
             },
+            "test-float-image-channel-id": {
+                "metadata": {"channel_dtype": "float_image"},
+                "image_path": f"{record_id}/test-float-image-channel-id.npz",
+                "thumbnail": "i5~9=",
+            },
+            "test-vector-channel-id": {
+                "metadata": {"channel_dtype": "vector"},
+                "vector_path": f"{record_id}/test-vector-channel-id.json",
+                "thumbnail": "i5~9=",
+            },
         },
     }
 
@@ -182,7 +192,7 @@ async def data_for_delete_records(record_for_delete_records: str):
     bytes_io = BytesIO(vector.vector.model_dump_json(indent=2).encode())
     filename = "test-vector-channel-id.json"
     vector_path = f"{vector.echo_prefix}/{record_for_delete_records}/{filename}"
-    echo.upload_file_object(bytes_io, vector_path)
+    await echo.upload_file_object(bytes_io, vector_path)
 
     yield record_for_delete_records
 
@@ -5,6 +5,7 @@ from operationsgateway_api.src.exceptions import MissingDocumentError
 from operationsgateway_api.src.records.echo_interface import EchoInterface
 from operationsgateway_api.src.records.float_image import FloatImage
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.object_cache import get_object_cache
 from operationsgateway_api.src.records.record import Record
 from operationsgateway_api.src.records.vector import Vector
 from operationsgateway_api.src.records.waveform import Waveform
@@ -25,7 +26,8 @@ class TestDeleteRecordById:
         )
 
         echo = EchoInterface()
-        assert echo.download_file_object.cache_info().currsize == 1
+        image_path = f"{Image.echo_prefix}/{record_id}/test-image-channel-id.png"
+        assert get_object_cache().get(image_path) is not None
 
         delete_response = test_app.delete(
             f"/records/{record_id}",
@@ -63,7 +65,7 @@ class TestDeleteRecordById:
         async for float_image in float_image_query:
             pytest.fail(f"{float_image} still exists")
 
-        assert echo.download_file_object.cache_info().currsize == 0
+        assert get_object_cache().get(image_path) is None
 
     @pytest.mark.asyncio
     async def test_delete_record_subdirectories_success(
@@ -81,7 +83,8 @@ class TestDeleteRecordById:
         )
 
         echo = EchoInterface()
-        assert echo.download_file_object.cache_info().currsize == 1
+        image_path = f"{Image.echo_prefix}/{subdirectories}/test-image-channel-id.png"
+        assert get_object_cache().get(image_path) is not None
 
         delete_response = test_app.delete(
             f"/records/{data_for_delete_records_subdirectories}",
@@ -119,4 +122,51 @@ class TestDeleteRecordById:
         async for float_image in float_image_query:
             pytest.fail(f"{float_image} still exists")
 
-        assert echo.download_file_object.cache_info().currsize == 0
+        assert get_object_cache().get(image_path) is None
+
+
+class TestDeleteRecords:
+    @pytest.mark.asyncio
+    async def test_delete_records_success(
+        self,
+        test_app: TestClient,
+        login_and_get_token,
+        data_for_delete_records: str,
+    ):
+        delete_response = test_app.delete(
+            f"/records?record_ids={data_for_delete_records}&record_ids=missing",
+            headers={"Authorization": f"Bearer {login_and_get_token}"},
+        )
+
+        assert delete_response.status_code == 200
+        assert delete_response.json() == [data_for_delete_records]
+        with pytest.raises(MissingDocumentError):
+            await Record.find_record_by_id(data_for_delete_records, {})
+
+        bucket = await EchoInterface().get_bucket()
+        for echo_prefix in (
+            Image.echo_prefix,
+            FloatImage.echo_prefix,
+            Waveform.echo_prefix,
+            Vector.echo_prefix,
+        ):
+            query = bucket.objects.filter(
+                Prefix=f"{echo_prefix}/{data_for_delete_records}/",
+            )
+            async for echo_object in query:
+                pytest.fail(f"{echo_object} still exists")
+
+    def test_delete_records_no_filter(
+        self,
+        test_app: TestClient,
+        login_and_get_token,
+    ):
+        delete_response = test_app.delete(
+            "/records",
+            headers={"Authorization": f"Bearer {login_and_get_token}"},
+        )
+
+        assert delete_response.status_code == 400
+        assert delete_response.json()["detail"] == (
+            "record_ids and/or conditions must be given to delete records"
+        )
@@ -28,8 +28,11 @@ class TestGetUsers:
                 "auth_type": "local",
                 "authorised_routes": [
                     "/submit/hdf POST",
+                    "/submit/hdf/batch POST",
+                    "/submit/jobs/{job_id} GET",
                     "/submit/manifest POST",
                     "/records/{id_} DELETE",
+                    "/records DELETE",
                     "/experiments POST",
                     "/users POST",
                     "/users PATCH",
@@ -39,6 +39,14 @@ class TestGetVectorById:
         ]
         assert test_response.json() == {"data": data}
 
+        test_response = test_app.get(
+            "/vectors/20230605080300/CM-202-CVC-WFS-COEF?skip=2&limit=5",
+            headers={"Authorization": f"Bearer {login_and_get_token}"},
+        )
+
+        assert test_response.status_code == 200
+        assert test_response.json() == {"data": data[2:5]}
+
     def test_get_vector_failure(
         self,
         test_app: TestClient,
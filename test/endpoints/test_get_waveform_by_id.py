@@ -59,3 +59,19 @@ class TestGetWaveformByID:
 
         assert test_response.json()["x"][0] == expected_first_x
         assert test_response.json()["y"][0] == expected_first_y
+
+    def test_get_waveform_by_id_start_stop(
+        self,
+        test_app: TestClient,
+        login_and_get_token,
+    ):
+        headers = {"Authorization": f"Bearer {login_and_get_token}"}
+        url = "/waveforms/20230605100000/CM-202-CVC-SP"
+        full_response = test_app.get(url, headers=headers)
+        test_response = test_app.get(f"{url}?start=1&stop=3", headers=headers)
+
+        assert test_response.status_code == 200
+        assert test_response.json() == {
+            "x": full_response.json()["x"][1:3],
+            "y": full_response.json()["y"][1:3],
+        }
@@ -0,0 +1,11 @@
+from fastapi.testclient import TestClient
+
+
+class TestMetrics:
+    def test_metrics(self, test_app: TestClient):
+        response = test_app.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            "# TYPE operationsgateway_object_cache_hits_total counter" in response.text
+        )
@@ -1,15 +1,30 @@
+import asyncio
 from pathlib import Path
+import stat
 from tempfile import SpooledTemporaryFile
+import threading
+import time
 from unittest.mock import patch
 
+from fastapi import UploadFile
 from fastapi.testclient import TestClient
 import h5py
 import numpy as np
+from pymongo.errors import BulkWriteError
 import pytest
 
 from operationsgateway_api.src.config import Config
 from operationsgateway_api.src.exceptions import DatabaseError, EchoS3Error
+from operationsgateway_api.src.models import ChannelManifestModel
+from operationsgateway_api.src.mongo.interface import MongoDBInterface
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
+from operationsgateway_api.src.records.ingestion.hdf_handler import HDFDataHandler
+from operationsgateway_api.src.routes.ingest_data import (
+    _extract_hdf,
+    _get_failed_inserts,
+    _spill_to_disk,
+    SPILL_FILE_MODE,
+)
 from test.records.ingestion.create_test_hdf import create_test_hdf_file
 
 
@@ -513,7 +528,7 @@ class TestSubmitHDF:
         def mock_upload_file_object(file_object, object_path):
             # Extract channel name from the path
             channel_name = object_path.split("/")[-1]
-            if channel_name == "PM-201-HJ-PD.json":  # Simulate success for the first
+            if channel_name == "PM-201-HJ-PD.bin":  # Simulate success for the first
                 uploaded_channels.append(channel_name)
             else:
                 raise EchoS3Error()
@@ -621,3 +636,167 @@ class TestSubmitHDF:
             "File minor version number too high (expected <=2)"
             in response_json["response"]["warnings"]
         )
+
+
+class TestSpillToDisk:
+    @pytest.mark.asyncio
+    async def test_spill_to_disk(self, tmp_path: Path):
+        spill_file = SpooledTemporaryFile()
+        spill_file.write(b"test")
+        files = [UploadFile(spill_file, filename="test.h5")]
+        target = "operationsgateway_api.src.config.Config.config.ingest.spill_directory"
+        with patch(target, tmp_path):
+            async with _spill_to_disk(files) as [hdf_path]:
+                assert hdf_path.parent == tmp_path
+                assert hdf_path.read_bytes() == b"test"
+                assert stat.S_IMODE(hdf_path.stat().st_mode) == SPILL_FILE_MODE
+
+        assert not hdf_path.exists()
+
+
+class TestExtractHDF:
+    @pytest.mark.asyncio
+    async def test_extract_hdf(self, tmp_path: Path):
+        hdf_path = tmp_path / "test.h5"
+        with h5py.File(hdf_path, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.2")
+            f.attrs.create("timestamp", "2020-04-07T14:28:16Z")
+        manifest = ChannelManifestModel(_id="20200407142816", channels={})
+        file = UploadFile(SpooledTemporaryFile(), filename="test.h5")
+        extract_data = HDFDataHandler.extract_data
+        extract_threads = []
+
+        async def record_thread(self, manifest):
+            extract_threads.append(threading.get_ident())
+            return await extract_data(self, manifest)
+
+        with patch.object(HDFDataHandler, "extract_data", record_thread):
+            _, extracted_data = await _extract_hdf(
+                file,
+                hdf_path,
+                manifest,
+                asyncio.Semaphore(1),
+            )
+
+        assert extracted_data[0].id_ == "20200407142816"
+        # The file is extracted in a thread, not the one running the event loop
+        assert len(extract_threads) == 1
+        assert extract_threads[0] != threading.get_ident()
+
+
+class TestGetFailedInserts:
+    def test_bulk_write_error(self):
+        bulk_write_error = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]},
+        )
+        try:
+            raise DatabaseError("Mocked Exception") from bulk_write_error
+        except DatabaseError as exc:
+            failed_inserts = _get_failed_inserts([0, 2, 3], exc)
+
+        # The second document inserted was for the third file in the batch
+        assert list(failed_inserts) == [2]
+        assert isinstance(failed_inserts[2], DatabaseError)
+
+    def test_other_error(self):
+        exc = DatabaseError("Mocked Exception")
+        assert _get_failed_inserts([0, 2], exc) == {0: exc, 2: exc}
+
+
+class TestSubmitHDFBatch:
+    @pytest.mark.asyncio
+    async def test_ingest_batch(
+        self,
+        reset_record_storage,
+        test_app: TestClient,
+        login_and_get_token,
+    ):
+        _ = await create_test_hdf_file()
+
+        test_file = "test.h5"
+        rejected_file = SpooledTemporaryFile()
+        with h5py.File(rejected_file, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.0")
+
+        files = [
+            ("files", (test_file, open(test_file, "rb"))),
+            ("files", (test_file, open(test_file, "rb"))),
+            ("files", ("rejected.h5", rejected_file)),
+        ]
+        test_response = test_app.post(
+            "/submit/hdf/batch",
+            headers={"Authorization": f"Bearer {login_and_get_token}"},
+            files=files,
+        )
+
+        assert test_response.status_code == 200
+        added, updated, rejected = test_response.json()
+
+        assert added["filename"] == test_file
+        assert added["status_code"] == 201
+        assert added["message"] == "Added as 20200407142816"
+        assert len(added["response"]["accepted_channels"]) == 17
+
+        # The second file is for the same record, so is merged into it after the first
+        # file has been inserted
+        assert updated["filename"] == test_file
+        assert updated["status_code"] == 200
+        assert updated["message"] == "Updated 20200407142816"
+        assert updated["response"]["accepted_channels"] == []
+        assert len(updated["response"]["rejected_channels"]) == 17
+
+        assert rejected == {
+            "filename": "rejected.h5",
+            "status_code": 400,
+            "message": (
+                "Invalid timestamp metadata. Expected key 'timestamp' with value "
+                "formatted, for example as: '2025-04-07T14:28:16+00:00'."
+            ),
+            "response": None,
+        }
+
+
+class TestSubmitHDFAsynchronous:
+    @pytest.mark.asyncio
+    async def test_ingest_asynchronous(
+        self,
+        reset_record_storage,
+        test_app: TestClient,
+        login_and_get_token,
+    ):
+        _ = await create_test_hdf_file()
+        headers = {"Authorization": f"Bearer {login_and_get_token}"}
+
+        test_response = test_app.post(
+            "/submit/hdf",
+            headers=headers,
+            params={"asynchronous": True},
+            files=[("file", ("test.h5", open("test.h5", "rb")))],
+        )
+
+        assert test_response.status_code == 202
+        job_id = test_response.json()["_id"]
+        assert test_response.headers["Location"] == f"/submit/jobs/{job_id}"
+        assert test_response.json()["status"] in ("queued", "running")
+
+        for _ in range(100):
+            job_response = test_app.get(f"/submit/jobs/{job_id}", headers=headers)
+            assert job_response.status_code == 200
+            if job_response.json()["status"] == "finished":
+                break
+            time.sleep(0.1)
+
+        await MongoDBInterface.delete_one("ingest_jobs", filter_={"_id": job_id})
+        result = job_response.json()["result"]
+        assert result["filename"] == "test.h5"
+        assert result["status_code"] == 201
+        assert result["message"] == "Added as 20200407142816"
+        assert len(result["response"]["accepted_channels"]) == 17
+
+    def test_get_missing_job(self, test_app: TestClient, login_and_get_token):
+        test_response = test_app.get(
+            "/submit/jobs/missing",
+            headers={"Authorization": f"Bearer {login_and_get_token}"},
+        )
+
+        assert test_response.status_code == 404
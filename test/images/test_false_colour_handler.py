@@ -1,3 +1,8 @@
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
 import pytest
 
 from operationsgateway_api.src.exceptions import QueryParameterError
@@ -81,3 +86,55 @@ class TestFalseColourHandler:
                 limit_bit_depth=8,
             )
         assert "upper_level must be less than 2**limit_bit_depth" in e.exconly()
+
+    @pytest.mark.parametrize(
+        "image_array, vmin, vmax",
+        [
+            pytest.param(
+                np.arange(256, dtype=np.uint8).reshape(16, 16),
+                2,
+                200,
+                id="8 bit",
+            ),
+            pytest.param(
+                np.arange(0, 65536, 64, dtype=np.uint16).reshape(32, 32),
+                256,
+                4095,
+                id="16 bit",
+            ),
+            pytest.param([range(256) for _ in range(4)], 0, 255, id="List of ints"),
+            pytest.param(
+                np.arange(-50, 50).reshape(10, 10),
+                0,
+                40,
+                id="Negative ints",
+            ),
+            pytest.param(
+                np.linspace(-1, 1, 100).reshape(10, 10),
+                -0.5,
+                0.5,
+                id="Floats",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("colourmap_name", ["viridis", "jet_r"])
+    def test_map_colours_matches_imsave(self, image_array, vmin, vmax, colourmap_name):
+        expected_bytes = BytesIO()
+        plt.imsave(
+            expected_bytes,
+            image_array,
+            vmin=vmin,
+            vmax=vmax,
+            cmap=colourmap_name,
+        )
+
+        mapped_array = FalseColourHandler.map_colours(
+            image_array,
+            vmin,
+            vmax,
+            colourmap_name,
+        )
+        image_bytes = FalseColourHandler.encode_png(mapped_array)
+
+        expected_pixels = np.array(Image.open(expected_bytes))
+        assert np.array_equal(np.array(Image.open(image_bytes)), expected_pixels)
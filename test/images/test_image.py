@@ -1,3 +1,4 @@
+import asyncio
 import base64
 from io import BytesIO
 import logging
@@ -17,6 +18,7 @@ from operationsgateway_api.src.exceptions import (
 )
 from operationsgateway_api.src.models import ImageModel
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.image_array_cache import get_image_array_cache
 from test.records.conftest import remove_test_objects
 
 
@@ -365,6 +367,47 @@ class TestImage:
                     colourmap_name="jet",
                 )
 
+    @pytest.mark.asyncio
+    async def test_get_array_coalesced(self):
+        get_image_array_cache().clear()
+        image_bytes = self._get_bytes_of_image("original_image.png").getvalue()
+        with patch(
+            "operationsgateway_api.src.records.echo_interface.EchoInterface"
+            ".download_file_object",
+            return_value=image_bytes,
+        ) as mock_download_file_object:
+            results = await asyncio.gather(
+                Image.get_array("test_record_id", "test_channel_name"),
+                Image.get_array("test_record_id", "test_channel_name"),
+            )
+
+        # Concurrent requests share one download and decode, and the array they share
+        # can't be modified
+        mock_download_file_object.assert_called_once()
+        image_array, storage_bit_depth = results[0]
+        assert all(result[0] is image_array for result in results)
+        assert storage_bit_depth == 16
+        assert not image_array.flags.writeable
+
+    @pytest.mark.asyncio
+    async def test_get_array_cached(self):
+        get_image_array_cache().clear()
+        image_bytes = self._get_bytes_of_image("original_image.png").getvalue()
+        with patch(
+            "operationsgateway_api.src.records.echo_interface.EchoInterface"
+            ".download_file_object",
+            return_value=image_bytes,
+        ) as mock_download_file_object:
+            image_array, _ = await Image.get_array("test_record_id", "test_channel")
+            cached_array, _ = await Image.get_array("test_record_id", "test_channel")
+
+        mock_download_file_object.assert_called_once()
+        assert cached_array is image_array
+        assert get_image_array_cache().get_cache_info()["hits"] == 1
+
+        get_image_array_cache().invalidate_record("test_record_id")
+        assert get_image_array_cache().get_cache_info()["entries"] == 0
+
     @pytest.mark.parametrize(
         ["use_subdirectories", "path"],
         [
@@ -560,3 +603,175 @@ class TestImage:
         assert caplog.record_tuples == record_tuples
         assert image.image.data.dtype == dtype
         assert image.image.data[0] == value
+
+    @pytest.mark.parametrize(
+        ["data", "factor", "expected_data"],
+        [
+            pytest.param(
+                np.array([[0, 2, 4, 6], [2, 4, 6, 8]], dtype=np.uint16),
+                2,
+                np.array([[2, 6]], dtype=np.uint16),
+                id="Multiple of factor",
+            ),
+            pytest.param(
+                np.array([[0, 1, 10], [1, 1, 20], [8, 8, 30]], dtype=np.uint8),
+                2,
+                np.array([[1, 15], [8, 30]], dtype=np.uint8),
+                id="Edges repeated and mean rounded",
+            ),
+        ],
+    )
+    def test_downsample(
+        self,
+        data: np.ndarray,
+        factor: int,
+        expected_data: np.ndarray,
+    ):
+        downsampled_data = Image.downsample(data, factor)
+        assert downsampled_data.dtype == data.dtype
+        np.testing.assert_array_equal(downsampled_data, expected_data)
+
+    def test_get_pyramid_path(self):
+        pyramid_path = Image.get_pyramid_path("2022/04/08/165857/N_INP_NF_IMAGE.png", 4)
+        assert pyramid_path == "2022/04/08/165857/N_INP_NF_IMAGE.4x.png"
+
+    @pytest.mark.parametrize(
+        ["max_size", "expected_factor"],
+        [
+            pytest.param(100, 4, id="Smallest level"),
+            pytest.param(300, 2, id="Middle level"),
+            pytest.param(501, 2, id="Level rounded up"),
+            pytest.param(502, None, id="Original image"),
+        ],
+    )
+    def test_get_pyramid_factor(self, max_size: int, expected_factor: int | None):
+        assert Image.get_pyramid_factor(1001, 600, max_size, [2, 4]) == expected_factor
+
+    def test_get_png_size(self):
+        png_bytes = self._get_bytes_of_image("original_image.png").getvalue()
+        assert (
+            Image.get_png_size(png_bytes[:24])
+            == PILImage.open(
+                BytesIO(png_bytes),
+            ).size
+        )
+
+        with pytest.raises(ImageError, match="not a valid PNG"):
+            Image.get_png_size(b"0" * 24)
+
+    @pytest.mark.asyncio
+    @patch(
+        "operationsgateway_api.src.config.Config.config.images.pyramid_factors",
+        [2, 4],
+    )
+    async def test_upload_pyramid(self):
+        test_image = Image(
+            ImageModel(
+                path="2022/04/08/165857/N_INP_NF_IMAGE.png",
+                data=np.ones(shape=(300, 200), dtype=np.uint16),
+            ),
+        )
+        with patch(
+            "operationsgateway_api.src.records.echo_interface.EchoInterface"
+            ".upload_file_object",
+        ) as mock_upload_file_object:
+            assert await Image.upload_image(test_image) is None
+
+        uploaded = {
+            call.args[1]: PILImage.open(call.args[0]).size
+            for call in mock_upload_file_object.call_args_list
+        }
+        assert uploaded == {
+            "images/2022/04/08/165857/N_INP_NF_IMAGE.png": (200, 300),
+            "images/2022/04/08/165857/N_INP_NF_IMAGE.2x.png": (100, 150),
+            "images/2022/04/08/165857/N_INP_NF_IMAGE.4x.png": (50, 75),
+        }
+
+    @pytest.mark.asyncio
+    @patch(
+        "operationsgateway_api.src.records.image.Image.get_channel_field",
+        return_value=[2],
+    )
+    @pytest.mark.parametrize(
+        ["level_bytes", "level_used"],
+        [
+            pytest.param(b"level", True, id="Level stored"),
+            pytest.param(EchoS3Error("Missing level"), False, id="Level not stored"),
+        ],
+    )
+    async def test_get_image_max_size(
+        self,
+        _,
+        level_bytes: bytes | Exception,
+        level_used: bool,
+    ):
+        png_bytes = self._get_bytes_of_image("original_image.png").getvalue()
+        with patch(
+            "operationsgateway_api.src.records.image.Image.get_bytes",
+            side_effect=[png_bytes[:24], level_bytes],
+        ) as mock_get_bytes, patch(
+            "operationsgateway_api.src.records.image.Image.apply_false_colour",
+            side_effect=lambda image_bytes, **kwargs: image_bytes,
+        ), patch(
+            "operationsgateway_api.src.records.image.Image.get_array",
+            return_value=(np.zeros((2, 2), dtype=np.uint8), 8),
+        ) as mock_get_array:
+            image_bytes = await Image.get_image(
+                record_id="test_record_id",
+                channel_name="test_channel_name",
+                original_image=False,
+                lower_level=0,
+                upper_level=255,
+                limit_bit_depth=8,
+                colourmap_name="jet",
+                max_size=1,
+            )
+
+        assert mock_get_bytes.call_args_list[0].kwargs["byte_range"] == (0, 23)
+        assert mock_get_bytes.call_args_list[1].kwargs["echo_extension"] == "2x.png"
+        if level_used:
+            assert image_bytes == b"level"
+            mock_get_array.assert_not_called()
+        else:
+            mock_get_array.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ["original_image", "pyramid_factors"],
+        [
+            pytest.param(True, [2], id="Original image"),
+            pytest.param(False, None, id="No levels stored"),
+        ],
+    )
+    async def test_get_image_max_size_full_size(
+        self,
+        original_image: bool,
+        pyramid_factors: list[int] | None,
+    ):
+        png_bytes = self._get_bytes_of_image("original_image.png").getvalue()
+        with patch(
+            "operationsgateway_api.src.records.image.Image.get_bytes",
+            return_value=png_bytes,
+        ) as mock_get_bytes, patch(
+            "operationsgateway_api.src.records.image.Image.get_channel_field",
+            return_value=pyramid_factors,
+        ):
+            # Use a record ID that no other test caches the decoded image of
+            image_bytes = await Image.get_image(
+                record_id="test_full_size_record_id",
+                channel_name="test_channel_name",
+                original_image=original_image,
+                lower_level=0,
+                upper_level=255,
+                limit_bit_depth=8,
+                colourmap_name="jet",
+                max_size=1,
+            )
+
+        # The full size image is downloaded, without looking for a level
+        mock_get_bytes.assert_awaited_once_with(
+            record_id="test_full_size_record_id",
+            channel_name="test_channel_name",
+        )
+        if original_image:
+            assert image_bytes == png_bytes
@@ -39,3 +39,6 @@ async def remove_test_objects():
     await echo.delete_file_object(
         "waveforms/1952/06/05/070023/test-channel-name.json",
     )
+    await echo.delete_file_object(
+        "waveforms/1952/06/05/070023/test-channel-name.bin",
+    )
@@ -1135,3 +1135,38 @@ class TestChannel:
     def test_ensure_dict(self, possible_model: dict | BaseModel):
         ensured_dict = ChannelChecks._ensure_dict(possible_model)
         assert isinstance(ensured_dict, dict)
+
+    @pytest.mark.parametrize(
+        ["values", "expected"],
+        [
+            pytest.param([1.0, float("nan"), float("inf")], True, id="Floats"),
+            pytest.param([], True, id="Empty"),
+            pytest.param(np.array([1.0, np.nan]), True, id="Array"),
+            pytest.param(np.array([1, 2]), False, id="Integer array"),
+            pytest.param([1.0, 2j], False, id="Complex"),
+            pytest.param(np.ones((2, 2)), False, id="2D array"),
+            pytest.param((1.0, 2.0), False, id="Not a list"),
+            pytest.param([1.0, "2.0"], False, id="String"),
+            pytest.param([1.0, None], False, id="None"),
+            pytest.param([np.float64(1.0)], True, id="Subclass of float"),
+            pytest.param([np.float32(1.0)], False, id="Not Python floats"),
+            pytest.param([1.0, 2], False, id="Integer"),
+            pytest.param([[1.0], [2.0]], False, id="Nested lists"),
+            pytest.param([1.0, [2.0, 3.0]], False, id="Inconsistent shape"),
+        ],
+    )
+    def test_is_float_list(self, values, expected: bool):
+        assert ChannelChecks._is_float_list(values) == expected
+
+    @pytest.mark.parametrize(
+        ["data", "expected"],
+        [
+            pytest.param(np.ones((2, 2)), True, id="2D"),
+            pytest.param(np.ones((2, 2, 3)), True, id="3D"),
+            pytest.param(np.ones(0), True, id="Empty"),
+            pytest.param(np.ones(2), False, id="1D"),
+            pytest.param([np.ones(2), 1.0], False, id="List containing float"),
+        ],
+    )
+    def test_has_rows(self, data, expected: bool):
+        assert ChannelChecks._has_rows(data) == expected
@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 import h5py
 import numpy as np
 import pytest
 
 from operationsgateway_api.src.exceptions import HDFDataExtractionError
+from operationsgateway_api.src.models import ChannelManifestModel, ChannelModel
+from operationsgateway_api.src.records.ingestion.channel_checks import ChannelChecks
 from operationsgateway_api.src.records.ingestion.hdf_handler import HDFDataHandler
 
 
@@ -222,3 +225,143 @@ class TestHDFDataHandler:
         await hdf_data_handler.extract_data()
 
         assert hdf_data_handler.internal_failed_channel == expected
+
+    @pytest.mark.asyncio
+    async def test_extract_data_lazy(self, tmp_path):
+        hdf_path = tmp_path / "test.h5"
+        with h5py.File(hdf_path, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.2")
+            f.attrs.create("timestamp", "2020-04-07T14:28:16Z")
+            image = f.create_group("PM-201-FE-CAM-1")
+            image.attrs.create("channel_dtype", "image")
+            image_data = np.arange(12, dtype=np.uint16).reshape(3, 4)
+            image.create_dataset("data", data=image_data)
+            waveform = f.create_group("PM-201-FE-PD")
+            waveform.attrs.create("channel_dtype", "waveform")
+            waveform.create_dataset("x", data=[1, 2, 3])
+            waveform.create_dataset("y", data=[8.0, 3.0, 6.0])
+            channels = {
+                name: ChannelModel(
+                    name=name,
+                    path=f"/test/{name}",
+                    type=group.attrs["channel_dtype"],
+                )
+                for name, group in f.items()
+            }
+        manifest = ChannelManifestModel(_id="20200407142816", channels=channels)
+
+        hdf_data_handler = HDFDataHandler(hdf_path, lazy=True)
+        _, waveforms, images, *_ = await hdf_data_handler.extract_data(manifest)
+
+        # The placeholders have the shape and dtype of the data, but don't contain it
+        assert images[0].data.shape == (3, 4)
+        assert images[0].data.dtype == np.uint16
+        assert images[0].data.strides == (0, 0)
+        assert waveforms[0].x.dtype == np.float64
+        assert waveforms[0].x.strides == (0,)
+
+        image_model = hdf_data_handler.load_model(images[0])
+        waveform_model = hdf_data_handler.load_model(waveforms[0])
+        np.testing.assert_array_equal(image_model.data, image_data)
+        assert image_model.path == images[0].path
+        assert waveform_model.model_dump() == {
+            "x": [1.0, 2.0, 3.0],
+            "y": [8.0, 3.0, 6.0],
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ["config_pyramid_factors", "expected_pyramid_factors"],
+        [
+            pytest.param([2, 4], [2, 4], id="Pyramid configured"),
+            pytest.param([], None, id="No pyramid"),
+        ],
+    )
+    async def test_extract_image_pyramid_factors(
+        self,
+        config_pyramid_factors: list[int],
+        expected_pyramid_factors: list[int] | None,
+        tmp_path,
+    ):
+        hdf_path = tmp_path / "test.h5"
+        with h5py.File(hdf_path, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.2")
+            f.attrs.create("timestamp", "2020-04-07T14:28:16Z")
+            image = f.create_group("PM-201-FE-CAM-1")
+            image.attrs.create("channel_dtype", "image")
+            image.create_dataset("data", data=np.ones((3, 4), dtype=np.uint16))
+        channel = ChannelModel(name="PM-201-FE-CAM-1", path="/test", type="image")
+        manifest = ChannelManifestModel(
+            _id="20200407142816",
+            channels={"PM-201-FE-CAM-1": channel},
+        )
+
+        with patch(
+            "operationsgateway_api.src.config.Config.config.images.pyramid_factors",
+            config_pyramid_factors,
+        ):
+            hdf_data_handler = HDFDataHandler(hdf_path)
+            record, *_ = await hdf_data_handler.extract_data(manifest)
+
+        image_channel = record.channels["PM-201-FE-CAM-1"]
+        assert image_channel.pyramid_factors == expected_pyramid_factors
+        # Only stored in the database if the levels were
+        stored_channel = image_channel.model_dump(exclude_unset=True)
+        assert ("pyramid_factors" in stored_channel) == bool(config_pyramid_factors)
+
+    @pytest.mark.asyncio
+    async def test_extract_data_lazy_complex(self, tmp_path):
+        hdf_path = tmp_path / "test.h5"
+        with h5py.File(hdf_path, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.2")
+            f.attrs.create("timestamp", "2020-04-07T14:28:16Z")
+            waveform = f.create_group("PM-201-FE-PD")
+            waveform.attrs.create("channel_dtype", "waveform")
+            waveform.create_dataset("x", data=[1, 2, 3])
+            waveform.create_dataset("y", data=[8 + 1j, 3 + 2j, 6 + 3j])
+        channel = ChannelModel(name="PM-201-FE-PD", path="/test", type="waveform")
+        manifest = ChannelManifestModel(
+            _id="20200407142816",
+            channels={"PM-201-FE-PD": channel},
+        )
+
+        hdf_data_handler = HDFDataHandler(hdf_path, lazy=True)
+        _, waveforms, *_ = await hdf_data_handler.extract_data(manifest)
+
+        # Complex data is read straight away, so the checks see it and reject it
+        assert waveforms[0].y == [8 + 1j, 3 + 2j, 6 + 3j]
+        assert not ChannelChecks._is_float_list(waveforms[0].y)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ["chunks", "memory_mapped"],
+        [
+            pytest.param(None, True, id="Contiguous"),
+            pytest.param((1, 4), False, id="Chunked"),
+        ],
+    )
+    async def test_extract_data_memory_mapped(
+        self,
+        chunks: tuple[int, int] | None,
+        memory_mapped: bool,
+        tmp_path,
+    ):
+        hdf_path = tmp_path / "test.h5"
+        image_data = np.arange(12, dtype=np.uint16).reshape(3, 4)
+        with h5py.File(hdf_path, "w") as f:
+            f.attrs.create("epac_ops_data_version", "1.2")
+            f.attrs.create("timestamp", "2020-04-07T14:28:16Z")
+            image = f.create_group("PM-201-FE-CAM-1")
+            image.attrs.create("channel_dtype", "image")
+            image.create_dataset("data", data=image_data, chunks=chunks)
+        channel = ChannelModel(name="PM-201-FE-CAM-1", path="/test", type="image")
+        manifest = ChannelManifestModel(
+            _id="20200407142816",
+            channels={"PM-201-FE-CAM-1": channel},
+        )
+
+        hdf_data_handler = HDFDataHandler(hdf_path)
+        _, _, images, *_ = await hdf_data_handler.extract_data(manifest)
+
+        assert isinstance(images[0].data, np.memmap) == memory_mapped
+        np.testing.assert_array_equal(images[0].data, image_data)
@@ -0,0 +1,182 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from operationsgateway_api.src.exceptions import (
+    IngestQueueFullError,
+    MissingDocumentError,
+)
+from operationsgateway_api.src.models import IngestJobStatus, SubmitHDFBatchResponse
+from operationsgateway_api.src.records.ingestion.ingest_queue import IngestQueue
+
+MONGO_INTERFACE = "operationsgateway_api.src.records.ingestion.ingest_queue"
+MONGO_INTERFACE += ".MongoDBInterface"
+
+
+async def ingest(filename: str | None, hdf_path: Path) -> SubmitHDFBatchResponse:
+    assert hdf_path.exists()
+    return SubmitHDFBatchResponse(
+        filename=filename,
+        status_code=201,
+        message="Added as 20230605080000",
+        response={"accepted_channels": [], "rejected_channels": {}},
+    )
+
+
+async def ingest_error(filename: str | None, hdf_path: Path) -> SubmitHDFBatchResponse:
+    raise ValueError("Mocked Exception")
+
+
+class TestIngestQueue:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "ingest_function, expected_status_code, expected_completed, expected_failed",
+        [
+            pytest.param(ingest, 201, 1, 0, id="Ingested"),
+            pytest.param(ingest_error, 500, 0, 1, id="Error while ingesting"),
+        ],
+    )
+    async def test_submit(
+        self,
+        tmp_path: Path,
+        ingest_function,
+        expected_status_code: int,
+        expected_completed: int,
+        expected_failed: int,
+    ):
+        hdf_path = tmp_path / "test.h5"
+        hdf_path.touch()
+        ingest_queue = IngestQueue(workers=1, max_size=1)
+        with patch(f"{MONGO_INTERFACE}.insert_one") as insert_one, patch(
+            f"{MONGO_INTERFACE}.update_one",
+        ) as update_one:
+            job = await ingest_queue.submit("test.h5", hdf_path, ingest_function)
+            await ingest_queue._queue.join()
+            await ingest_queue.shutdown()
+
+        assert job.status == IngestJobStatus.QUEUED
+        insert_one.assert_called_once()
+        assert insert_one.call_args.args[1]["_id"] == job.id_
+        assert update_one.call_count == 2
+        finished_update = update_one.call_args.kwargs["update"]["$set"]
+        assert finished_update["status"] == IngestJobStatus.FINISHED
+        assert finished_update["result"]["status_code"] == expected_status_code
+        assert not hdf_path.exists()
+
+        stats = ingest_queue.get_stats()
+        assert stats["submitted"] == 1
+        assert stats["completed"] == expected_completed
+        assert stats["failed"] == expected_failed
+        assert stats["queued"] == 0
+        assert stats["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_submit_queue_full(self, tmp_path: Path):
+        event = asyncio.Event()
+
+        async def wait(filename: str | None, hdf_path: Path) -> SubmitHDFBatchResponse:
+            await event.wait()
+            return await ingest(filename, hdf_path)
+
+        ingest_queue = IngestQueue(workers=1, max_size=1)
+        hdf_paths = [tmp_path / f"{i}.h5" for i in range(3)]
+        for hdf_path in hdf_paths:
+            hdf_path.touch()
+
+        with patch(f"{MONGO_INTERFACE}.insert_one"), patch(
+            f"{MONGO_INTERFACE}.update_one",
+        ):
+            # The first file is taken by the worker, the second waits in the queue
+            await ingest_queue.submit("0.h5", hdf_paths[0], wait)
+            await asyncio.sleep(0)
+            await ingest_queue.submit("1.h5", hdf_paths[1], wait)
+            assert ingest_queue.get_stats()["queued"] == 1
+            assert ingest_queue.get_stats()["running"] == 1
+
+            with pytest.raises(IngestQueueFullError):
+                await ingest_queue.submit("2.h5", hdf_paths[2], wait)
+
+            event.set()
+            await ingest_queue._queue.join()
+            await ingest_queue.shutdown()
+
+        assert ingest_queue.get_stats()["completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_submit_concurrent(self, tmp_path: Path):
+        async def insert_one(collection_name: str, data: dict) -> None:
+            await asyncio.sleep(0)
+
+        ingest_queue = IngestQueue(workers=1, max_size=1)
+        # Stop the worker so that submitted files stay in the queue
+        ingest_queue._get_queue()
+        await ingest_queue.shutdown()
+        hdf_paths = [tmp_path / f"{i}.h5" for i in range(2)]
+        with patch(f"{MONGO_INTERFACE}.insert_one", insert_one):
+            results = await asyncio.gather(
+                *[
+                    ingest_queue.submit(hdf_path.name, hdf_path, ingest)
+                    for hdf_path in hdf_paths
+                ],
+                return_exceptions=True,
+            )
+
+        assert results[0].status == IngestJobStatus.QUEUED
+        assert isinstance(results[1], IngestQueueFullError)
+        assert ingest_queue.get_stats()["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shutdown(self, tmp_path: Path):
+        event = asyncio.Event()
+
+        async def wait(filename: str | None, hdf_path: Path) -> SubmitHDFBatchResponse:
+            await event.wait()
+            return await ingest(filename, hdf_path)
+
+        ingest_queue = IngestQueue(workers=1, max_size=1)
+        hdf_paths = [tmp_path / f"{i}.h5" for i in range(2)]
+        for hdf_path in hdf_paths:
+            hdf_path.touch()
+
+        with patch(f"{MONGO_INTERFACE}.insert_one"), patch(
+            f"{MONGO_INTERFACE}.update_one",
+        ) as update_one:
+            running_job = await ingest_queue.submit("0.h5", hdf_paths[0], wait)
+            await asyncio.sleep(0)
+            queued_job = await ingest_queue.submit("1.h5", hdf_paths[1], wait)
+            update_one.reset_mock()
+            await ingest_queue.shutdown()
+
+        finished_jobs = {}
+        for update_call in update_one.call_args_list:
+            job_id = update_call.kwargs["filter_"]["_id"]
+            finished_jobs[job_id] = update_call.kwargs["update"]["$set"]
+        assert set(finished_jobs) == {running_job.id_, queued_job.id_}
+        for finished_update in finished_jobs.values():
+            assert finished_update["status"] == IngestJobStatus.FINISHED
+            assert finished_update["result"]["status_code"] == 503
+        assert not any(hdf_path.exists() for hdf_path in hdf_paths)
+        assert ingest_queue.get_stats()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_job(self):
+        job_data = {
+            "_id": "abc",
+            "filename": "test.h5",
+            "status": "queued",
+            "submitted": "2023-06-05T08:00:00+00:00",
+        }
+        with patch(f"{MONGO_INTERFACE}.find_one", AsyncMock(return_value=job_data)):
+            job = await IngestQueue.get_job("abc")
+
+        assert job.id_ == "abc"
+        assert job.status == IngestJobStatus.QUEUED
+        assert job.result is None
+
+    @pytest.mark.asyncio
+    async def test_get_job_missing(self):
+        with patch(f"{MONGO_INTERFACE}.find_one", AsyncMock(return_value=None)):
+            with pytest.raises(MissingDocumentError):
+                await IngestQueue.get_job("abc")
@@ -7,9 +7,13 @@ import pytest
 
 from operationsgateway_api.src.exceptions import HDFDataExtractionError
 from operationsgateway_api.src.models import (
+    ImageChannelMetadataModel,
+    ImageChannelModel,
     RecordModel,
     ScalarChannelMetadataModel,
     ScalarChannelModel,
+    WaveformChannelMetadataModel,
+    WaveformChannelModel,
 )
 from operationsgateway_api.src.records.echo_interface import get_echo_interface
 from operationsgateway_api.src.records.ingestion.partial_import_checks import (
@@ -434,3 +438,100 @@ class TestPartialImport:
 
         expected = {"accepted_channels": [], "rejected_channels": {"test": "failure"}}
         assert checks == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ["existence_check_method", "mocked_method", "return_value", "call_count"],
+        [
+            pytest.param(
+                "head",
+                "head_object",
+                [True, False],
+                2,
+                id="HEAD each object",
+            ),
+            pytest.param(
+                "list",
+                "list_objects",
+                [{"images/2023/06/05/100000/a.png"}],
+                1,
+                id="List record directory",
+            ),
+        ],
+    )
+    async def test_channel_checks_objects_stored(
+        self,
+        existence_check_method: str,
+        mocked_method: str,
+        return_value: list,
+        call_count: int,
+    ):
+        channels = {
+            channel_name: ImageChannelModel(
+                metadata=ImageChannelMetadataModel(),
+                image_path=f"2023/06/05/100000/{channel_name}.png",
+            )
+            for channel_name in ["a", "b"]
+        }
+        channels["c"] = ScalarChannelModel(
+            metadata=ScalarChannelMetadataModel(),
+            data=1,
+        )
+        record = RecordModel(_id="20230605100000", metadata={}, channels=channels)
+        partial_import_checks = PartialImportChecks(record, record)
+
+        target = (
+            "operationsgateway_api.src.config.Config.config.echo.existence_check_method"
+        )
+        echo_interface = get_echo_interface()
+        with patch(target, existence_check_method):
+            with patch.object(echo_interface, mocked_method) as mock_method:
+                mock_method.side_effect = return_value
+                checks = await partial_import_checks.channel_checks(
+                    {"rejected_channels": {}},
+                )
+
+        assert mock_method.call_count == call_count
+        assert checks == {
+            "accepted_channels": ["b"],
+            "rejected_channels": {
+                "a": CHANNEL_PRESENT_MESSAGE,
+                "c": CHANNEL_PRESENT_MESSAGE,
+            },
+        }
+
+    @pytest.mark.asyncio
+    async def test_channel_checks_stored_format(self):
+        def waveform_channel(extension: str) -> WaveformChannelModel:
+            return WaveformChannelModel(
+                metadata=WaveformChannelMetadataModel(),
+                waveform_path=f"2023/06/05/100000/a.{extension}",
+            )
+
+        ingested_record = RecordModel(
+            _id="20230605100000",
+            metadata={},
+            channels={"a": waveform_channel("bin")},
+        )
+        stored_record = RecordModel(
+            _id="20230605100000",
+            metadata={},
+            channels={"a": waveform_channel("json")},
+        )
+        partial_import_checks = PartialImportChecks(ingested_record, stored_record)
+
+        echo_interface = get_echo_interface()
+        with patch.object(echo_interface, "head_object") as mock_head_object:
+            mock_head_object.return_value = True
+            checks = await partial_import_checks.channel_checks(
+                {"rejected_channels": {}},
+            )
+
+        # The object stored before binary waveforms became the default is checked
+        mock_head_object.assert_called_once_with(
+            "waveforms/2023/06/05/100000/a.json",
+        )
+        assert checks == {
+            "accepted_channels": [],
+            "rejected_channels": {"a": CHANNEL_PRESENT_MESSAGE},
+        }
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from operationsgateway_api.src.exceptions import RecordError
+from operationsgateway_api.src.records.binary_array import BinaryArray
+
+
+class TestBinaryArray:
+    def test_encode_decode(self):
+        x = [1.0, 2.0, 3.0]
+        y = [8.0, 3.0, 6.0]
+        array_bytes = BinaryArray.encode(x, y)
+
+        assert len(array_bytes) == BinaryArray.header_size + 6 * 8
+        assert BinaryArray.is_binary_array(array_bytes)
+        rows = BinaryArray.decode(array_bytes)
+        assert rows.shape == (3, 2)
+        assert not rows.flags.writeable
+        np.testing.assert_array_equal(rows[:, 0], x)
+        np.testing.assert_array_equal(rows[:, 1], y)
+
+    @pytest.mark.parametrize(
+        ["start", "stop", "expected_data"],
+        [
+            pytest.param(None, None, [0.0, 1.0, 2.0, 3.0, 4.0], id="All"),
+            pytest.param(1, 3, [1.0, 2.0], id="Start and stop"),
+            pytest.param(3, None, [3.0, 4.0], id="Start only"),
+            pytest.param(None, 2, [0.0, 1.0], id="Stop only"),
+            pytest.param(4, 10, [4.0], id="Stop beyond end"),
+        ],
+    )
+    def test_get_byte_range(self, start, stop, expected_data):
+        array_bytes = BinaryArray.encode(np.arange(5))
+        first_byte, last_byte = BinaryArray.get_byte_range(1, start, stop)
+        end = None if last_byte is None else last_byte + 1
+
+        rows = BinaryArray.decode_rows(array_bytes[first_byte:end], 1)
+
+        np.testing.assert_array_equal(rows[:, 0], expected_data)
+
+    def test_decode_not_binary_array(self):
+        with pytest.raises(RecordError, match="Object is not a binary array"):
+            BinaryArray.decode(b'{"x": [1.0], "y": [2.0]}')
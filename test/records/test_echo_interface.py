@@ -32,6 +32,33 @@ async def reset_lifecycle() -> AsyncGenerator[None, None]:
 
 
 class TestEchoInterface:
+    @patch(
+        "operationsgateway_api.src.config.Config.config.echo.max_pool_connections",
+        4,
+    )
+    @patch("operationsgateway_api.src.config.Config.config.echo.retry_mode", "adaptive")
+    def test_get_resource(self):
+        echo_interface = EchoInterface()
+        with patch.object(echo_interface.session, "resource") as mock_resource:
+            echo_interface.get_resource()
+
+        config = mock_resource.call_args.kwargs["config"]
+        assert config.max_pool_connections == 4
+        assert config.retries == {"mode": "adaptive"}
+
+    @patch("operationsgateway_api.src.config.Config.config.echo.multipart_threshold", 1)
+    @patch("operationsgateway_api.src.config.Config.config.echo.multipart_chunksize", 2)
+    @patch(
+        "operationsgateway_api.src.config.Config.config.echo.max_transfer_concurrency",
+        3,
+    )
+    def test_get_transfer_config(self):
+        transfer_config = EchoInterface.get_transfer_config()
+
+        assert transfer_config.multipart_threshold == 1
+        assert transfer_config.multipart_chunksize == 2
+        assert transfer_config.max_request_concurrency == 3
+
     @pytest.mark.asyncio
     async def test_get_bucket(self):
         target = "operationsgateway_api.src.config.Config.config.echo.bucket_name"
@@ -139,12 +166,62 @@ class TestEchoInterface:
         with pytest.raises(EchoS3Error, match="when deleting directory"):
             await echo_interface.delete_directory("test")
 
+    @pytest.mark.asyncio
+    async def test_delete_file_objects(self):
+        mock_bucket = MagicMock()
+        mock_bucket.meta.client.delete_objects = AsyncMock(return_value={})
+        echo_interface = EchoInterface()
+        echo_interface._bucket = mock_bucket
+        object_paths = [f"waveforms/{i}/test.bin" for i in range(2500)]
+        await echo_interface.delete_file_objects(object_paths)
+
+        calls = mock_bucket.meta.client.delete_objects.await_args_list
+        batches = [call.kwargs["Delete"]["Objects"] for call in calls]
+        assert [len(batch) for batch in batches] == [1000, 1000, 500]
+        deleted_paths = [o["Key"] for batch in batches for o in batch]
+        assert sorted(deleted_paths) == sorted(object_paths)
+
+    @pytest.mark.asyncio
+    async def test_invalid_delete_file_objects(self):
+        errors = [{"Key": "test", "Code": "AccessDenied", "Message": "Access Denied"}]
+        mock_bucket = MagicMock()
+        mock_bucket.meta.client.delete_objects = AsyncMock(
+            return_value={"Errors": errors},
+        )
+        echo_interface = EchoInterface()
+        echo_interface._bucket = mock_bucket
+        match = "1 of 2 files could not be deleted, including AccessDenied"
+        with pytest.raises(EchoS3Error, match=match):
+            await echo_interface.delete_file_objects(["test", "other"])
+
     @pytest.mark.asyncio
     async def test_head_object(self):
         echo_interface = EchoInterface()
         echo_interface._bucket = await echo_interface.get_bucket()
         assert not await echo_interface.head_object("test")
 
+    @pytest.mark.asyncio
+    async def test_list_objects(self):
+        echo_interface = EchoInterface()
+        echo_interface._bucket = await echo_interface.get_bucket()
+        object_paths = await echo_interface.list_objects("images/2023/06/05/100000/")
+        assert "images/2023/06/05/100000/FE-204-NSO-P1-CAM-1.png" in object_paths
+
+    @pytest.mark.asyncio
+    async def test_invalid_list_objects(self):
+        side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
+            "list_objects_v2",
+        )
+        mock_paginator = MagicMock()
+        mock_paginator.paginate = MagicMock(side_effect=side_effect)
+        mock_bucket = MagicMock()
+        mock_bucket.meta.client.get_paginator = MagicMock(return_value=mock_paginator)
+        echo_interface = EchoInterface()
+        echo_interface._bucket = mock_bucket
+        with pytest.raises(EchoS3Error, match="when listing objects in"):
+            await echo_interface.list_objects("test")
+
     @pytest.mark.asyncio
     async def test_cached_bytes(self):
         echo_interface = EchoInterface()
@@ -158,10 +235,12 @@ class TestEchoInterface:
         echo_interface._bucket.download_fileobj.assert_called_once_with(
             Fileobj=ANY,
             Key=object_path,
+            Config=ANY,
         )
         # Second call does not result in an additional download as bytes are cached
         await echo_interface.download_file_object(object_path)
         echo_interface._bucket.download_fileobj.assert_called_once_with(
             Fileobj=ANY,
             Key=object_path,
+            Config=ANY,
         )
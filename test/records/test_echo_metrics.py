@@ -0,0 +1,109 @@
+from botocore.exceptions import ClientError
+import pytest
+
+from operationsgateway_api.src.records.echo_metrics import EchoMetrics
+
+
+class TestEchoMetrics:
+    @pytest.mark.parametrize(
+        ["object_paths", "expected_prefix"],
+        [
+            pytest.param(["images/2023/06/05/100000/CAM.png"], "images", id="Image"),
+            pytest.param(
+                ["float_images/20230605100000/FI.npz"],
+                "float_images",
+                id="Float image",
+            ),
+            pytest.param(
+                ["waveforms/a.bin", "waveforms/b.bin"],
+                "waveforms",
+                id="Same prefix",
+            ),
+            pytest.param(
+                ["waveforms/a.bin", "vectors/b.bin"],
+                "mixed",
+                id="Mixed prefixes",
+            ),
+            pytest.param(["test"], "other", id="Other"),
+        ],
+    )
+    def test_get_prefix(self, object_paths, expected_prefix):
+        assert EchoMetrics.get_prefix(*object_paths) == expected_prefix
+
+    def test_time_operation(self):
+        echo_metrics = EchoMetrics()
+        with echo_metrics.time_operation("download", "images/test.png"):
+            pass
+
+        latency = echo_metrics.get_stats()["latency"]
+        assert len(latency) == 1
+        assert latency[0]["operation"] == "download"
+        assert latency[0]["prefix"] == "images"
+        assert latency[0]["count"] == 1
+        # Every bucket is cumulative, so the fastest bucket containing it and all
+        # slower buckets are incremented
+        assert latency[0]["buckets"][-1] == 1
+        assert echo_metrics.get_stats()["errors"] == []
+
+    def test_time_operation_error(self):
+        echo_metrics = EchoMetrics()
+        error = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        with pytest.raises(ClientError):
+            with echo_metrics.time_operation("download", "vectors/test.bin"):
+                raise error
+
+        assert echo_metrics.get_stats()["errors"] == [
+            {
+                "operation": "download",
+                "prefix": "vectors",
+                "code": "NoSuchKey",
+                "value": 1,
+            },
+        ]
+
+    def test_time_operation_ignored_error(self):
+        echo_metrics = EchoMetrics()
+        error = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        with pytest.raises(ClientError):
+            with echo_metrics.time_operation(
+                "download",
+                "vectors/test.bin",
+                ignored_codes=("NoSuchKey",),
+            ):
+                raise error
+
+        assert echo_metrics.get_stats()["latency"][0]["count"] == 1
+        assert echo_metrics.get_stats()["errors"] == []
+
+    def test_observe_buckets(self):
+        echo_metrics = EchoMetrics()
+        echo_metrics.observe("upload", "images", 0.03)
+        echo_metrics.observe("upload", "images", 20)
+
+        latency = echo_metrics.get_stats()["latency"][0]
+        assert latency["count"] == 2
+        assert latency["seconds"] == 20.03
+        assert latency["buckets"] == [0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1]
+
+    def test_bytes_and_cache_results(self):
+        echo_metrics = EchoMetrics()
+        echo_metrics.add_bytes("download", "images/a.png", 10)
+        echo_metrics.add_bytes("download", "images/b.png", 5)
+        echo_metrics.add_cache_result("download", "images/a.png", True)
+        echo_metrics.add_cache_result("download", "images/b.png", False)
+        echo_metrics.add_cache_result("download", "images/b.png", False)
+
+        stats = echo_metrics.get_stats()
+        labels = {"operation": "download", "prefix": "images"}
+        assert stats["bytes"] == [{**labels, "value": 15}]
+        assert stats["cache_hits"] == [{**labels, "value": 1}]
+        assert stats["cache_misses"] == [{**labels, "value": 2}]
+
+        echo_metrics.clear()
+        assert echo_metrics.get_stats() == {
+            "latency": [],
+            "bytes": [],
+            "errors": [],
+            "cache_hits": [],
+            "cache_misses": [],
+        }
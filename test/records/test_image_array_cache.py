@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from operationsgateway_api.src.records.image_array_cache import ImageArrayCache
+
+
+class TestImageArrayCache:
+    def test_get_put(self):
+        image_array_cache = ImageArrayCache(max_bytes=100)
+        key = ImageArrayCache.create_key("20230605080000", "CAM-1")
+        array = np.zeros((4, 4), dtype=np.uint16)
+
+        assert image_array_cache.get(key) is None
+        image_array_cache.put(key, array, 16)
+        cached_array, storage_bit_depth = image_array_cache.get(key)
+
+        assert cached_array is array
+        assert storage_bit_depth == 16
+        assert not cached_array.flags.writeable
+        assert image_array_cache.get_cache_info() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "entries": 1,
+            "current_bytes": 32,
+            "max_bytes": 100,
+        }
+
+    def test_key_includes_raw_bit_depth(self):
+        image_array_cache = ImageArrayCache(max_bytes=100)
+        key = ImageArrayCache.create_key("20230605080000", "CAM-1")
+        image_array_cache.put(key, np.zeros(4, dtype=np.uint8), 8)
+
+        raw_key = ImageArrayCache.create_key("20230605080000", "CAM-1", 6)
+        assert image_array_cache.get(raw_key) is None
+
+    def test_eviction(self):
+        image_array_cache = ImageArrayCache(max_bytes=10)
+        keys = [ImageArrayCache.create_key(str(i), "CAM-1") for i in range(3)]
+        image_array_cache.put(keys[0], np.zeros(4, dtype=np.uint8), 8)
+        image_array_cache.put(keys[1], np.ones(4, dtype=np.uint8), 8)
+        # Use the first array so that the second is least recently used
+        image_array_cache.get(keys[0])
+        image_array_cache.put(keys[2], np.full(4, 2, dtype=np.uint8), 8)
+
+        assert image_array_cache.get(keys[0]) is not None
+        assert image_array_cache.get(keys[1]) is None
+        assert image_array_cache.get(keys[2]) is not None
+        assert image_array_cache.current_bytes == 8
+        assert image_array_cache.evictions == 1
+
+    @pytest.mark.parametrize(
+        "max_bytes",
+        [pytest.param(0, id="Cache disabled"), pytest.param(4, id="Too large")],
+    )
+    def test_put_not_cached(self, max_bytes: int):
+        image_array_cache = ImageArrayCache(max_bytes=max_bytes)
+        key = ImageArrayCache.create_key("20230605080000", "CAM-1")
+        image_array_cache.put(key, np.zeros(8, dtype=np.uint8), 8)
+
+        assert image_array_cache.get(key) is None
+        assert image_array_cache.current_bytes == 0
+
+    def test_invalidate_record(self):
+        image_array_cache = ImageArrayCache(max_bytes=100)
+        key_1 = ImageArrayCache.create_key("20230605080000", "CAM-1")
+        key_2 = ImageArrayCache.create_key("20230605080000", "CAM-1", 12)
+        key_3 = ImageArrayCache.create_key("20230605090000", "CAM-1")
+        for key in (key_1, key_2, key_3):
+            image_array_cache.put(key, np.zeros(4, dtype=np.uint16), 16)
+
+        image_array_cache.invalidate_record("20230605080000")
+
+        assert image_array_cache.get(key_1) is None
+        assert image_array_cache.get(key_2) is None
+        assert image_array_cache.get(key_3) is not None
+        assert image_array_cache.current_bytes == 8
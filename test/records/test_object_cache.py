@@ -0,0 +1,197 @@
+import asyncio
+import os
+from pathlib import Path
+import time
+from unittest.mock import patch
+
+import pytest
+
+from operationsgateway_api.src.records.object_cache import ObjectCache
+
+
+class TestObjectCache:
+    def test_get_put(self):
+        object_cache = ObjectCache(max_bytes=100)
+        key = "images/2023/06/05/080000/CAM-1.png"
+
+        assert object_cache.get(key) is None
+        object_cache.put(key, b"image")
+        assert object_cache.get(key) == b"image"
+        assert object_cache.get_cache_info() == {
+            "hits": 1,
+            "disk_hits": 0,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "evictions": 0,
+            "expirations": 0,
+            "entries": 1,
+            "current_bytes": 5,
+            "max_bytes": 100,
+        }
+
+    def test_eviction(self):
+        object_cache = ObjectCache(max_bytes=10)
+        object_cache.put("0", b"0000")
+        object_cache.put("1", b"1111")
+        # Use the first object so that the second is least recently used
+        object_cache.get("0")
+        object_cache.put("2", b"2222")
+
+        assert object_cache.get("0") == b"0000"
+        assert object_cache.get("1") is None
+        assert object_cache.get("2") == b"2222"
+        assert object_cache.current_bytes == 8
+        assert object_cache.evictions == 1
+
+    @pytest.mark.parametrize(
+        "max_bytes",
+        [pytest.param(0, id="Cache disabled"), pytest.param(4, id="Too large")],
+    )
+    def test_put_not_cached(self, max_bytes: int):
+        object_cache = ObjectCache(max_bytes=max_bytes)
+        object_cache.put("key", b"image")
+
+        assert object_cache.get("key") is None
+        assert object_cache.current_bytes == 0
+
+    def test_ttl(self):
+        object_cache = ObjectCache(max_bytes=100, ttl_seconds=60)
+        object_cache.put("key", b"image")
+        assert object_cache.get("key") == b"image"
+
+        expired = time.monotonic() + 61
+        with patch(
+            "operationsgateway_api.src.records.object_cache.time.monotonic",
+            return_value=expired,
+        ):
+            assert object_cache.get("key") is None
+
+        assert object_cache.expirations == 1
+        assert object_cache.current_bytes == 0
+
+    def test_invalidate(self):
+        object_cache = ObjectCache(max_bytes=100)
+        object_cache.put("images/20230605080000/CAM-1.png", b"image")
+        object_cache.put("images/20230605080000/CAM-2.png", b"image")
+
+        object_cache.invalidate("images/20230605080000/CAM-1.png")
+
+        assert object_cache.get("images/20230605080000/CAM-1.png") is None
+        assert object_cache.get("images/20230605080000/CAM-2.png") == b"image"
+
+    def test_invalidate_prefix(self):
+        object_cache = ObjectCache(max_bytes=100)
+        object_cache.put("images/20230605080000/CAM-1.png", b"image")
+        object_cache.put("waveforms/20230605080000/PM-201.json", b"waveform")
+        object_cache.put("images/20230605090000/CAM-1.png", b"image")
+
+        object_cache.invalidate_prefix("images/20230605080000/")
+
+        assert object_cache.get("images/20230605080000/CAM-1.png") is None
+        assert object_cache.get("waveforms/20230605080000/PM-201.json") is not None
+        assert object_cache.get("images/20230605090000/CAM-1.png") is not None
+        assert object_cache.current_bytes == 13
+
+    def test_disk_shared(self, tmp_path: Path):
+        key = "images/2023/06/05/080000/CAM-1.png"
+        object_cache = ObjectCache(
+            max_bytes=100,
+            disk_directory=tmp_path,
+            disk_max_bytes=100,
+        )
+        object_cache.put(key, b"image")
+        assert (tmp_path / key).read_bytes() == b"image"
+
+        # Another worker with an empty memory cache uses the object on disk
+        other_object_cache = ObjectCache(
+            max_bytes=100,
+            disk_directory=tmp_path,
+            disk_max_bytes=100,
+        )
+        assert other_object_cache.get(key) == b"image"
+        assert other_object_cache.disk_hits == 1
+        assert other_object_cache.current_bytes == 5
+
+        other_object_cache.invalidate_prefix("images/2023/06/05/080000/")
+        assert not (tmp_path / key).exists()
+        assert object_cache.get(key) == b"image"  # still in the first worker's memory
+
+    @pytest.mark.asyncio
+    async def test_disk_async(self, tmp_path: Path):
+        key = "images/2023/06/05/080000/CAM-1.png"
+        object_cache = ObjectCache(
+            max_bytes=100,
+            disk_directory=tmp_path,
+            disk_max_bytes=100,
+        )
+        target = "operationsgateway_api.src.records.object_cache.asyncio.to_thread"
+        with patch(target, wraps=asyncio.to_thread) as to_thread:
+            await object_cache.put_async(key, b"image")
+            assert (tmp_path / key).read_bytes() == b"image"
+
+            other_object_cache = ObjectCache(
+                max_bytes=100,
+                disk_directory=tmp_path,
+                disk_max_bytes=100,
+            )
+            assert await other_object_cache.get_async(key) == b"image"
+            # Now in memory, so the disk isn't read again
+            assert await other_object_cache.get_async(key) == b"image"
+
+        # Only the write and the first read are done in a thread
+        assert to_thread.call_count == 2
+        assert other_object_cache.disk_hits == 1
+        assert other_object_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_get_async_no_disk(self):
+        object_cache = ObjectCache(max_bytes=100)
+        target = "operationsgateway_api.src.records.object_cache.asyncio.to_thread"
+        with patch(target) as to_thread:
+            assert await object_cache.get_async("key") is None
+            await object_cache.put_async("key", b"image")
+            assert await object_cache.get_async("key") == b"image"
+
+        to_thread.assert_not_called()
+        assert object_cache.misses == 1
+        assert object_cache.hits == 1
+
+    def test_disk_ttl(self, tmp_path: Path):
+        object_cache = ObjectCache(
+            max_bytes=0,
+            ttl_seconds=60,
+            disk_directory=tmp_path,
+            disk_max_bytes=100,
+        )
+        object_cache.put("key", b"image")
+        modified = time.time() - 61
+        os.utime(tmp_path / "key", (modified, modified))
+
+        assert object_cache.get("key") is None
+        assert object_cache.expirations == 1
+        assert not (tmp_path / "key").exists()
+
+    def test_disk_prune(self, tmp_path: Path):
+        object_cache = ObjectCache(
+            max_bytes=0,
+            disk_directory=tmp_path,
+            disk_max_bytes=10,
+        )
+        for i in range(3):
+            object_cache.put(str(i), b"0000")
+            modified = time.time() - 100 + i
+            os.utime(tmp_path / str(i), (modified, modified))
+
+        assert not (tmp_path / "0").exists()
+        assert (tmp_path / "1").exists()
+        assert (tmp_path / "2").exists()
+
+    def test_disk_outside_directory(self, tmp_path: Path):
+        object_cache = ObjectCache(
+            max_bytes=0,
+            disk_directory=tmp_path / "cache",
+            disk_max_bytes=100,
+        )
+        object_cache.put("../outside", b"image")
+
+        assert not (tmp_path / "outside").exists()
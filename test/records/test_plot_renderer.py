@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+import pytest
+
+from operationsgateway_api.src.records.plot_renderer import PlotRenderer
+
+
+def get_pixels(png: bytes) -> np.ndarray:
+    return np.array(Image.open(BytesIO(png)))
+
+
+class TestPlotRenderer:
+    @pytest.fixture(autouse=True)
+    def clear_thumbnail_figures(self):
+        PlotRenderer._local.figures = {}
+        yield
+        PlotRenderer._local.figures = {}
+
+    @pytest.mark.parametrize(
+        ["previous_y", "y"],
+        [
+            pytest.param([1, 2, 3], [8, 3, 6], id="Same length"),
+            pytest.param([100, -100], [8, 3, 6, 2, 3, 8], id="Different range"),
+            pytest.param([1, 2, 3], [], id="Empty"),
+        ],
+    )
+    def test_render_line_thumbnail_reused(self, previous_y, y):
+        PlotRenderer.render_line_thumbnail(
+            range(len(previous_y)),
+            previous_y,
+            (100, 100),
+            0.5,
+        )
+        reused = PlotRenderer.render_line_thumbnail(range(len(y)), y, (100, 100), 0.5)
+        PlotRenderer._local.figures = {}
+        new = PlotRenderer.render_line_thumbnail(range(len(y)), y, (100, 100), 0.5)
+
+        assert np.array_equal(get_pixels(reused), get_pixels(new))
+
+    @pytest.mark.parametrize(
+        ["previous_data", "data"],
+        [
+            pytest.param([1, 2, 3], [3, 2, 1], id="Same length"),
+            pytest.param([-5, 100, 2, 4], [1, -2], id="Different range"),
+            pytest.param([1, 2, 3], [], id="Empty"),
+        ],
+    )
+    def test_render_bar_thumbnail_reused(self, previous_data, data):
+        PlotRenderer.render_bar_thumbnail(previous_data, (100, 100))
+        reused = PlotRenderer.render_bar_thumbnail(data, (100, 100))
+        PlotRenderer._local.figures = {}
+        new = PlotRenderer.render_bar_thumbnail(data, (100, 100))
+
+        assert np.array_equal(get_pixels(reused), get_pixels(new))
+
+    @pytest.mark.parametrize(
+        "thumbnail_size",
+        [
+            pytest.param((50, 50), id="50x50 thumbnail (square)"),
+            pytest.param((90, 40), id="90x40 thumbnail (landscape)"),
+        ],
+    )
+    def test_render_bar_thumbnail_size(self, thumbnail_size):
+        thumbnail = PlotRenderer.render_bar_thumbnail([1, 2, 3], thumbnail_size)
+        assert Image.open(BytesIO(thumbnail)).size == thumbnail_size
+
+    def test_render_thumbnails_concurrently(self):
+        rng = np.random.default_rng(seed=0)
+        y_values = [rng.normal(size=100) for _ in range(16)]
+
+        def render(y: np.ndarray) -> bytes:
+            return PlotRenderer.render_line_thumbnail(range(100), y, (100, 100), 0.5)
+
+        expected = [get_pixels(render(y)) for y in y_values]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            thumbnails = list(executor.map(render, y_values))
+
+        for thumbnail, expected_pixels in zip(thumbnails, expected):
+            assert np.array_equal(get_pixels(thumbnail), expected_pixels)
+
+    def test_render_line(self):
+        png = PlotRenderer.render_line([1, 2, 3], [8, 3, 6], "Time", "Value")
+        assert Image.open(BytesIO(png)).format == "PNG"
+
+    def test_render_bar(self):
+        png = PlotRenderer.render_bar(["a", "b"], [1, 2])
+        assert Image.open(BytesIO(png)).format == "PNG"
@@ -10,6 +10,7 @@ import pytest
 
 
 from operationsgateway_api.src.exceptions import (
+    EchoS3Error,
     FunctionParseError,
     MissingDocumentError,
     ModelError,
@@ -23,6 +24,10 @@ from operationsgateway_api.src.models import (
 )
 from operationsgateway_api.src.mongo.interface import MongoDBInterface
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.image_array_cache import (
+    get_image_array_cache,
+    ImageArrayCache,
+)
 from operationsgateway_api.src.records.record import Record
 from operationsgateway_api.src.records.waveform import Waveform
 
@@ -179,6 +184,71 @@ class TestRecord:
 
         assert record_result == duplicate_record
 
+    @pytest.mark.asyncio
+    async def test_insert_many(self):
+        record_instance = Record(RecordModel(**TestRecord.test_record))
+        cache_key = ImageArrayCache.create_key(
+            record_instance.record.id_,
+            "test-image-channel",
+        )
+        image_array_cache = get_image_array_cache()
+        image_array_cache.put(cache_key, np.zeros((2, 2), dtype=np.uint8), 8)
+
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.insert_many",
+        ) as insert_many:
+            await Record.insert_many([record_instance])
+
+        insert_many.assert_awaited_once()
+        assert insert_many.call_args.args[1][0]["_id"] == record_instance.record.id_
+        assert insert_many.call_args.kwargs["ordered"] is False
+        # Arrays cached for a deleted record with the same ID are no longer used
+        assert image_array_cache.get(cache_key) is None
+
+    @pytest.mark.asyncio
+    async def test_update_single_operation(self):
+        record_instance = Record(RecordModel(**TestRecord.test_record))
+
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.update_one",
+        ) as update_one, patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.bulk_write",
+        ) as bulk_write:
+            await record_instance.update()
+
+        update_one.assert_awaited_once()
+        bulk_write.assert_not_called()
+        set_document = update_one.call_args.args[2]["$set"]
+        assert set_document["version"] == record_instance.record.version
+        assert "metadata.shotnum" in set_document
+        assert set(set_document) >= {
+            f"channels.{channel_name}"
+            for channel_name in TestRecord.test_record["channels"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_update_split_operations(self):
+        record_instance = Record(RecordModel(**TestRecord.test_record))
+
+        with patch(
+            "operationsgateway_api.src.config.Config.config.records.max_update_bytes",
+            1,
+        ), patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.update_one",
+        ) as update_one, patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.bulk_write",
+        ) as bulk_write:
+            await record_instance.update()
+
+        update_one.assert_not_called()
+        bulk_write.assert_awaited_once()
+        # Each field goes over the limit, so each is sent in its own operation
+        requests = bulk_write.call_args.args[1]
+        set_fields = [field for r in requests for field in r._doc["$set"]]
+        assert all(len(r._doc["$set"]) == 1 for r in requests)
+        assert set_fields[0] == "version"
+        assert len(set_fields) == len(set(set_fields))
+
     @pytest.mark.asyncio
     async def test_find_record(self, remove_record_entry):
         record_model = RecordModel(**TestRecord.test_record)
@@ -253,6 +323,76 @@ class TestRecord:
             vector_limit=None,
         )
 
+    @pytest.mark.asyncio
+    async def test_get_channel_metadata(self):
+        projected_records = [
+            PartialRecordModel(
+                _id="19520605070023",
+                channels={"test-image-channel": {"thumbnail": b"thumbnail"}},
+            ),
+            PartialRecordModel(
+                _id="19520605070024",
+                channels={
+                    "test-scalar-channel": {
+                        "metadata": {"channel_dtype": "scalar"},
+                        "data": 1,
+                    },
+                },
+            ),
+        ]
+        stored_record = {
+            "_id": "19520605070023",
+            "channels": {
+                "test-image-channel": {
+                    "metadata": {"channel_dtype": "image", "bit_depth": 12},
+                },
+            },
+        }
+
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.find",
+        ) as find:
+            with patch(
+                "operationsgateway_api.src.mongo.interface.MongoDBInterface"
+                ".query_to_list",
+                return_value=[stored_record],
+            ) as query_to_list:
+                channel_metadata = await Record.get_channel_metadata(
+                    projected_records,
+                )
+
+        find.assert_called_once()
+        query_to_list.assert_awaited_once()
+        assert find.call_args.kwargs["filter_"]["_id"]["$in"] == ["19520605070023"]
+
+        channel_value = projected_records[0].channels["test-image-channel"]
+        channel_dtype = await Record.get_channel_dtype(
+            "19520605070023",
+            "test-image-channel",
+            channel_value,
+            channel_metadata,
+        )
+        raw_bit_depth = await Record.get_raw_bit_depth(
+            "19520605070023",
+            "test-image-channel",
+            channel_value,
+            channel_metadata,
+        )
+        assert channel_dtype == "image"
+        assert raw_bit_depth == 12
+        # The projected record should not have the metadata added to it
+        assert channel_value.metadata is None
+
+    @pytest.mark.asyncio
+    async def test_get_channel_metadata_not_needed(self):
+        record = PartialRecordModel(**TestRecord.test_record)
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.find",
+        ) as find:
+            assert await Record.get_channel_metadata([record]) == {}
+
+        find.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_convert_search_none_range(self):
         record_model = RecordModel(**TestRecord.test_record)
@@ -324,3 +464,117 @@ class TestRecord:
         long_bytes = b"0" * 100
         truncated_bytes = Record.truncate_bytes(truncate=truncate, image_b64=long_bytes)
         assert len(truncated_bytes) == length
+
+    @pytest.mark.asyncio
+    async def test_get_object_paths(self):
+        records = [
+            {
+                "_id": "20230605080000",
+                "channels": [
+                    {
+                        "name": "CAM-1",
+                        "channel_dtype": "image",
+                        "path": "2023/06/05/080000/CAM-1.png",
+                    },
+                    {
+                        "name": "PM-201",
+                        "channel_dtype": "waveform",
+                        "path": "20230605080000/PM-201.json",
+                    },
+                    {"name": "SCALAR", "channel_dtype": "scalar", "path": None},
+                ],
+            },
+        ]
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.aggregate",
+            return_value=records,
+        ):
+            object_paths = await Record.get_object_paths({"_id": "20230605080000"})
+
+        assert object_paths == {
+            "20230605080000": [
+                "images/2023/06/05/080000/CAM-1.png",
+                "images/20230605080000/CAM-1.png",
+                "waveforms/2023/06/05/080000/PM-201.bin",
+                "waveforms/2023/06/05/080000/PM-201.json",
+                "waveforms/20230605080000/PM-201.bin",
+                "waveforms/20230605080000/PM-201.json",
+            ],
+        }
+
+    @pytest.mark.asyncio
+    @patch(
+        "operationsgateway_api.src.config.Config.config.images.pyramid_factors",
+        [2],
+    )
+    async def test_get_object_paths_image_pyramid(self):
+        records = [
+            {
+                "_id": "20230605080000",
+                "channels": [
+                    {
+                        "name": "CAM-1",
+                        "channel_dtype": "image",
+                        "path": "2023/06/05/080000/CAM-1.png",
+                        # Stored with a factor which is no longer configured
+                        "pyramid_factors": [4],
+                    },
+                ],
+            },
+        ]
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.aggregate",
+            return_value=records,
+        ):
+            object_paths = await Record.get_object_paths({"_id": "20230605080000"})
+
+        assert object_paths == {
+            "20230605080000": [
+                "images/2023/06/05/080000/CAM-1.2x.png",
+                "images/2023/06/05/080000/CAM-1.4x.png",
+                "images/2023/06/05/080000/CAM-1.png",
+                "images/20230605080000/CAM-1.2x.png",
+                "images/20230605080000/CAM-1.4x.png",
+                "images/20230605080000/CAM-1.png",
+            ],
+        }
+
+    @pytest.mark.asyncio
+    @patch("operationsgateway_api.src.config.Config.config.mongodb.max_documents", 2)
+    async def test_delete_records_limit(self):
+        with patch(
+            "operationsgateway_api.src.mongo.interface.MongoDBInterface.aggregate",
+            return_value=[],
+        ) as aggregate:
+            record_ids = await Record.delete_records({"shotnum": {"$gt": 0}})
+
+        assert record_ids == []
+        pipeline = aggregate.call_args.args[1]
+        assert pipeline[:2] == [{"$match": {"shotnum": {"$gt": 0}}}, {"$limit": 2}]
+
+    @pytest.mark.asyncio
+    async def test_delete_records_echo_error(self):
+        records = [
+            {
+                "_id": "20230605080000",
+                "channels": [
+                    {
+                        "name": "PM-201",
+                        "channel_dtype": "waveform",
+                        "path": "20230605080000/PM-201.json",
+                    },
+                ],
+            },
+        ]
+        mongo_interface = "operationsgateway_api.src.mongo.interface.MongoDBInterface"
+        echo_interface = "operationsgateway_api.src.records.record.get_echo_interface"
+        with patch(f"{mongo_interface}.aggregate", return_value=records), patch(
+            f"{mongo_interface}.delete_many",
+        ) as delete_many, patch(echo_interface) as get_echo_interface:
+            delete_file_objects = get_echo_interface.return_value.delete_file_objects
+            delete_file_objects.side_effect = EchoS3Error("Mocked Exception")
+            with pytest.raises(EchoS3Error):
+                await Record.delete_records({"_id": "20230605080000"})
+
+        # The record is kept so that the deletion can be retried
+        delete_many.assert_not_called()
@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from operationsgateway_api.src.models import PartialRecordModel
+from operationsgateway_api.src.records.record_streamer import RecordStreamer
+
+
+async def _record_iterator(record_ids: list[str]):
+    for record_id in record_ids:
+        yield PartialRecordModel(_id=record_id)
+
+
+class TestRecordStreamer:
+    @pytest.mark.parametrize(
+        "accept, expected_result",
+        [
+            pytest.param(None, False, id="No header"),
+            pytest.param("application/json", False, id="JSON"),
+            pytest.param("application/x-ndjson", True, id="NDJSON"),
+            pytest.param(
+                "application/json;q=0.9, application/x-ndjson;q=1.0",
+                True,
+                id="NDJSON with quality values",
+            ),
+        ],
+    )
+    def test_accepts_ndjson(self, accept, expected_result):
+        assert RecordStreamer.accepts_ndjson(accept) == expected_result
+
+    def test_serialise(self):
+        record = PartialRecordModel(_id="20230605080000")
+        line = RecordStreamer.serialise(record)
+
+        assert line.endswith(b"\n")
+        assert orjson.loads(line) == {"_id": "20230605080000"}
+
+    @pytest.mark.asyncio
+    async def test_stream(self):
+        record_ids = [f"2023060508000{i}" for i in range(5)]
+        in_progress = 0
+        max_in_progress = 0
+
+        async def process_record(self):
+            nonlocal in_progress, max_in_progress
+            in_progress += 1
+            max_in_progress = max(max_in_progress, in_progress)
+            # Later records finish first, output order should still be preserved
+            await asyncio.sleep(0.01 * (5 - int(self.record.id_[-1])))
+            in_progress -= 1
+
+        with patch(
+            "operationsgateway_api.src.records.record_retriever.RecordRetriever"
+            ".process_record",
+            process_record,
+        ):
+            record_streamer = RecordStreamer(
+                _record_iterator(record_ids),
+                window=2,
+                functions=[],
+                original_image=False,
+            )
+            lines = [line async for line in record_streamer.stream()]
+
+        assert [orjson.loads(line)["_id"] for line in lines] == record_ids
+        assert max_in_progress <= 2
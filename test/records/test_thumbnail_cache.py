@@ -0,0 +1,78 @@
+import pytest
+
+from operationsgateway_api.src.records.thumbnail_cache import ThumbnailCache
+
+
+class TestThumbnailCache:
+    def test_get_put(self):
+        thumbnail_cache = ThumbnailCache(max_bytes=100)
+        key = ThumbnailCache.create_key(
+            "20230605080000",
+            "CAM-1",
+            b"grey",
+            "jet",
+            0,
+            255,
+        )
+
+        assert thumbnail_cache.get(key) is None
+        thumbnail_cache.put(key, b"coloured")
+        assert thumbnail_cache.get(key) == b"coloured"
+        assert thumbnail_cache.get_cache_info() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "entries": 1,
+            "current_bytes": 8,
+            "max_bytes": 100,
+        }
+
+    def test_key_includes_stored_thumbnail(self):
+        thumbnail_cache = ThumbnailCache(max_bytes=100)
+        key = ThumbnailCache.create_key("20230605080000", "CAM-1", b"grey", "jet")
+        thumbnail_cache.put(key, b"coloured")
+
+        new_key = ThumbnailCache.create_key("20230605080000", "CAM-1", b"new", "jet")
+        assert thumbnail_cache.get(new_key) is None
+
+    def test_eviction(self):
+        thumbnail_cache = ThumbnailCache(max_bytes=10)
+        keys = [ThumbnailCache.create_key(str(i), "CAM-1", b"grey") for i in range(3)]
+        thumbnail_cache.put(keys[0], b"0000")
+        thumbnail_cache.put(keys[1], b"1111")
+        # Use the first thumbnail so that the second is least recently used
+        thumbnail_cache.get(keys[0])
+        thumbnail_cache.put(keys[2], b"2222")
+
+        assert thumbnail_cache.get(keys[0]) == b"0000"
+        assert thumbnail_cache.get(keys[1]) is None
+        assert thumbnail_cache.get(keys[2]) == b"2222"
+        assert thumbnail_cache.current_bytes == 8
+        assert thumbnail_cache.evictions == 1
+
+    @pytest.mark.parametrize(
+        "max_bytes",
+        [pytest.param(0, id="Cache disabled"), pytest.param(4, id="Too large")],
+    )
+    def test_put_not_cached(self, max_bytes: int):
+        thumbnail_cache = ThumbnailCache(max_bytes=max_bytes)
+        key = ThumbnailCache.create_key("20230605080000", "CAM-1", b"grey")
+        thumbnail_cache.put(key, b"coloured")
+
+        assert thumbnail_cache.get(key) is None
+        assert thumbnail_cache.current_bytes == 0
+
+    def test_invalidate_record(self):
+        thumbnail_cache = ThumbnailCache(max_bytes=100)
+        key_1 = ThumbnailCache.create_key("20230605080000", "CAM-1", b"grey")
+        key_2 = ThumbnailCache.create_key("20230605080000", "CAM-2", b"grey")
+        key_3 = ThumbnailCache.create_key("20230605090000", "CAM-1", b"grey")
+        for key in (key_1, key_2, key_3):
+            thumbnail_cache.put(key, b"coloured")
+
+        thumbnail_cache.invalidate_record("20230605080000")
+
+        assert thumbnail_cache.get(key_1) is None
+        assert thumbnail_cache.get(key_2) is None
+        assert thumbnail_cache.get(key_3) == b"coloured"
+        assert thumbnail_cache.current_bytes == 8
@@ -0,0 +1,167 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from operationsgateway_api.src.models import RecordModel, VectorModel, WaveformModel
+from operationsgateway_api.src.records.record import Record
+from operationsgateway_api.src.records.upload_scheduler import UploadScheduler
+from operationsgateway_api.src.records.vector import Vector
+from operationsgateway_api.src.records.waveform import Waveform
+
+
+def get_record() -> Record:
+    return Record(
+        RecordModel(
+            _id="20230605080000",
+            metadata={"epac_ops_data_version": "1.0", "timestamp": "2023-06-05T08:00"},
+            channels={
+                "test-waveform": {
+                    "metadata": {"channel_dtype": "waveform"},
+                    "waveform_path": "2023/06/05/080000/test-waveform.json",
+                },
+                "test-vector": {
+                    "metadata": {"channel_dtype": "vector"},
+                    "vector_path": "2023/06/05/080000/test-vector.json",
+                },
+            },
+        ),
+    )
+
+
+def get_channel_objects() -> list[Waveform | Vector]:
+    waveform = Waveform(
+        WaveformModel(
+            path="2023/06/05/080000/test-waveform.json",
+            x=[1.0, 2.0, 3.0],
+            y=[8.0, 3.0, 6.0],
+        ),
+    )
+    vector = Vector(
+        VectorModel(path="2023/06/05/080000/test-vector.json", data=[1.0, 2.0]),
+    )
+    return [waveform, vector]
+
+
+class TestUploadScheduler:
+    @pytest.fixture(autouse=True)
+    def no_backoff(self):
+        with patch(
+            "operationsgateway_api.src.config.Config.config.echo."
+            "upload_retry_backoff_seconds",
+            0,
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_upload(self):
+        record = get_record()
+        with patch(
+            "operationsgateway_api.src.records.waveform.Waveform.insert",
+            return_value=None,
+        ) as waveform_insert, patch(
+            "operationsgateway_api.src.records.vector.Vector.insert",
+            return_value=None,
+        ) as vector_insert:
+            failed_uploads = await UploadScheduler(record).upload(
+                get_channel_objects(),
+            )
+
+        assert failed_uploads == []
+        waveform_insert.assert_awaited_once()
+        vector_insert.assert_awaited_once()
+        assert record.record.channels["test-waveform"].thumbnail is not None
+        assert record.record.channels["test-vector"].thumbnail is not None
+
+    @pytest.mark.parametrize(
+        ["insert_results", "expected_failed_uploads", "expected_retries"],
+        [
+            pytest.param(["test-waveform", None], [], 1, id="Retry succeeds"),
+            pytest.param(
+                ["test-waveform", "test-waveform", "test-waveform"],
+                ["test-waveform"],
+                2,
+                id="All retries fail",
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_upload_retries(
+        self,
+        insert_results: list[str | None],
+        expected_failed_uploads: list[str],
+        expected_retries: int,
+    ):
+        waveform = get_channel_objects()[0]
+        with patch(
+            "operationsgateway_api.src.config.Config.config.echo.upload_max_retries",
+            2,
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.insert",
+            side_effect=insert_results,
+        ) as waveform_insert:
+            scheduler = UploadScheduler(get_record())
+            failed_uploads = await scheduler.upload([waveform])
+
+        assert failed_uploads == expected_failed_uploads
+        assert waveform_insert.await_count == len(insert_results)
+        assert scheduler.retries == expected_retries
+
+    @pytest.mark.asyncio
+    async def test_upload_concurrency(self):
+        in_progress = 0
+        max_in_progress = 0
+
+        async def insert():
+            nonlocal in_progress, max_in_progress
+            in_progress += 1
+            max_in_progress = max(max_in_progress, in_progress)
+            await asyncio.sleep(0.01)
+            in_progress -= 1
+
+        channel_objects = [get_channel_objects()[0] for _ in range(8)]
+        for channel_object in channel_objects:
+            channel_object.insert = AsyncMock(side_effect=insert)
+
+        with patch(
+            "operationsgateway_api.src.config.Config.config.echo.upload_concurrency",
+            2,
+        ):
+            failed_uploads = await UploadScheduler(get_record()).upload(
+                channel_objects,
+            )
+
+        assert failed_uploads == []
+        assert max_in_progress == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_channels_in_memory(self):
+        in_memory = 0
+        max_in_memory = 0
+
+        async def insert():
+            nonlocal in_memory
+            await asyncio.sleep(0.01)
+            in_memory -= 1
+
+        def create_channel_objects():
+            nonlocal in_memory, max_in_memory
+            for _ in range(8):
+                in_memory += 1
+                max_in_memory = max(max_in_memory, in_memory)
+                channel_object = get_channel_objects()[0]
+                channel_object.insert = AsyncMock(side_effect=insert)
+                yield channel_object
+
+        with patch(
+            "operationsgateway_api.src.config.Config.config.ingest."
+            "max_channels_in_memory",
+            3,
+        ):
+            failed_uploads = await UploadScheduler(get_record()).upload(
+                create_channel_objects(),
+            )
+
+        assert failed_uploads == []
+        assert in_memory == 0
+        assert max_in_memory == 3
@@ -1,12 +1,14 @@
 import base64
 from io import BytesIO
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+import numpy as np
 from PIL import Image
 import pytest
 
 from operationsgateway_api.src.exceptions import EchoS3Error
 from operationsgateway_api.src.models import WaveformModel
+from operationsgateway_api.src.records.binary_array import BinaryArray
 from operationsgateway_api.src.records.waveform import Waveform
 
 
@@ -45,6 +47,183 @@ class TestWaveform:
 
         assert waveform.model_dump() == test_waveform.model_dump()
 
+    @pytest.mark.asyncio
+    async def test_insert_waveform_binary(
+        self,
+        remove_test_objects,
+        clear_cached_echo_interface: None,
+    ):
+        test_waveform = WaveformModel(
+            path="1952/06/05/070023/test-channel-name.bin",
+            x=TestWaveform.test_waveform.x,
+            y=TestWaveform.test_waveform.y,
+        )
+        response = await Waveform(test_waveform).insert()
+        assert response is None
+
+        with patch(
+            "operationsgateway_api.src.config.Config.config.waveforms.storage_format",
+            "binary",
+        ):
+            waveform = await Waveform.get_waveform(
+                "19520605070023",
+                "test-channel-name",
+                start=1,
+                stop=3,
+            )
+
+        assert waveform.model_dump()["x"] == [2.0, 3.0]
+        assert waveform.model_dump()["y"] == [3.0, 6.0]
+
+    @pytest.mark.parametrize(
+        ["start", "stop", "expected_range", "expected_x"],
+        [
+            pytest.param(1, 3, (32, 63), [2.0, 3.0], id="Start and stop"),
+            pytest.param(4, None, (80, None), [5.0, 6.0], id="Start only"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_get_waveform_range(self, start, stop, expected_range, expected_x):
+        waveform_bytes = BinaryArray.encode(
+            TestWaveform.test_waveform.x,
+            TestWaveform.test_waveform.y,
+        )
+        first_byte, last_byte = expected_range
+        end = None if last_byte is None else last_byte + 1
+        download_range = AsyncMock(return_value=waveform_bytes[first_byte:end])
+        with patch(
+            "operationsgateway_api.src.config.Config.config.waveforms.storage_format",
+            "binary",
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.get_stored_path",
+            return_value=None,
+        ), patch(
+            "operationsgateway_api.src.records.echo_interface.EchoInterface."
+            "download_file_object_range",
+            download_range,
+        ):
+            waveform = await Waveform.get_waveform(
+                "19520605070023",
+                "test-channel-name",
+                start=start,
+                stop=stop,
+            )
+
+        download_range.assert_awaited_once_with(
+            "waveforms/1952/06/05/070023/test-channel-name.bin",
+            *expected_range,
+            missing_ok=True,
+        )
+        # The points are kept as an array of the downloaded bytes, not boxed as floats
+        assert isinstance(waveform.x, np.ndarray)
+        assert waveform.model_dump()["x"] == expected_x
+
+    @pytest.mark.asyncio
+    async def test_get_waveform_json_fallback(self):
+        waveform_bytes = TestWaveform.test_waveform.model_dump_json().encode()
+        with patch(
+            "operationsgateway_api.src.config.Config.config.waveforms.storage_format",
+            "binary",
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.get_stored_path",
+            return_value=None,
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.get_binary_array",
+            side_effect=EchoS3Error("Not found", status_code=404),
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.get_bytes",
+            return_value=waveform_bytes,
+        ) as get_bytes:
+            waveform = await Waveform.get_waveform(
+                "19520605070023",
+                "test-channel-name",
+                start=1,
+                stop=3,
+            )
+
+        assert get_bytes.call_args.kwargs["echo_extension"] == "json"
+        assert waveform.x == [2.0, 3.0]
+        assert waveform.y == [3.0, 6.0]
+
+    @pytest.mark.parametrize(
+        ["stored_path", "expected_locations"],
+        [
+            pytest.param(None, [("bin", True), ("json", True)], id="No stored path"),
+            pytest.param(
+                "1952/06/05/070023/test-channel-name.json",
+                [("json", True), ("bin", True)],
+                id="Stored as JSON",
+            ),
+            pytest.param(
+                "19520605070023/test-channel-name.json",
+                [("json", False), ("bin", True)],
+                id="Stored as JSON with old layout",
+            ),
+            pytest.param(
+                "1952/06/05/070023/test-channel-name.png",
+                [("bin", True), ("json", True)],
+                id="Unknown extension",
+            ),
+        ],
+    )
+    def test_get_echo_locations(self, stored_path, expected_locations):
+        with patch(
+            "operationsgateway_api.src.config.Config.config.waveforms.storage_format",
+            "binary",
+        ):
+            echo_locations = Waveform.get_echo_locations(
+                "19520605070023",
+                "test-channel-name",
+                stored_path,
+            )
+
+        assert echo_locations == expected_locations
+
+    @pytest.mark.asyncio
+    async def test_get_waveform_stored_path(self):
+        waveform_bytes = TestWaveform.test_waveform.model_dump_json().encode()
+        download = AsyncMock(return_value=waveform_bytes)
+        with patch(
+            "operationsgateway_api.src.config.Config.config.waveforms.storage_format",
+            "binary",
+        ), patch(
+            "operationsgateway_api.src.records.waveform.Waveform.get_stored_path",
+            return_value="1952/06/05/070023/test-channel-name.json",
+        ), patch(
+            "operationsgateway_api.src.records.echo_interface.EchoInterface."
+            "download_file_object",
+            download,
+        ):
+            waveform = await Waveform.get_waveform(
+                "19520605070023",
+                "test-channel-name",
+            )
+
+        download.assert_awaited_once_with(
+            "waveforms/1952/06/05/070023/test-channel-name.json",
+            missing_ok=True,
+        )
+        assert waveform.x == TestWaveform.test_waveform.x
+
+    @pytest.mark.parametrize(
+        "waveform_bytes",
+        [
+            pytest.param(
+                Waveform(test_waveform).to_json().getvalue(),
+                id="JSON",
+            ),
+            pytest.param(
+                Waveform(test_waveform).to_binary().getvalue(),
+                id="Binary",
+            ),
+        ],
+    )
+    def test_from_bytes(self, waveform_bytes: bytes):
+        waveform = Waveform.from_bytes(waveform_bytes)
+
+        assert waveform.model_dump()["x"] == TestWaveform.test_waveform.x
+        assert waveform.model_dump()["y"] == TestWaveform.test_waveform.y
+
     @pytest.mark.asyncio
     async def test_waveform_not_found(self, clear_cached_echo_interface: None):
         match = (
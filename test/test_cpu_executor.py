@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pytest
+
+from operationsgateway_api.src.cpu_executor import CPUExecutor
+
+
+def get_thread_name() -> str:
+    return threading.current_thread().name
+
+
+def raise_error() -> None:
+    raise ValueError("Mocked Exception")
+
+
+class TestCPUExecutor:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "executor_type, expected_prefix",
+        [
+            pytest.param("thread", "cpu_executor", id="Thread pool"),
+            pytest.param("inline", "MainThread", id="Inline"),
+        ],
+    )
+    async def test_run(self, executor_type: str, expected_prefix: str):
+        cpu_executor = CPUExecutor(executor_type, 1, 1)
+        thread_name = await cpu_executor.run(get_thread_name)
+        cpu_executor.shutdown()
+
+        assert thread_name.startswith(expected_prefix)
+
+    @pytest.mark.asyncio
+    async def test_run_error(self):
+        cpu_executor = CPUExecutor("thread", 1, 1)
+        with pytest.raises(ValueError, match="Mocked Exception"):
+            await cpu_executor.run(raise_error)
+        cpu_executor.shutdown()
+
+        stats = cpu_executor.get_stats()
+        assert stats["submitted"] == 1
+        assert stats["completed"] == 0
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_max_queue_depth(self):
+        cpu_executor = CPUExecutor("thread", 2, 1)
+        event = threading.Event()
+        first_job = asyncio.create_task(cpu_executor.run(event.wait))
+        second_job = asyncio.create_task(cpu_executor.run(get_thread_name))
+        await asyncio.sleep(0.1)
+
+        # The second job can't be submitted until the first one has finished
+        assert cpu_executor.get_stats()["in_flight"] == 1
+        assert cpu_executor.get_stats()["waiting"] == 1
+
+        event.set()
+        await asyncio.gather(first_job, second_job)
+        cpu_executor.shutdown()
+
+        stats = cpu_executor.get_stats()
+        assert stats["completed"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["waiting"] == 0
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from operationsgateway_api.src.metrics import get_metrics_text
+from operationsgateway_api.src.records.echo_metrics import EchoMetrics
+
+
+class TestMetrics:
+    def test_get_metrics_text(self):
+        echo_metrics = EchoMetrics()
+        echo_metrics.observe("head", "waveforms", 0.2, "404")
+        echo_metrics.add_bytes("download", "images/a.png", 10)
+        echo_metrics.add_cache_result("download", "images/a.png", False)
+        target = "operationsgateway_api.src.metrics.get_echo_metrics"
+        with patch(target, return_value=echo_metrics):
+            metrics_text = get_metrics_text()
+
+        lines = metrics_text.splitlines()
+        labels = 'operation="head",prefix="waveforms"'
+        assert (
+            "# TYPE operationsgateway_echo_request_duration_seconds histogram" in lines
+        )
+        bucket = "operationsgateway_echo_request_duration_seconds_bucket"
+        assert f'{bucket}{{{labels},le="0.1"}} 0' in lines
+        assert f'{bucket}{{{labels},le="0.25"}} 1' in lines
+        assert (
+            f"operationsgateway_echo_request_duration_seconds_count{{{labels}}} 1"
+            in lines
+        )
+        assert f'operationsgateway_echo_errors_total{{{labels},code="404"}} 1' in lines
+        assert (
+            "operationsgateway_echo_bytes_total"
+            '{operation="download",prefix="images"} 10'
+        ) in lines
+        assert (
+            "operationsgateway_echo_cache_requests_total"
+            '{operation="download",prefix="images",result="miss"} 1'
+        ) in lines
+        assert "# TYPE operationsgateway_object_cache_hits_total counter" in lines
+        assert "# TYPE operationsgateway_thumbnail_cache_current_bytes gauge" in lines
+        assert (
+            "# TYPE operationsgateway_cpu_executor_busy_seconds_total counter" in lines
+        )
+        assert "# TYPE operationsgateway_ingest_queue_queued gauge" in lines
+        assert "# TYPE operationsgateway_ingest_queue_completed_total counter" in lines
+        assert "# TYPE operationsgateway_record_updates_seconds_total counter" in lines
@@ -7,6 +7,8 @@ from operationsgateway_api.src.models import (
     ChannelDtype,
     ChannelModel,
     ImageChannelMetadataModel,
+    VectorModel,
+    WaveformModel,
 )
 
 
@@ -68,3 +70,55 @@ class TestModels:
             f"operationsgateway_api.src.exceptions.ChannelManifestError: {expected} "
             "Invalid channel is called: name"
         )
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            pytest.param(np.array([1.5, 2.5, 3.5]), id="float64"),
+            pytest.param(np.array([1.5, 2.5, 3.5], dtype=np.float32), id="float32"),
+            pytest.param(np.array([1, 2, 3]), id="int64"),
+        ],
+    )
+    def test_waveform_model_array(self, values: np.ndarray):
+        model = WaveformModel(x=values, y=values)
+
+        assert isinstance(model.x, np.ndarray)
+        assert model.x.dtype == np.float64
+        assert not model.x.flags.writeable
+        assert values.flags.writeable
+        assert model.model_dump() == {"x": values.tolist(), "y": values.tolist()}
+        assert (
+            model.model_dump_json()
+            == WaveformModel(
+                x=[float(value) for value in values],
+                y=[float(value) for value in values],
+            ).model_dump_json()
+        )
+
+    def test_waveform_model_array_not_copied(self):
+        values = np.array([1.5, 2.5, 3.5])
+        model = WaveformModel(x=values, y=values)
+
+        assert np.shares_memory(model.x, values)
+
+    def test_waveform_model_complex_array(self):
+        values = np.array([1 + 2j, 3 + 4j])
+        model = WaveformModel(x=values, y=values)
+
+        # Complex arrays aren't converted to floats, so the imaginary part isn't lost
+        # and the channel checks reject them
+        assert isinstance(model.x, list)
+        assert model.x == [1 + 2j, 3 + 4j]
+
+    @pytest.mark.parametrize(
+        ["data", "expected_data"],
+        [
+            pytest.param(np.array([1.5, 2.5]), [1.5, 2.5], id="Float array"),
+            pytest.param([1.5, 2.5], [1.5, 2.5], id="List of floats"),
+            pytest.param(np.array(["a", "b"]), ["a", "b"], id="String array"),
+        ],
+    )
+    def test_vector_model_serialised(self, data: "np.ndarray | list", expected_data):
+        model = VectorModel(data=data)
+
+        assert model.model_dump() == {"data": expected_data}
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from operationsgateway_api.src.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_run_coalesced(self):
+        single_flight = SingleFlight("test")
+        calls = []
+        event = asyncio.Event()
+
+        async def work(value: int) -> int:
+            calls.append(value)
+            await event.wait()
+            return value * 2
+
+        tasks = [
+            asyncio.create_task(single_flight.run("key", work, i)) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert single_flight.get_stats() == {"calls": 3, "coalesced": 2, "in_flight": 1}
+
+        event.set()
+        results = await asyncio.gather(*tasks)
+
+        # Only the first call did the work, and every call got its result
+        assert calls == [0]
+        assert results == [0, 0, 0]
+        assert single_flight.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_different_keys(self):
+        single_flight = SingleFlight("test")
+
+        async def work(value: int) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            single_flight.run("a", work, 1),
+            single_flight.run("b", work, 2),
+        )
+
+        assert results == [1, 2]
+        assert single_flight.get_stats()["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_after_finished(self):
+        single_flight = SingleFlight("test")
+        calls = []
+
+        async def work() -> None:
+            calls.append(None)
+
+        await single_flight.run("key", work)
+        await single_flight.run("key", work)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_run_error(self):
+        single_flight = SingleFlight("test")
+        event = asyncio.Event()
+
+        async def work() -> None:
+            await event.wait()
+            raise ValueError("Mocked Exception")
+
+        tasks = [asyncio.create_task(single_flight.run("key", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        event.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_first_caller_cancelled(self):
+        single_flight = SingleFlight("test")
+        event = asyncio.Event()
+
+        async def work() -> str:
+            await event.wait()
+            return "result"
+
+        first_task = asyncio.create_task(single_flight.run("key", work))
+        second_task = asyncio.create_task(single_flight.run("key", work))
+        await asyncio.sleep(0)
+        first_task.cancel()
+        event.set()
+
+        # Cancelling the caller which started the work doesn't cancel the work itself
+        assert await second_task == "result"
+        with pytest.raises(asyncio.CancelledError):
+            await first_task
@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import runpy
+from tempfile import TemporaryDirectory
+import timeit
+import tracemalloc
+
+import h5py
+import numpy as np
+
+from operationsgateway_api.src.models import (
+    ChannelManifestModel,
+    ChannelModel,
+    VectorModel,
+    WaveformModel,
+)
+from operationsgateway_api.src.records.ingestion.channel_checks import ChannelChecks
+from operationsgateway_api.src.records.ingestion.hdf_handler import HDFDataHandler
+
+description = (
+    "Utility script for measuring the time taken to validate the waveforms and vectors "
+    "in a HDF file when it is ingested. The sample file written by "
+    "util/generate_plot_hdf.py is used, with long waveforms (such as scope traces) and "
+    "vectors added to it. The data is extracted as it would be on ingest, then the "
+    "time taken by the checks of ChannelChecks which look at every element is printed, "
+    "along with the time taken to check the same values one element at a time in "
+    "Python as was done previously. The peak memory used to build the waveform and "
+    "vector models from the extracted arrays is also compared with converting the "
+    "arrays to lists of floats, as was done previously. No database or object storage "
+    "is needed, as the channel manifest is built from the file."
+)
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument(
+    "-n",
+    "--number",
+    type=int,
+    help="Number of long waveforms and vectors to add to the file",
+    default=10,
+)
+parser.add_argument(
+    "-l",
+    "--length",
+    type=int,
+    help="Number of points in each long waveform",
+    default=100000,
+)
+parser.add_argument(
+    "-v",
+    "--vector-length",
+    type=int,
+    help="Number of elements in each vector",
+    default=1000,
+)
+parser.add_argument(
+    "-r",
+    "--repeat",
+    type=int,
+    help="Number of times to run the checks",
+    default=10,
+)
+
+# Put command line options into variables
+args = parser.parse_args()
+NUMBER = args.number
+LENGTH = args.length
+VECTOR_LENGTH = args.vector_length
+REPEAT = args.repeat
+
+GENERATE_PLOT_HDF = Path(__file__).parent / "generate_plot_hdf.py"
+
+
+def create_hdf_file(directory: str) -> str:
+    """
+    Run util/generate_plot_hdf.py in `directory`, then add the long waveforms and
+    vectors to the file it writes
+    """
+    current_directory = os.getcwd()
+    os.chdir(directory)
+    try:
+        runpy.run_path(str(GENERATE_PLOT_HDF))
+    finally:
+        os.chdir(current_directory)
+
+    hdf_path = os.path.join(directory, "sample_waveforms.h5")
+    rng = np.random.default_rng(seed=0)
+    with h5py.File(hdf_path, "a") as f:
+        # The timestamp written by generate_plot_hdf.py isn't in the format ingested
+        f.attrs["timestamp"] = "2022-08-23T12:00:00+00:00"
+        for i in range(NUMBER):
+            waveform = f.create_group(f"scope_trace_{i}")
+            waveform.attrs.create("channel_dtype", "waveform")
+            waveform.create_dataset("x", data=np.linspace(0, 1, LENGTH))
+            waveform.create_dataset("y", data=rng.normal(size=LENGTH))
+
+            vector = f.create_group(f"vector_{i}")
+            vector.attrs.create("channel_dtype", "vector")
+            vector.create_dataset("data", data=rng.normal(size=VECTOR_LENGTH))
+
+    return hdf_path
+
+
+def create_manifest(hdf_path: str) -> ChannelManifestModel:
+    with h5py.File(hdf_path, "r") as f:
+        channels = {
+            name: ChannelModel(
+                name=name,
+                path=f"/benchmark/{name}",
+                type=group.attrs["channel_dtype"],
+            )
+            for name, group in f.items()
+        }
+
+    return ChannelManifestModel(_id="benchmark", channels=channels)
+
+
+def check_elementwise(channel_checks: ChannelChecks) -> list[bool]:
+    """
+    Check each waveform and vector by looking at the type of every element in Python,
+    after converting the arrays to lists as the models previously did
+    """
+    results = []
+    for waveform in channel_checks.ingested_waveforms:
+        for values in (list(waveform.x), list(waveform.y)):
+            results.append(all(isinstance(element, float) for element in values))
+    for vector in channel_checks.ingested_vectors:
+        data = list(vector.data)
+        results.append(all(isinstance(element, float) for element in data))
+    return results
+
+
+def check_vectorised(channel_checks: ChannelChecks) -> list[bool]:
+    """
+    Check the same values as `check_elementwise` using `ChannelChecks._is_float_list`
+    """
+    results = []
+    for waveform in channel_checks.ingested_waveforms:
+        for values in (waveform.x, waveform.y):
+            results.append(ChannelChecks._is_float_list(values))
+    for vector in channel_checks.ingested_vectors:
+        results.append(ChannelChecks._is_float_list(vector.data))
+    return results
+
+
+def measure_models(channel_checks: ChannelChecks, as_lists: bool) -> int:
+    """
+    Return the peak memory in bytes used to build models for each waveform and vector,
+    either from the extracted arrays or from lists of floats
+    """
+    convert = list if as_lists else np.asarray
+    tracemalloc.start()
+    models = [
+        WaveformModel(x=convert(waveform.x), y=convert(waveform.y))
+        for waveform in channel_checks.ingested_waveforms
+    ] + [
+        VectorModel(data=convert(vector.data))
+        for vector in channel_checks.ingested_vectors
+    ]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return peak
+
+
+async def main():
+    with TemporaryDirectory() as directory:
+        hdf_path = create_hdf_file(directory)
+        manifest = create_manifest(hdf_path)
+        hdf_handler = HDFDataHandler(hdf_path)
+        extracted_data = await hdf_handler.extract_data(manifest)
+        hdf_handler.hdf_file.close()
+
+    channel_checks = ChannelChecks(*extracted_data)
+    channel_checks.set_channels(manifest)
+    points = sum(
+        len(waveform.x) + len(waveform.y)
+        for waveform in channel_checks.ingested_waveforms
+    ) + sum(len(vector.data) for vector in channel_checks.ingested_vectors)
+    print(
+        f"{len(channel_checks.ingested_waveforms)} waveforms and "
+        f"{len(channel_checks.ingested_vectors)} vectors, {points} points in total",
+    )
+
+    assert check_elementwise(channel_checks) == check_vectorised(channel_checks)
+    elementwise_seconds = timeit.timeit(
+        lambda: check_elementwise(channel_checks),
+        number=REPEAT,
+    )
+    vectorised_seconds = timeit.timeit(
+        lambda: check_vectorised(channel_checks),
+        number=REPEAT,
+    )
+    print(
+        f"Elementwise checks {elementwise_seconds / REPEAT * 1000:.2f} ms, "
+        f"vectorised checks {vectorised_seconds / REPEAT * 1000:.2f} ms, "
+        f"speedup {elementwise_seconds / vectorised_seconds:.2f}x",
+    )
+
+    for check in (
+        channel_checks.required_attribute_checks,
+        channel_checks.dataset_checks,
+    ):
+        seconds = timeit.timeit(check, number=REPEAT)
+        print(f"ChannelChecks.{check.__name__}: {seconds / REPEAT * 1000:.2f} ms")
+
+    list_peak = measure_models(channel_checks, as_lists=True)
+    array_peak = measure_models(channel_checks, as_lists=False)
+    print(
+        f"Peak memory building models from lists {list_peak / 2**20:.2f} MiB, "
+        f"from arrays {array_peak / 2**20:.2f} MiB",
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+from io import BytesIO
+import os
+import time
+
+from operationsgateway_api.src.config import Config
+from operationsgateway_api.src.records.echo_interface import get_echo_interface
+from operationsgateway_api.src.records.object_cache import get_object_cache
+
+description = (
+    "Utility script for tuning the settings used to transfer objects to and from Echo. "
+    "Objects of random bytes are uploaded concurrently, downloaded concurrently and "
+    "then deleted, and the time taken and throughput of the uploads and downloads are "
+    "printed. The object storage in the config is used, so this should be pointed at a "
+    "local S3 stand-in (such as the MinIO container used in CI, or moto_server) rather "
+    "than Echo itself. Any of the transfer settings in the `echo` section of the "
+    "config can be overridden using the options below."
+)
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument(
+    "-n",
+    "--number",
+    type=int,
+    help="Number of objects to upload and download",
+    default=64,
+)
+parser.add_argument(
+    "-s",
+    "--size",
+    type=int,
+    help="Size of each object in bytes",
+    default=1024 * 1024,
+)
+parser.add_argument(
+    "-c",
+    "--concurrency",
+    type=int,
+    help="Number of objects being uploaded or downloaded at once",
+    default=Config.config.echo.upload_concurrency,
+)
+parser.add_argument(
+    "--max-pool-connections",
+    type=int,
+    help="Overrides echo.max_pool_connections",
+    default=Config.config.echo.max_pool_connections,
+)
+parser.add_argument(
+    "--retry-mode",
+    type=str,
+    choices=["legacy", "standard", "adaptive"],
+    help="Overrides echo.retry_mode",
+    default=Config.config.echo.retry_mode,
+)
+parser.add_argument(
+    "--multipart-threshold",
+    type=int,
+    help="Overrides echo.multipart_threshold",
+    default=Config.config.echo.multipart_threshold,
+)
+parser.add_argument(
+    "--multipart-chunksize",
+    type=int,
+    help="Overrides echo.multipart_chunksize",
+    default=Config.config.echo.multipart_chunksize,
+)
+parser.add_argument(
+    "--max-transfer-concurrency",
+    type=int,
+    help="Overrides echo.max_transfer_concurrency",
+    default=Config.config.echo.max_transfer_concurrency,
+)
+
+# Put command line options into variables
+args = parser.parse_args()
+NUMBER = args.number
+SIZE = args.size
+CONCURRENCY = args.concurrency
+Config.config.echo.max_pool_connections = args.max_pool_connections
+Config.config.echo.retry_mode = args.retry_mode
+Config.config.echo.multipart_threshold = args.multipart_threshold
+Config.config.echo.multipart_chunksize = args.multipart_chunksize
+Config.config.echo.max_transfer_concurrency = args.max_transfer_concurrency
+PREFIX = "benchmark_echo_transfer"
+
+
+def print_result(name: str, seconds: float) -> None:
+    megabytes = NUMBER * SIZE / 1024 / 1024
+    print(
+        f"{name} {NUMBER} objects of {SIZE} bytes: "
+        f"{seconds:.3f} s, "
+        f"{NUMBER / seconds:.1f} objects/s, "
+        f"{megabytes / seconds:.1f} MiB/s",
+    )
+
+
+async def main():
+    echo_interface = get_echo_interface()
+    object_paths = [f"{PREFIX}/{i}.bin" for i in range(NUMBER)]
+    object_bytes = os.urandom(SIZE)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def upload(object_path: str) -> None:
+        async with semaphore:
+            await echo_interface.upload_file_object(BytesIO(object_bytes), object_path)
+
+    async def download(object_path: str) -> None:
+        async with semaphore:
+            await echo_interface.download_file_object(object_path)
+
+    print(
+        f"max_pool_connections={args.max_pool_connections}, "
+        f"retry_mode={args.retry_mode}, "
+        f"multipart_threshold={args.multipart_threshold}, "
+        f"multipart_chunksize={args.multipart_chunksize}, "
+        f"max_transfer_concurrency={args.max_transfer_concurrency}, "
+        f"concurrency={CONCURRENCY}",
+    )
+    async with echo_interface.get_resource() as resource:
+        await echo_interface.create_bucket(resource, True)
+        try:
+            start_time = time.perf_counter()
+            async with asyncio.TaskGroup() as task_group:
+                for object_path in object_paths:
+                    task_group.create_task(upload(object_path))
+            print_result("Uploaded", time.perf_counter() - start_time)
+
+            # Make sure every object is downloaded from the object storage
+            get_object_cache().clear()
+            start_time = time.perf_counter()
+            async with asyncio.TaskGroup() as task_group:
+                for object_path in object_paths:
+                    task_group.create_task(download(object_path))
+            print_result("Downloaded", time.perf_counter() - start_time)
+        finally:
+            await echo_interface.delete_file_objects(object_paths)
+            get_object_cache().clear()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
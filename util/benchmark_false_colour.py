@@ -0,0 +1,117 @@
+import argparse
+from functools import partial
+from io import BytesIO
+import timeit
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from operationsgateway_api.src.records.false_colour_handler import FalseColourHandler
+
+description = (
+    "Utility script for comparing the throughput of FalseColourHandler against the "
+    "plt.imsave implementation it replaced. Random greyscale images are false coloured "
+    "using both, the outputs are checked to be pixel identical, and the number of "
+    "images per second is printed for each."
+)
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument(
+    "-n",
+    "--number",
+    type=int,
+    help="Number of times to false colour each image",
+    default=200,
+)
+parser.add_argument(
+    "-c",
+    "--colourmap-name",
+    type=str,
+    help="Name of the colour map to apply",
+    default="viridis",
+)
+
+# Put command line options into variables
+args = parser.parse_args()
+NUMBER = args.number
+COLOURMAP_NAME = args.colourmap_name
+
+# (description, shape, storage bit depth)
+IMAGES = [
+    ("8 bit thumbnail", (50, 50), 8),
+    ("8 bit image", (1000, 1000), 8),
+    ("16 bit thumbnail", (50, 50), 16),
+    ("16 bit image", (1000, 1000), 16),
+]
+
+
+def apply_false_colour_imsave(
+    image_array: np.ndarray,
+    vmin: int,
+    vmax: int,
+    colourmap_name: str,
+) -> BytesIO:
+    converted_image_bytes = BytesIO()
+    plt.imsave(
+        converted_image_bytes,
+        image_array,
+        vmin=vmin,
+        vmax=vmax,
+        cmap=colourmap_name,
+    )
+    return converted_image_bytes
+
+
+def apply_false_colour_handler(
+    image_array: np.ndarray,
+    storage_bit_depth: int,
+    colourmap_name: str,
+) -> BytesIO:
+    return FalseColourHandler.apply_false_colour(
+        image_array,
+        storage_bit_depth,
+        lower_level=16,
+        upper_level=239,
+        limit_bit_depth=8,
+        colourmap_name=colourmap_name,
+    )
+
+
+def main():
+    rng = np.random.default_rng(seed=0)
+    for description, shape, storage_bit_depth in IMAGES:
+        dtype = np.uint8 if storage_bit_depth == 8 else np.uint16
+        image_array = rng.integers(0, 2**storage_bit_depth, shape, dtype=dtype)
+        vmin, vmax = FalseColourHandler.pixel_limits(storage_bit_depth, 16, 239, 8)
+
+        imsave = partial(
+            apply_false_colour_imsave,
+            image_array,
+            vmin,
+            vmax,
+            COLOURMAP_NAME,
+        )
+        handler = partial(
+            apply_false_colour_handler,
+            image_array,
+            storage_bit_depth,
+            COLOURMAP_NAME,
+        )
+
+        imsave_pixels = np.array(Image.open(imsave()))
+        handler_pixels = np.array(Image.open(handler()))
+        identical = np.array_equal(imsave_pixels, handler_pixels)
+
+        imsave_seconds = timeit.timeit(imsave, number=NUMBER)
+        handler_seconds = timeit.timeit(handler, number=NUMBER)
+        print(
+            f"{description} {shape}: "
+            f"plt.imsave {NUMBER / imsave_seconds:.1f} images/s, "
+            f"FalseColourHandler {NUMBER / handler_seconds:.1f} images/s, "
+            f"speedup {imsave_seconds / handler_seconds:.2f}x, "
+            f"pixel identical: {identical}",
+        )
+
+
+if __name__ == "__main__":
+    main()
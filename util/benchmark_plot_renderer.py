@@ -0,0 +1,155 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+import threading
+import time
+import timeit
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from operationsgateway_api.src.records.plot_renderer import PlotRenderer
+
+description = (
+    "Utility script for comparing the throughput of PlotRenderer against the pyplot "
+    "implementation it replaced. Random waveforms and vectors are rendered as "
+    "thumbnails using both, the outputs are checked to be pixel identical, and the "
+    "number of thumbnails per second is printed for each. The thumbnails are then "
+    "rendered using multiple threads, with pyplot serialised by a lock as it is not "
+    "thread safe."
+)
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument(
+    "-n",
+    "--number",
+    type=int,
+    help="Number of thumbnails to render for each type of plot",
+    default=200,
+)
+parser.add_argument(
+    "-l",
+    "--length",
+    type=int,
+    help="Number of points in each waveform",
+    default=1000,
+)
+parser.add_argument(
+    "-v",
+    "--vector-length",
+    type=int,
+    help="Number of bars in each vector",
+    default=100,
+)
+parser.add_argument(
+    "-t",
+    "--threads",
+    type=int,
+    help="Number of threads to render thumbnails with",
+    default=4,
+)
+
+# Put command line options into variables
+args = parser.parse_args()
+NUMBER = args.number
+LENGTH = args.length
+VECTOR_LENGTH = args.vector_length
+THREADS = args.threads
+
+THUMBNAIL_SIZE = (100, 100)
+LINE_WIDTH = 0.5
+pyplot_lock = threading.Lock()
+
+
+def render_line_pyplot(x: np.ndarray, y: np.ndarray) -> bytes:
+    with BytesIO() as buffer, pyplot_lock:
+        plt.figure(figsize=(THUMBNAIL_SIZE[0] / 100, THUMBNAIL_SIZE[1] / 100))
+        plt.xticks([])
+        plt.yticks([])
+        plt.plot(x, y, linewidth=LINE_WIDTH)
+        plt.axis("off")
+        plt.box(False)
+        plt.savefig(buffer, format="PNG", bbox_inches="tight", pad_inches=0, dpi=130)
+        plt.clf()
+        plt.close()
+        return buffer.getvalue()
+
+
+def render_bar_pyplot(data: np.ndarray) -> bytes:
+    with BytesIO() as buffer, pyplot_lock:
+        plt.figure(figsize=(THUMBNAIL_SIZE[0] / 100, THUMBNAIL_SIZE[1] / 100))
+        plt.xticks([])
+        plt.yticks([])
+        plt.bar(range(len(data)), data)
+        plt.axis("off")
+        plt.axhline(c="black")
+        plt.box(False)
+        plt.savefig(buffer, format="PNG", bbox_inches="tight", pad_inches=0, dpi=130)
+        plt.clf()
+        plt.close()
+        return buffer.getvalue()
+
+
+def render_line_renderer(x: np.ndarray, y: np.ndarray) -> bytes:
+    return PlotRenderer.render_line_thumbnail(x, y, THUMBNAIL_SIZE, LINE_WIDTH)
+
+
+def render_bar_renderer(data: np.ndarray) -> bytes:
+    return PlotRenderer.render_bar_thumbnail(data, THUMBNAIL_SIZE)
+
+
+def pixels(png: bytes) -> np.ndarray:
+    return np.array(Image.open(BytesIO(png)))
+
+
+def threaded_throughput(render_functions: list[partial]) -> float:
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(lambda render: render(), render_functions))
+    return len(render_functions) / (time.perf_counter() - start_time)
+
+
+def main():
+    rng = np.random.default_rng(seed=0)
+    x = np.arange(LENGTH)
+    y_values = [rng.normal(size=LENGTH) for _ in range(NUMBER)]
+    vector_values = [rng.normal(size=VECTOR_LENGTH) for _ in range(NUMBER)]
+    plots = {
+        f"Waveform thumbnails ({LENGTH} points)": (
+            [partial(render_line_pyplot, x, y) for y in y_values],
+            [partial(render_line_renderer, x, y) for y in y_values],
+        ),
+        f"Vector thumbnails ({VECTOR_LENGTH} bars)": (
+            [partial(render_bar_pyplot, data) for data in vector_values],
+            [partial(render_bar_renderer, data) for data in vector_values],
+        ),
+    }
+
+    for description, (pyplot_functions, renderer_functions) in plots.items():
+        identical = all(
+            np.array_equal(pixels(pyplot()), pixels(renderer()))
+            for pyplot, renderer in zip(pyplot_functions[:10], renderer_functions[:10])
+        )
+
+        pyplot_seconds = sum(timeit.timeit(f, number=1) for f in pyplot_functions)
+        renderer_seconds = sum(timeit.timeit(f, number=1) for f in renderer_functions)
+        print(
+            f"{description}: "
+            f"pyplot {NUMBER / pyplot_seconds:.1f} thumbnails/s, "
+            f"PlotRenderer {NUMBER / renderer_seconds:.1f} thumbnails/s, "
+            f"speedup {pyplot_seconds / renderer_seconds:.2f}x, "
+            f"pixel identical: {identical}",
+        )
+
+        pyplot_rate = threaded_throughput(pyplot_functions)
+        renderer_rate = threaded_throughput(renderer_functions)
+        print(
+            f"{description}, {THREADS} threads: "
+            f"pyplot {pyplot_rate:.1f} thumbnails/s, "
+            f"PlotRenderer {renderer_rate:.1f} thumbnails/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
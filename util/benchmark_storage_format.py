@@ -0,0 +1,102 @@
+import argparse
+import timeit
+
+import numpy as np
+
+from operationsgateway_api.src.models import VectorModel, WaveformModel
+from operationsgateway_api.src.records.binary_array import BinaryArray
+from operationsgateway_api.src.records.vector import Vector
+from operationsgateway_api.src.records.waveform import Waveform
+
+description = (
+    "Utility script for comparing the JSON and binary formats used to store waveforms "
+    "and vectors in Echo. Random waveforms and vectors are encoded in both formats, "
+    "and the number of bytes stored and the time taken to decode them (including "
+    "building the model returned by the API) are printed for each. The number of bytes "
+    "downloaded for a slice of a binary waveform using a ranged request is also "
+    "printed, as JSON waveforms must be downloaded in full."
+)
+parser = argparse.ArgumentParser(description=description)
+parser.add_argument(
+    "-n",
+    "--number",
+    type=int,
+    help="Number of times to decode each object",
+    default=100,
+)
+parser.add_argument(
+    "-l",
+    "--length",
+    type=int,
+    help="Number of points in the waveform",
+    default=1000,
+)
+parser.add_argument(
+    "-v",
+    "--vector-length",
+    type=int,
+    help="Number of elements in the vector",
+    default=100,
+)
+parser.add_argument(
+    "-s",
+    "--slice-length",
+    type=int,
+    help="Number of points in the slice of the waveform requested",
+    default=100,
+)
+
+# Put command line options into variables
+args = parser.parse_args()
+NUMBER = args.number
+LENGTH = args.length
+VECTOR_LENGTH = args.vector_length
+SLICE_LENGTH = args.slice_length
+
+
+def compare(name: str, json_bytes: bytes, binary_bytes: bytes, from_bytes) -> None:
+    assert from_bytes(json_bytes) == from_bytes(binary_bytes)
+    json_seconds = timeit.timeit(lambda: from_bytes(json_bytes), number=NUMBER)
+    binary_seconds = timeit.timeit(lambda: from_bytes(binary_bytes), number=NUMBER)
+    print(
+        f"{name}: "
+        f"JSON {len(json_bytes)} bytes, "
+        f"{json_seconds / NUMBER * 1e3:.3f} ms to decode, "
+        f"binary {len(binary_bytes)} bytes, "
+        f"{binary_seconds / NUMBER * 1e3:.3f} ms to decode, "
+        f"{len(json_bytes) / len(binary_bytes):.2f}x smaller, "
+        f"{json_seconds / binary_seconds:.2f}x faster",
+    )
+
+
+def main():
+    rng = np.random.default_rng(seed=0)
+    waveform = Waveform(
+        WaveformModel(x=np.arange(LENGTH, dtype=float), y=rng.normal(size=LENGTH)),
+    )
+    compare(
+        f"Waveform ({LENGTH} points)",
+        waveform.to_json().getvalue(),
+        waveform.to_binary().getvalue(),
+        Waveform.from_bytes,
+    )
+
+    vector_model = VectorModel(data=rng.normal(size=VECTOR_LENGTH))
+    compare(
+        f"Vector ({VECTOR_LENGTH} elements)",
+        vector_model.model_dump_json(indent=2).encode(),
+        BinaryArray.encode(vector_model.data),
+        Vector.from_bytes,
+    )
+
+    start = (LENGTH - SLICE_LENGTH) // 2
+    first_byte, last_byte = BinaryArray.get_byte_range(2, start, start + SLICE_LENGTH)
+    print(
+        f"Waveform slice ({SLICE_LENGTH} points): "
+        f"binary ranged request {last_byte - first_byte + 1} bytes, "
+        f"JSON {len(waveform.to_json().getvalue())} bytes",
+    )
+
+
+if __name__ == "__main__":
+    main()
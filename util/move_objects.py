@@ -1,12 +1,18 @@
 import argparse
 import asyncio
+import re
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 import pymongo
 
 from operationsgateway_api.src.config import Config
-from operationsgateway_api.src.records.echo_interface import EchoInterface
+from operationsgateway_api.src.models import VectorModel
+from operationsgateway_api.src.records.echo_interface import (
+    EchoInterface,
+    get_echo_interface,
+)
 from operationsgateway_api.src.records.image import Image
+from operationsgateway_api.src.records.vector import Vector
 from operationsgateway_api.src.records.waveform import Waveform
 
 description = (
@@ -15,7 +21,9 @@ description = (
     "old style location is fetched. This data is then copied from to a location using "
     "the current preferred path style, and the record in the database is updated. "
     "Finally, data in the old location is deleted. Renaming buckets is not possible, "
-    "so the data must be copied then deleted at the original location."
+    "so the data must be copied then deleted at the original location. Waveforms and "
+    "vectors stored in a different format to `storage_format` in the config (e.g. JSON "
+    "rather than binary) are converted to that format when they are moved."
 )
 parser = argparse.ArgumentParser(description=description)
 parser.add_argument(
@@ -39,12 +47,64 @@ parser.add_argument(
     help="Number of records to move data for",
     default=1,
 )
+parser.add_argument(
+    "-c",
+    "--concurrency",
+    type=int,
+    help="Number of objects to move at once",
+    default=8,
+)
 
 args = parser.parse_args()
 DATABASE_CONNECTION_URL = args.url
 DATABASE_NAME = args.database_name
 BUCKET_NAME = Config.config.echo.bucket_name
 LIMIT = args.limit
+CONCURRENCY = args.concurrency
+
+
+async def move_record_object(
+    echo_interface: EchoInterface,
+    records: AsyncIOMotorCollection,
+    record_id: str,
+    field: str,
+    old_path: str,
+    controller: type[Image | Waveform | Vector],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    channel_name = field.split(".")[1]
+    old_full_path = controller.get_full_path(relative_path=old_path)
+    new_path = controller.get_relative_path(record_id, channel_name, True)
+    full_new_path = controller.get_full_path(new_path)
+
+    async with semaphore:
+        if old_path.rsplit(".", 1)[-1] == new_path.rsplit(".", 1)[-1]:
+            copy_source = {"Bucket": BUCKET_NAME, "Key": old_full_path}
+            bucket = await echo_interface.get_bucket()
+            await bucket.meta.client.copy_object(
+                Bucket=BUCKET_NAME,
+                Key=full_new_path,
+                CopySource=copy_source,
+            )
+        else:
+            # Convert to the configured format, which `insert` chooses from the path
+            object_bytes = await echo_interface.download_file_object(old_full_path)
+            if controller is Waveform:
+                waveform_model = Waveform.from_bytes(object_bytes)
+                waveform_model.path = new_path
+                failed_upload = await Waveform(waveform_model).insert()
+            else:
+                vector_model = Vector.from_bytes(object_bytes)
+                vector = Vector(VectorModel(path=new_path, data=vector_model.data))
+                failed_upload = await vector.insert()
+
+            if failed_upload is not None:
+                print("Failed to convert", old_full_path)
+                return
+
+        update = {"$set": {field: new_path}}
+        await records.update_one(filter={"_id": record_id}, update=update)
+        await echo_interface.delete_file_object(old_full_path)
 
 
 async def move_object(
@@ -52,57 +112,71 @@ async def move_object(
     records: AsyncIOMotorCollection,
     channel_name: str,
     path_key: str,
-    file_extension: str,
-    controller: Image | Waveform,
+    controller: type[Image | Waveform | Vector],
 ) -> None:
     field = f"channels.{channel_name}.{path_key}"
-    regex_value = r"^\d{14}\/" + channel_name + r"\." + file_extension + r"$"
-    regex_filter = {field: {"$regex": regex_value}}
+    # Any object not already stored at the preferred path (which has subdirectories for
+    # the record ID and the extension of the configured format) needs to be moved
+    extension = controller.get_echo_extensions()[0]
+    preferred_path = (
+        r"^\d{4}/\d{2}/\d{2}/\d{6}/" + re.escape(channel_name) + r"\." + extension + "$"
+    )
+    regex_filter = {field: {"$exists": True, "$not": re.compile(preferred_path)}}
     cursor = records.find(filter=regex_filter, projection=[field], limit=LIMIT)
-    async for model in cursor:
-        record_id = model["_id"]
-        old_path = model["channels"][channel_name][path_key]
-        old_full_path = controller.get_full_path(relative_path=old_path)
-        new_path = controller.get_relative_path(record_id, channel_name, True)
-        full_new_path = controller.get_full_path(new_path)
-
-        copy_source = {"Bucket": Config.config.echo.bucket_name, "Key": old_full_path}
-        update = {"$set": {f"channels.{channel_name}.{path_key}": new_path}}
-        delete = {"Objects": [{"Key": old_full_path}]}
-        echo_interface.bucket.copy(CopySource=copy_source, Key=full_new_path)
-        records.update_one(filter={"_id": record_id}, update=update)
-        echo_interface.bucket.delete_objects(Delete=delete)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async with asyncio.TaskGroup() as task_group:
+        async for model in cursor:
+            task_group.create_task(
+                move_record_object(
+                    echo_interface,
+                    records,
+                    model["_id"],
+                    field,
+                    model["channels"][channel_name][path_key],
+                    controller,
+                    semaphore,
+                ),
+            )
 
 
 async def main():
-    echo_interface = EchoInterface()
+    echo_interface = get_echo_interface()
     client = AsyncIOMotorClient(DATABASE_CONNECTION_URL)
     db = client[DATABASE_NAME]
     channels_manifests = db.get_collection("channels")
     records = db.get_collection("records")
     sort = [("_id", pymongo.DESCENDING)]
     channels_manifest = await channels_manifests.find_one(sort=sort)
-    for channel_name, channel_model in channels_manifest["channels"].items():
-        if channel_model["type"] == "image":
-            print("Processing image channel:", channel_name)
-            await move_object(
-                echo_interface,
-                records,
-                channel_name,
-                path_key="image_path",
-                file_extension="png",
-                controller=Image,
-            )
-        elif channel_model["type"] == "waveform":
-            print("Processing waveform channel:", channel_name)
-            await move_object(
-                echo_interface,
-                records,
-                channel_name,
-                path_key="waveform_path",
-                file_extension="json",
-                controller=Waveform,
-            )
+    async with echo_interface.get_resource() as resource:
+        await echo_interface.create_bucket(resource, True)
+        for channel_name, channel_model in channels_manifest["channels"].items():
+            if channel_model["type"] == "image":
+                print("Processing image channel:", channel_name)
+                await move_object(
+                    echo_interface,
+                    records,
+                    channel_name,
+                    path_key="image_path",
+                    controller=Image,
+                )
+            elif channel_model["type"] == "waveform":
+                print("Processing waveform channel:", channel_name)
+                await move_object(
+                    echo_interface,
+                    records,
+                    channel_name,
+                    path_key="waveform_path",
+                    controller=Waveform,
+                )
+            elif channel_model["type"] == "vector":
+                print("Processing vector channel:", channel_name)
+                await move_object(
+                    echo_interface,
+                    records,
+                    channel_name,
+                    path_key="vector_path",
+                    controller=Vector,
+                )
 
 
 if __name__ == "__main__":